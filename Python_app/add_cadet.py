@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 import tkinter.font as tkfont
-import mysql.connector
 from mysql.connector import Error, IntegrityError
 import datetime
 import re
@@ -18,13 +17,13 @@ except Exception:
     def theme_setup(_root, dark=False):
         return
 
-# Database configuration - using credentials you provided
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
+# Shared pooled connections (see db.py for credentials and pool tuning)
+from db import get_connection, checkout_connection
+from tasks import get_runner, LoadingIndicator
+from lookups import RANKS, POSITIONS, invalidate as invalidate_lookups
+from roster import ROSTER
+from autofill import get_autofill
+import progress
 
 
 # configure basic logging to stdout
@@ -39,64 +38,29 @@ def _excepthook(exc_type, exc_value, exc_tb):
 sys.excepthook = _excepthook
 
 
-def get_connection():
-    try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
-    except Error as e:
-        # show GUI error and also log full traceback to terminal
-        messagebox.showerror("Database Error", f"Could not connect to database:\n{e}")
-        logging.exception('Could not connect to database')
-        return None
-
-
 def fetch_flights():
     # flights are not used in the new schema; keep for backward compatibility but return empty
     return []
 
 
 def fetch_positions():
-    """Return list of (position_id, position_name) from `position` table."""
-    conn = get_connection()
-    if not conn:
-        return []
+    """Return list of (position_id, position_name, line, level) from the cached `position` table."""
     try:
-        cur = conn.cursor()
-        # try to include the 'line' column if present to allow categorization
-        try:
-            cur.execute("SELECT position_id, position_name, line, level FROM `position` ORDER BY position_id")
-            rows = cur.fetchall()
-            # return tuples (id, name, line)
-            return rows
-        except Exception:
-            # fallback to older schema without 'line' flag
-            cur.execute("SELECT position_id, position_name, level FROM `position` ORDER BY position_id")
-            rows = cur.fetchall()
-            # normalize to (id, name, None)
-            return [(r[0], r[1], None) for r in rows]
-    except Error as e:
+        return POSITIONS.rows()
+    except Exception as e:
         messagebox.showerror("Database Error", f"Error fetching positions:\n{e}")
         logging.exception('Error fetching positions')
         return []
-    finally:
-        conn.close()
 
 
 def fetch_ranks():
-    conn = get_connection()
-    if not conn:
-        return []
+    """Return (rank_id, rank_name, rank_order) rows from the cached `rank` table."""
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC")
-        rows = cur.fetchall()
-        return rows
-    except Error as e:
+        return RANKS.rows()
+    except Exception as e:
         messagebox.showerror("Database Error", f"Error fetching ranks:\n{e}")
         logging.exception('Error fetching ranks')
         return []
-    finally:
-        conn.close()
 
 
 def fetch_cadet_ranks(cadet_id: int):
@@ -158,6 +122,87 @@ def fetch_cadet_by_capid(capid: int):
         conn.close()
 
 
+# ---------------- data access for CadetForm (background threads) ----------------
+# Run through tasks.TaskRunner: no widget access, and errors are raised to the caller.
+
+def fetch_form_lookups(force=False):
+    """Return (positions, ranks) from the lookup cache (reloaded first when force is set).
+
+    positions: (position_id, position_name, line, level);
+    ranks: (rank_id, rank_name, rank_order) ordered by rank_order.
+    """
+    if force:
+        invalidate_lookups('position', 'rank')
+    return POSITIONS.rows(), RANKS.rows()
+
+
+def fetch_cadet_details(capid: int):
+    """Return (cadet_row, position_ids, rank_ids) for a CAP ID; cadet_row is None if not found.
+
+    position_ids are most recent first.
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT cadet_id, cap_id, first_name, last_name, date_of_birth, join_date FROM cadet WHERE cap_id = %s",
+            (capid,)
+        )
+        row = cur.fetchone()
+        if not row:
+            return None, [], []
+        cur.execute("SELECT position_position_id FROM position_has_cadet WHERE cadet_cadet_id = %s ORDER BY start_date DESC", (row[0],))
+        position_ids = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT rank_rank_id FROM rank_has_cadet WHERE cadet_cadet_id = %s", (row[0],))
+        rank_ids = [r[0] for r in cur.fetchall()]
+        return row, position_ids, rank_ids
+    finally:
+        conn.close()
+
+
+def save_cadet(cadet_id, capid, fname, lname, bday, join_date, rank_id, position_ids):
+    """Insert a new cadet (cadet_id None) or update an existing one, plus rank/position mappings.
+
+    Returns the cadet id. Mapping failures are logged but don't undo the cadet row itself.
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if cadet_id:
+            cur.execute("UPDATE cadet SET first_name=%s, last_name=%s, date_of_birth=%s, join_date=%s WHERE cadet_id=%s",
+                        (fname, lname, bday, join_date, cadet_id))
+        else:
+            cur.execute("INSERT INTO cadet (first_name, last_name, date_of_birth, join_date, cap_id) "
+                        "VALUES (%s, %s, %s, %s, %s)", (fname, lname, bday, join_date, capid))
+            cadet_id = cur.lastrowid
+        conn.commit()
+        # update rank_has_cadet: remove old and insert new if selected
+        try:
+            cur.execute('DELETE FROM rank_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
+            if rank_id:
+                cur.execute('INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s, %s, NOW())', (rank_id, cadet_id))
+            progress.refresh_cadets(cur, [cadet_id])
+            conn.commit()
+        except Error:
+            conn.rollback()
+            logging.exception('Could not update cadet ranks')
+        # update position_has_cadet: remove old and insert Line/Staff and Support selections
+        try:
+            cur.execute('DELETE FROM position_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
+            for pid in position_ids:
+                cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s, %s, %s, NULL, NULL)', (pid, cadet_id, join_date))
+            conn.commit()
+        except Error:
+            conn.rollback()
+            logging.exception('Could not update cadet position')
+        return cadet_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 class CadetForm(tk.Frame):
     def __init__(self, master=None):
         super().__init__(master)
@@ -165,6 +210,10 @@ class CadetForm(tk.Frame):
         self.pack(padx=18, pady=18)
         self._suppress_traces = False
         self._current_existing_cadet_id = None
+        # lookup rows cached by load_lookups() for resolving combobox selections to ids
+        self._positions = []
+        self._ranks = []
+        self._runner = get_runner(self)
         self.create_widgets()
         self.load_lookups()
 
@@ -246,29 +295,38 @@ class CadetForm(tk.Frame):
         self.clear_btn = ttk.Button(btn_frame, text='Clear', command=self._clear_form)
         self.clear_btn.grid(row=0, column=1, padx=6)
 
-        self.refresh_btn = ttk.Button(btn_frame, text='Refresh lookups', command=self.load_lookups)
+        self.refresh_btn = ttk.Button(btn_frame, text='Refresh lookups', command=lambda: self.load_lookups(force=True))
         self.refresh_btn.grid(row=0, column=2, padx=6, sticky='w')
 
+        self._busy = LoadingIndicator(btn_frame)
+        self._busy.grid(row=0, column=3, padx=6, sticky='w')
+
         # status bar
         self.status_var = tk.StringVar()
         status = ttk.Label(self, textvariable=self.status_var, relief='sunken', anchor='w')
         status.grid(row=5, column=0, columnspan=2, sticky='ew', pady=(12,0), ipady=4)
 
-    def load_lookups(self):
+    def load_lookups(self, force=False):
+        # force re-reads rank/position from the database instead of the lookup cache
+        self._runner.submit(fetch_form_lookups, force, on_done=self._render_lookups, indicator=self._busy,
+                            error_title='Database Error', error_message='Error fetching positions and ranks (see terminal).')
+
+    def _render_lookups(self, result):
+        positions, ranks = result
+        # keep the raw rows so selections can be resolved to ids without another query
+        self._positions = positions
+        self._ranks = ranks
         # populate positions
-        positions = fetch_positions()
         if positions:
             # positions may include a 'line' flag: positions -> list of (id, name, line)
             self.position_map = {str(r[0]): r[1] for r in positions}
             self.position_ids = [str(r[0]) for r in positions]
-            names = [r[1] or f"Position {r[0]}" for r in positions]
             # split positions into line/staff (line flag == 1) and support (line flag != 1)
             line_names = [r[1] or f"Position {r[0]}" for r in positions if (r[2] if len(r) > 2 else None) == 1]
             support_names = [r[1] or f"Position {r[0]}" for r in positions if (r[2] if len(r) > 2 else None) != 1]
             self.linepos_cb['values'] = line_names
             self.staffpos_cb['values'] = support_names
             # set sensible defaults where possible
-            # no generic position defaults required
             if line_names:
                 try:
                     self.linepos_cb.current(0)
@@ -286,7 +344,6 @@ class CadetForm(tk.Frame):
             self.linepos_cb['values'] = []
             self.staffpos_cb['values'] = []
 
-        ranks = fetch_ranks()
         if ranks:
             self.rank_map = {str(r[0]): r[1] for r in ranks}
             self.rank_ids = [str(r[0]) for r in ranks]
@@ -301,7 +358,7 @@ class CadetForm(tk.Frame):
             self.rank_ids = []
             self.rank_cb['values'] = []
 
-    def _populate_from_row(self, row):
+    def _populate_from_row(self, row, cadet_positions=(), cadet_ranks=()):
         # row: (cadet_id, cap_id, first_name, last_name, date_of_birth, join_date)
         if not row:
             return
@@ -316,12 +373,10 @@ class CadetForm(tk.Frame):
             self.join_date_var.set(row[5].isoformat() if row[5] is not None else "")
             # select position and rank in comboboxes by value
             try:
-                cadet_positions = fetch_cadet_positions(row[0])
                 if cadet_positions:
                     pos_id = cadet_positions[0]
-                    positions = fetch_positions()
-                    # build lookup by id
-                    pos_lookup = {p[0]: p for p in positions}
+                    # build lookup by id from the cached lookup rows
+                    pos_lookup = {p[0]: p for p in self._positions}
                     if pos_id in pos_lookup:
                         p = pos_lookup[pos_id]
                         pname = p[1]
@@ -340,15 +395,13 @@ class CadetForm(tk.Frame):
                         except Exception:
                             pass
                 # select rank if cadet has one
-                cadet_ranks = fetch_cadet_ranks(row[0])
                 if cadet_ranks:
                     rank_id = cadet_ranks[0]
-                    ranks = fetch_ranks()
-                    for rid, rname in ranks:
-                        if rid == rank_id:
+                    for r in self._ranks:
+                        if r[0] == rank_id:
                             vals = list(self.rank_cb['values'])
-                            if rname in vals:
-                                self.rank_cb.current(vals.index(rname))
+                            if r[1] in vals:
+                                self.rank_cb.current(vals.index(r[1]))
                             break
             except Exception:
                 logging.exception('Error selecting lookup values')
@@ -379,10 +432,27 @@ class CadetForm(tk.Frame):
         if not val or not val.isdigit():
             return
         capid = int(val)
-        row = fetch_cadet_by_capid(capid)
+        # debounced roster lookup; only an existing cadet costs a query (for its ranks/positions)
+        get_autofill(self).lookup_capid((id(self), 'capid'), val, lambda row: self._on_capid_found(capid, row),
+                                        indicator=self._busy)
+
+    def _on_capid_found(self, capid, row):
+        if self.capid_var.get().strip() != str(capid):
+            return
+        if row is None:
+            self._on_capid_result(capid, (None, [], []))
+            return
+        self._runner.submit(fetch_cadet_details, capid, on_done=lambda res: self._on_capid_result(capid, res),
+                            indicator=self._busy, on_error=lambda e: logging.error('Error fetching cadet by cap_id: %s', e))
+
+    def _on_capid_result(self, capid, result):
+        # ignore answers for a CAP ID the user has already typed past
+        if self.capid_var.get().strip() != str(capid):
+            return
+        row, cadet_positions, cadet_ranks = result
         if row:
             # populate the form with existing values
-            self._populate_from_row(row)
+            self._populate_from_row(row, cadet_positions, cadet_ranks)
         else:
             # clear existing id so submit will insert
             self._current_existing_cadet_id = None
@@ -423,120 +493,60 @@ class CadetForm(tk.Frame):
         else:
             join_date = None
 
-        # Resolve selected rank id
+        # Resolve selected rank id from the loaded lookups
         rank_name = self.rank_cb.get() if hasattr(self, 'rank_cb') else ''
         rank_id = None
         if rank_name and hasattr(self, 'rank_ids'):
-            ranks = fetch_ranks()
-            for rid, rname in ranks:
-                if (rname or f"Rank {rid}") == rank_name:
-                    rank_id = rid
+            for r in self._ranks:
+                if (r[1] or f"Rank {r[0]}") == rank_name:
+                    rank_id = r[0]
                     break
 
+        # Resolve position ids from the Line/Staff and Support selections
+        position_ids = []
+        try:
+            lsel = self.linepos_cb.get().strip() if hasattr(self, 'linepos_cb') else ''
+            ssel = self.staffpos_cb.get().strip() if hasattr(self, 'staffpos_cb') else ''
+            for p in self._positions:
+                pid = p[0]
+                pname = p[1]
+                if pname == lsel and pid not in position_ids:
+                    position_ids.append(pid)
+                if pname == ssel and pid not in position_ids:
+                    position_ids.append(pid)
+        except Exception:
+            logging.exception('Error resolving additional position selections')
+
         # If this CAP ID already exists, offer to edit the existing record
-        if getattr(self, '_current_existing_cadet_id', None):
-            if messagebox.askyesno('Edit existing cadet', 'A cadet with this CAP ID exists.\nDo you want to edit the existing record?'):
-                # perform UPDATE
-                conn = get_connection()
-                if not conn:
-                    return
-                try:
-                    cur = conn.cursor()
-                    sql = ("UPDATE cadet SET first_name=%s, last_name=%s, date_of_birth=%s, join_date=%s WHERE cadet_id=%s")
-                    params = (fname, lname, bday, join_date, self._current_existing_cadet_id)
-                    cur.execute(sql, params)
-                    conn.commit()
-                    # update rank_has_cadet: remove old and insert new if selected
-                    try:
-                        cur.execute('DELETE FROM rank_has_cadet WHERE cadet_cadet_id = %s', (self._current_existing_cadet_id,))
-                        if rank_id:
-                            cur.execute('INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s, %s, NOW())', (rank_id, self._current_existing_cadet_id))
-                            conn.commit()
-                    except Exception:
-                        logging.exception('Could not update cadet ranks')
-                    # update position_has_cadet: remove old and insert new if selected
-                    try:
-                        cur.execute('DELETE FROM position_has_cadet WHERE cadet_cadet_id = %s', (self._current_existing_cadet_id,))
-                        # insert mappings from Line/Staff and Support selections
-                        insert_ids = []
-                        try:
-                            lsel = self.linepos_cb.get().strip() if hasattr(self, 'linepos_cb') else ''
-                            ssel = self.staffpos_cb.get().strip() if hasattr(self, 'staffpos_cb') else ''
-                            positions = fetch_positions()
-                            for p in positions:
-                                pid = p[0]
-                                pname = p[1]
-                                if pname == lsel and pid not in insert_ids:
-                                    insert_ids.append(pid)
-                                if pname == ssel and pid not in insert_ids:
-                                    insert_ids.append(pid)
-                        except Exception:
-                            logging.exception('Error resolving additional position selections')
-                        for pid in insert_ids:
-                            cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s, %s, %s, NULL, NULL)', (pid, self._current_existing_cadet_id, join_date))
-                        conn.commit()
-                    except Exception:
-                        logging.exception('Could not update cadet position')
-                    messagebox.showinfo('Success', 'Cadet updated successfully.')
-                    self._clear_form()
-                except Error as e:
-                    messagebox.showerror('Database Error', f'Could not update cadet:\n{e}')
-                    logging.exception('Could not update cadet')
-                finally:
-                    conn.close()
-            else:
+        existing_id = getattr(self, '_current_existing_cadet_id', None)
+        if existing_id:
+            if not messagebox.askyesno('Edit existing cadet', 'A cadet with this CAP ID exists.\nDo you want to edit the existing record?'):
                 # user cancelled edit
                 return
-        else:
-            # Insert new cadet
-            conn = get_connection()
-            if not conn:
-                return
-            try:
-                cur = conn.cursor()
-                sql = ("INSERT INTO cadet (first_name, last_name, date_of_birth, join_date, cap_id) "
-                       "VALUES (%s, %s, %s, %s, %s)")
-                params = (fname, lname, bday, join_date, capid)
-                cur.execute(sql, params)
-                conn.commit()
-                # insert rank and position mappings if selected
-                try:
-                    new_id = cur.lastrowid
-                    if rank_id:
-                        cur.execute('INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s, %s, NOW())', (rank_id, new_id))
-                        conn.commit()
-                    # insert position mappings: include position_id and additional selections
-                    insert_ids = []
-                    try:
-                        # flight removed: only consider line and support/staff selections
-                        lsel = self.linepos_cb.get().strip() if hasattr(self, 'linepos_cb') else ''
-                        ssel = self.staffpos_cb.get().strip() if hasattr(self, 'staffpos_cb') else ''
-                        positions = fetch_positions()
-                        for p in positions:
-                            pid = p[0]
-                            pname = p[1]
-                            if pname == lsel and pid not in insert_ids:
-                                insert_ids.append(pid)
-                            if pname == ssel and pid not in insert_ids:
-                                insert_ids.append(pid)
-                    except Exception:
-                        logging.exception('Error resolving additional position selections')
-                    for pid in insert_ids:
-                        cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s, %s, %s, NULL, NULL)', (pid, new_id, join_date))
-                        conn.commit()
-                except Exception:
-                    logging.exception('Could not insert cadet mapping rows')
+
+        def saved(cadet_id):
+            self.submit_btn.state(['!disabled'])
+            # keep the in-memory roster index (Dashboard search) current without a reload
+            ROSTER.upsert((cadet_id, capid, fname, lname))
+            if existing_id:
+                messagebox.showinfo('Success', 'Cadet updated successfully.')
+            else:
                 messagebox.showinfo('Success', 'Cadet added successfully.')
-                # clear form
-                self._clear_form()
-            except IntegrityError as e:
+            # clear form
+            self._clear_form()
+
+        def failed(e):
+            self.submit_btn.state(['!disabled'])
+            if existing_id:
+                messagebox.showerror('Database Error', f'Could not update cadet:\n{e}')
+            elif isinstance(e, IntegrityError):
                 messagebox.showerror('Database Error', f'Insert failed due to constraint (duplicate or invalid data):\n{e}')
-                logging.exception('Integrity error inserting cadet')
-            except Error as e:
+            else:
                 messagebox.showerror('Database Error', f'Could not insert cadet:\n{e}')
-                logging.exception('Could not insert cadet')
-            finally:
-                conn.close()
+
+        self.submit_btn.state(['disabled'])
+        self._runner.submit(save_cadet, existing_id, capid, fname, lname, bday, join_date, rank_id, position_ids,
+                            on_done=saved, on_error=failed, indicator=self._busy)
 
     def _clean_name(self, s: str) -> str:
         # lowercase, strip spaces, remove non-alphanumeric characters except hyphen/underscore
@@ -2,12 +2,19 @@
 
 This provides a small Tk interface to create requirement rows and link/unlink them
 to ranks. Also supports CSV import via file dialog (CSV columns: rank_identifier,requirement_name,description).
+
+CSV import is a bulk upsert (import_requirement_rows): rank identifiers (rank id or rank name)
+are resolved in one pass against the cached rank map, requirements are matched to existing
+rows by name (case-insensitive) so re-importing a file doesn't create duplicates, and all
+inserts/updates/links go in as executemany batches in one transaction. Run it with
+dry_run=True first to get the same RequirementImportReport without writing anything.
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import csv
-import mysql.connector
+from dataclasses import dataclass, field
+from typing import List, Tuple
 from mysql.connector import Error
 try:
     from ui_theme import setup as theme_setup, apply_accent, enable_alt_row_colors
@@ -19,32 +26,20 @@ except Exception:
     def enable_alt_row_colors(_tv):
         return
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
-
-
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Error as e:
-        messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-        return None
+# shared pooled DB helper (credentials live in db.py)
+from db import get_connection, checkout_connection
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+from lookups import RANKS, invalidate as invalidate_lookups
+import progress
 
 
 def fetch_ranks():
-    conn = get_connection()
-    if not conn:
-        return []
     try:
-        cur = conn.cursor()
-        cur.execute('SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC')
-        return cur.fetchall()
-    finally:
-        conn.close()
+        return RANKS.rows()
+    except Exception as e:
+        messagebox.showerror('DB Error', f'Could not load ranks:\n{e}')
+        return []
 
 
 def create_requirement(name, description):
@@ -55,6 +50,7 @@ def create_requirement(name, description):
         cur = conn.cursor()
         cur.execute('INSERT INTO requirement (requirement_name, description) VALUES (%s, %s)', (name, description))
         conn.commit()
+        invalidate_lookups('requirement')
         return cur.lastrowid
     except Error as e:
         messagebox.showerror('DB Error', f'Could not create requirement:\n{e}')
@@ -72,6 +68,7 @@ def link_requirement_to_rank(rank_id, req_id):
         cur.execute('SELECT 1 FROM rank_has_requirement WHERE rank_rank_id=%s AND rank_requirement_requirement_id=%s', (rank_id, req_id))
         if not cur.fetchone():
             cur.execute('INSERT INTO rank_has_requirement (rank_rank_id, rank_requirement_requirement_id) VALUES (%s, %s)', (rank_id, req_id))
+            progress.requirement_linked(cur, [(rank_id, req_id)], 1)
             conn.commit()
         return True
     except Error as e:
@@ -82,16 +79,7 @@ def link_requirement_to_rank(rank_id, req_id):
 
 
 def find_rank_id_by_name(name):
-    conn = get_connection()
-    if not conn:
-        return None
-    try:
-        cur = conn.cursor()
-        cur.execute('SELECT rank_id FROM `rank` WHERE rank_name = %s', (name,))
-        row = cur.fetchone()
-        return row[0] if row else None
-    finally:
-        conn.close()
+    return RANKS.id_for(name)
 
 
 def fetch_requirements_for_rank(rank_id):
@@ -224,27 +212,24 @@ class AddReqGUI(tk.Tk):
         if not path:
             return
         items = import_csv_file(path)
-        for rank_idf, name, desc in items:
-            if not name:
-                continue
-            # resolve rank identifier
-            try:
-                rid = int(rank_idf)
-            except Exception:
-                rid = find_rank_id_by_name(rank_idf)
-            if not rid:
-                messagebox.showwarning('Warning', f'Could not resolve rank: {rank_idf}; skipping')
-                continue
-            req_id = create_requirement(name, desc)
-            if req_id:
-                link_requirement_to_rank(rid, req_id)
-        messagebox.showinfo('Done', 'CSV import complete')
+        if not items:
+            return
+        try:
+            preview = import_requirement_rows(items, dry_run=True)
+            if not messagebox.askyesno('Import preview', preview.summary() + '\n\nApply this import?'):
+                return
+            report = import_requirement_rows(items)
+        except Exception as e:
+            messagebox.showerror('DB Error', f'CSV import failed:\n{e}')
+            return
+        messagebox.showinfo('Done', report.summary())
         # refresh current rank view
         sel = self.rank_list.curselection()
         if sel:
             self.load_requirements(self.ranks[sel[0]][0])
 
     def refresh(self):
+        invalidate_lookups('rank')
         self.ranks = fetch_ranks()
         self.rank_list.delete(0, 'end')
         for r in self.ranks:
@@ -258,16 +243,204 @@ def RequirementsApp():
     AddReqGUI()
 
 
-if __name__ == '__main__':
-    RequirementsApp()
+# --- background helpers for AddReqFrame -------------------------------------
+# These run on worker threads through tasks.TaskRunner, so they raise instead of
+# opening message boxes; the frame reports errors on the UI thread.
+
+def load_ranks(refresh=False):
+    if refresh:
+        invalidate_lookups('rank')
+    return RANKS.rows()
+
+
+def load_requirements_for_rank(rank_id):
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            SELECT r.requirement_id, r.requirement_name, r.description
+            FROM rank_has_requirement rr
+            JOIN requirement r ON rr.rank_requirement_requirement_id = r.requirement_id
+            WHERE rr.rank_rank_id = %s
+            ORDER BY r.requirement_id
+        ''', (rank_id,))
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def create_and_link_requirement(rank_id, name, description):
+    """Create a requirement and link it to a rank in one transaction. Returns the new requirement id."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('INSERT INTO requirement (requirement_name, description) VALUES (%s, %s)', (name, description))
+        req_id = cur.lastrowid
+        cur.execute('INSERT IGNORE INTO rank_has_requirement (rank_rank_id, rank_requirement_requirement_id) VALUES (%s, %s)', (rank_id, req_id))
+        progress.requirement_linked(cur, [(rank_id, req_id)], 1)
+        conn.commit()
+        invalidate_lookups('requirement')
+        return req_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def unlink_requirement_from_rank(rank_id, req_id):
+    """Remove a requirement from a rank (the requirement itself is kept). Raises on DB errors."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('DELETE FROM rank_has_requirement WHERE rank_rank_id = %s AND rank_requirement_requirement_id = %s', (rank_id, req_id))
+        if cur.rowcount:
+            progress.requirement_linked(cur, [(rank_id, req_id)], -1)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+@dataclass
+class RequirementImportReport:
+    """What an import did (or, for a dry run, would do)."""
+    dry_run: bool
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)      # existing requirement, new description
+    unchanged: int = 0
+    links_added: int = 0
+    unresolved: List[Tuple[int, str]] = field(default_factory=list)   # (csv line, rank identifier)
+    skipped: int = 0                                       # rows without a requirement name
+
+    def summary(self):
+        verb = 'Would' if self.dry_run else 'Did'
+        lines = [
+            f'{verb} create {len(self.created)} requirement(s), update {len(self.updated)}, '
+            f'leave {self.unchanged} unchanged, and add {self.links_added} rank link(s).',
+        ]
+        if self.created:
+            lines.append('New: ' + ', '.join(self.created[:10]) + (' ...' if len(self.created) > 10 else ''))
+        if self.updated:
+            lines.append('Updated: ' + ', '.join(self.updated[:10]) + (' ...' if len(self.updated) > 10 else ''))
+        if self.unresolved:
+            lines.append(f'{len(self.unresolved)} row(s) skipped, unknown rank: ' +
+                         ', '.join(f'line {n}: {idf!r}' for n, idf in self.unresolved[:10]) +
+                         (' ...' if len(self.unresolved) > 10 else ''))
+        if self.skipped:
+            lines.append(f'{self.skipped} row(s) skipped without a requirement name.')
+        return '\n'.join(lines)
+
+
+def _name_key(name):
+    return (name or '').strip().lower()
+
+
+def _resolve_rank(rank_idf, by_id, by_name):
+    rank_idf = (rank_idf or '').strip()
+    try:
+        rid = int(rank_idf)
+    except ValueError:
+        return by_name.get(rank_idf.lower())
+    return rid if rid in by_id else None
+
+
+def import_requirement_rows(items, dry_run=False):
+    """Bulk upsert (rank_identifier, requirement_name, description) rows in one transaction.
+
+    Requirements are matched by name; a matching row gets its description updated if the CSV
+    has a different non-empty one, otherwise a new row is inserted. Links that already exist
+    are left alone. With dry_run=True nothing is written. Returns a RequirementImportReport.
+    """
+    report = RequirementImportReport(dry_run=dry_run)
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # one pass of rank resolution against the cached map (ids and case-insensitive names)
+        ranks = RANKS.rows(cur)
+        by_id = {r[0] for r in ranks}
+        by_name = {}
+        for r in ranks:
+            by_name.setdefault(_name_key(r[1]), r[0])
+
+        # last row wins for a name repeated within the file; links are collected from every row
+        wanted = {}      # name key -> (name, description)
+        links = set()    # (rank_id, name key)
+        for line_no, (rank_idf, name, desc) in enumerate(items, start=2):
+            if not name:
+                report.skipped += 1
+                continue
+            rid = _resolve_rank(rank_idf, by_id, by_name)
+            if rid is None:
+                report.unresolved.append((line_no, rank_idf))
+                continue
+            key = _name_key(name)
+            prev = wanted.get(key)
+            wanted[key] = (name, desc or (prev[1] if prev else ''))
+            links.add((rid, key))
+
+        # current state, read fresh inside the transaction rather than from the lookup cache
+        cur.execute('SELECT requirement_id, requirement_name, description FROM requirement')
+        existing = {}
+        for req_id, req_name, req_desc in cur.fetchall():
+            existing.setdefault(_name_key(req_name), (req_id, req_desc))
+        cur.execute('SELECT rank_rank_id, rank_requirement_requirement_id FROM rank_has_requirement')
+        linked = set(cur.fetchall())
+
+        inserts, updates = [], []
+        for key, (name, desc) in wanted.items():
+            if key not in existing:
+                inserts.append((name, desc))
+                report.created.append(name)
+            elif desc and desc != (existing[key][1] or ''):
+                updates.append((desc, existing[key][0]))
+                report.updated.append(name)
+            else:
+                report.unchanged += 1
+
+        if dry_run:
+            report.links_added = sum(1 for rid, key in links
+                                     if key not in existing or (rid, existing[key][0]) not in linked)
+            return report
+
+        if inserts:
+            cur.executemany('INSERT INTO requirement (requirement_name, description) VALUES (%s, %s)', inserts)
+            # pick up the new ids by name (a multi-row insert only reports the first id)
+            names = [n for n, _d in inserts]
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                cur.execute('SELECT requirement_id, requirement_name FROM requirement WHERE requirement_name IN (%s)'
+                            % ', '.join(['%s'] * len(chunk)), tuple(chunk))
+                for req_id, req_name in cur.fetchall():
+                    existing.setdefault(_name_key(req_name), (req_id, None))
+        if updates:
+            cur.executemany('UPDATE requirement SET description = %s WHERE requirement_id = %s', updates)
+        new_links = sorted({(rid, existing[key][0]) for rid, key in links} - linked)
+        if new_links:
+            cur.executemany('INSERT IGNORE INTO rank_has_requirement (rank_rank_id, rank_requirement_requirement_id) VALUES (%s, %s)', new_links)
+            progress.requirement_linked(cur, new_links, 1)
+        report.links_added = len(new_links)
+        conn.commit()
+        if inserts or updates:
+            invalidate_lookups('requirement')
+        return report
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
 
 class AddReqFrame(ttk.Frame):
     """Embeddable Requirements manager for use inside a Notebook tab."""
     def __init__(self, master=None):
         super().__init__(master)
-        self.ranks = fetch_ranks()
+        self.ranks = []
+        self._runner = get_runner(self)
         self._build_ui()
+        self.refresh(force=False)
 
     def _build_ui(self):
         self.columnconfigure(1, weight=1)
@@ -277,8 +450,6 @@ class AddReqFrame(ttk.Frame):
         ttk.Label(left, text='Ranks').pack()
         self.rank_list = tk.Listbox(left, height=20, width=30)
         self.rank_list.pack(fill='y')
-        for r in self.ranks:
-            self.rank_list.insert('end', f"{r[1]} (id {r[0]})")
         self.rank_list.bind('<<ListboxSelect>>', self.on_rank_select)
 
         right = ttk.Frame(self)
@@ -303,8 +474,11 @@ class AddReqFrame(ttk.Frame):
             apply_accent(btn_create)
         except Exception:
             pass
+        ttk.Button(btnf, text='Unlink Selected', command=self.unlink_selected).pack(side='left', padx=6)
         ttk.Button(btnf, text='Import CSV', command=self.import_csv).pack(side='left', padx=6)
         ttk.Button(btnf, text='Refresh Ranks', command=self.refresh).pack(side='left', padx=6)
+        self._busy = LoadingIndicator(btnf)
+        self._busy.pack(side='left', padx=6)
 
         self.req_tree = ttk.Treeview(right, columns=('id','name'), show='headings')
         self.req_tree.heading('id', text='ID')
@@ -316,10 +490,6 @@ class AddReqFrame(ttk.Frame):
         except Exception:
             pass
 
-        if self.ranks:
-            self.rank_list.selection_set(0)
-            self.on_rank_select()
-
     def on_rank_select(self, *a):
         sel = self.rank_list.curselection()
         if not sel:
@@ -329,11 +499,15 @@ class AddReqFrame(ttk.Frame):
         self.load_requirements(rank_id)
 
     def load_requirements(self, rank_id):
-        for i in self.req_tree.get_children():
-            self.req_tree.delete(i)
-        reqs = fetch_requirements_for_rank(rank_id)
-        for r in reqs:
-            self.req_tree.insert('', 'end', iid=str(r[0]), values=(r[0], r[1]))
+        self._runner.submit(load_requirements_for_rank, rank_id, on_done=lambda reqs: self._render_requirements(rank_id, reqs),
+                            indicator=self._busy, error_message='Could not load requirements (see terminal).')
+
+    def _render_requirements(self, rank_id, reqs):
+        # drop results for a rank that is no longer selected
+        sel = self.rank_list.curselection()
+        if sel and self.ranks[sel[0]][0] != rank_id:
+            return
+        fill_tree(self.req_tree, reqs, key=lambda r: r[0], values=lambda r: (r[0], r[1]))
 
     def create_and_link(self):
         sel = self.rank_list.curselection()
@@ -346,41 +520,66 @@ class AddReqFrame(ttk.Frame):
         if not name:
             messagebox.showerror('Validation', 'Requirement name required')
             return
-        req_id = create_requirement(name, desc)
-        if not req_id:
-            return
-        if link_requirement_to_rank(rank_id, req_id):
+
+        def created(req_id):
             messagebox.showinfo('Done', f'Created requirement {req_id} and linked to rank {rank_id}')
             self.load_requirements(rank_id)
 
+        self._runner.submit(create_and_link_requirement, rank_id, name, desc, on_done=created, indicator=self._busy,
+                            error_message='Could not create requirement (see terminal).')
+
+    def unlink_selected(self):
+        sel = self.rank_list.curselection()
+        req_sel = self.req_tree.selection()
+        if not sel or not req_sel:
+            messagebox.showinfo('Select', 'Select a rank and one of its requirements first')
+            return
+        rank_id = self.ranks[sel[0]][0]
+        req_id, req_name = self.req_tree.item(req_sel[0], 'values')[:2]
+        if not messagebox.askyesno('Confirm', f'Remove "{req_name}" from this rank?'):
+            return
+        self._runner.submit(unlink_requirement_from_rank, rank_id, int(req_id),
+                            on_done=lambda _: self.load_requirements(rank_id), indicator=self._busy,
+                            error_message='Could not unlink requirement (see terminal).')
+
     def import_csv(self):
         path = filedialog.askopenfilename(filetypes=[('CSV files','*.csv'),('All files','*.*')])
         if not path:
             return
         items = import_csv_file(path)
-        for rank_idf, name, desc in items:
-            if not name:
-                continue
-            try:
-                rid = int(rank_idf)
-            except Exception:
-                rid = find_rank_id_by_name(rank_idf)
-            if not rid:
-                messagebox.showwarning('Warning', f'Could not resolve rank: {rank_idf}; skipping')
-                continue
-            req_id = create_requirement(name, desc)
-            if req_id:
-                link_requirement_to_rank(rid, req_id)
-        messagebox.showinfo('Done', 'CSV import complete')
-        sel = self.rank_list.curselection()
-        if sel:
-            self.load_requirements(self.ranks[sel[0]][0])
+        if not items:
+            return
 
-    def refresh(self):
-        self.ranks = fetch_ranks()
+        def imported(report):
+            messagebox.showinfo('Done', report.summary())
+            sel = self.rank_list.curselection()
+            if sel:
+                self.load_requirements(self.ranks[sel[0]][0])
+
+        def previewed(report):
+            # dry run first; only write once the user has seen what will change
+            if not messagebox.askyesno('Import preview', report.summary() + '\n\nApply this import?'):
+                return
+            self._runner.submit(import_requirement_rows, items, on_done=imported, indicator=self._busy,
+                                error_message='CSV import failed (see terminal).')
+
+        self._runner.submit(import_requirement_rows, items, True, on_done=previewed, indicator=self._busy,
+                            error_message='Could not preview CSV import (see terminal).')
+
+    def refresh(self, force=True):
+        # the Refresh button bypasses the lookup cache; the initial load may use it
+        self._runner.submit(load_ranks, force, on_done=self._render_ranks, indicator=self._busy,
+                            error_message='Could not load ranks (see terminal).')
+
+    def _render_ranks(self, ranks):
+        self.ranks = ranks
         self.rank_list.delete(0, 'end')
         for r in self.ranks:
             self.rank_list.insert('end', f"{r[1]} (id {r[0]})")
         if self.ranks:
             self.rank_list.selection_set(0)
             self.on_rank_select()
+
+
+if __name__ == '__main__':
+    RequirementsApp()
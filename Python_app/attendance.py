@@ -0,0 +1,514 @@
+"""
+Event attendance roll call.
+
+event and event_attendance had no code path. Checking in 60+ cadets in a few minutes must not
+wait on the database per scan, so the Attendance tab works like this:
+
+  load_roll()      one read per event: the roster (from roster.ROSTER) as a cap_id -> row dict
+                   plus the cadets already checked in. Each scanned or typed CAP ID is then a
+                   dict lookup on the Tk thread, with no query.
+  CheckInBuffer    check-ins (and un-check-ins) wait here, keyed by (event, cadet) so a repeat
+                   scan is one pending row. The tab flushes it every FLUSH_MS on a worker with
+                   multi-row upserts, and once more when the event changes or the tab closes.
+  attendance_stats()  attendance rates per cadet and per event from two grouped queries over a
+                   date range, whatever the number of cadets or events.
+
+Migration 0006 makes (event, cadet) unique in event_attendance; the roll refuses to open until
+it has run, since the flush relies on the upsert.
+
+Data functions raise on DB errors; run them through tasks.TaskRunner. AttendanceFrame is the tab
+shown in the main window.
+
+Requires: mysql-connector-python
+"""
+
+import datetime
+import logging
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import NamedTuple
+
+from db import checkout_connection
+from roster import ROSTER, ensure_loaded as ensure_roster_loaded
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+# how often the tab writes buffered check-ins (ms)
+FLUSH_MS = int(os.environ.get('CADET_ATTENDANCE_FLUSH_MS', '3000'))
+# rows per multi-row INSERT
+FLUSH_MAX_ROWS = 200
+# events offered in the event picker
+EVENT_LIST_LIMIT = 100
+
+_available = None
+
+
+def attendance_available(cur):
+    """True once migration 0006 has made (event, cadet) unique (checked once per process)."""
+    global _available
+    if _available is None:
+        cur.execute("SELECT COUNT(*) FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = 'event_attendance' "
+                    "AND index_name = 'uq_attendance_event_cadet'")
+        _available = bool(cur.fetchone()[0])
+    return _available
+
+
+class EventRow(NamedTuple):
+    event_id: int
+    name: str
+    start: datetime.datetime
+    end: datetime.datetime
+    location: str
+
+    @property
+    def label(self):
+        return f'{self.start:%Y-%m-%d %H:%M}  {self.name} ({self.location})'
+
+
+def fetch_events(limit=EVENT_LIST_LIMIT):
+    """Most recent events first, as EventRow."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT event_id, event_name, event_start_date, event_end_date, location FROM event '
+                    'ORDER BY event_start_date DESC LIMIT %s', (limit,))
+        return [EventRow(*r) for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def create_event(name, start, end, location, notes=None):
+    """Insert an event and return its EventRow."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('INSERT INTO event (event_name, event_start_date, event_end_date, location, notes) '
+                    'VALUES (%s, %s, %s, %s, %s)', (name, start, end, location, notes))
+        event_id = cur.lastrowid
+        conn.commit()
+        return EventRow(event_id, name, start, end, location)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def roster_by_capid(rows):
+    """{cap_id: (cadet_id, cap_id, first_name, last_name)} for O(1) check-in lookups."""
+    return {int(r[1]): r for r in rows if r[1] is not None}
+
+
+def load_roll(event_id):
+    """({cap_id: roster row}, {cadet_id already checked in}) for one event."""
+    roster = ensure_roster_loaded()
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if not attendance_available(cur):
+            raise RuntimeError('event_attendance has no (event, cadet) key; run python migrate.py first')
+        cur.execute('SELECT cadet_cadet_id FROM event_attendance WHERE event_event_id = %s AND attended = 1', (event_id,))
+        present = {r[0] for r in cur.fetchall()}
+    finally:
+        conn.close()
+    return roster_by_capid(roster.search('')), present
+
+
+def write_attendance(items):
+    """Upsert [((event_id, cadet_id), attended)] with multi-row INSERTs in one transaction."""
+    rows = [(event_id, cadet_id, attended) for (event_id, cadet_id), attended in items]
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        for start in range(0, len(rows), FLUSH_MAX_ROWS):
+            chunk = rows[start:start + FLUSH_MAX_ROWS]
+            params = [v for row in chunk for v in row]
+            cur.execute('INSERT INTO event_attendance (event_event_id, cadet_cadet_id, attended) VALUES '
+                        + ', '.join(['(%s, %s, %s)'] * len(chunk))
+                        + ' ON DUPLICATE KEY UPDATE attended = VALUES(attended)', params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return len(rows)
+
+
+class CheckInBuffer:
+    """Pending attendance writes, keyed by (event_id, cadet_id); the last change wins.
+
+    add() is called on the Tk thread; flush() runs on a worker. A failed flush puts its rows
+    back unless they were changed again meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def add(self, event_id, cadet_id, attended=1):
+        with self._lock:
+            self._pending[(event_id, cadet_id)] = attended
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write everything pending. Returns the number of rows written."""
+        with self._lock:
+            items, self._pending = list(self._pending.items()), {}
+        if not items:
+            return 0
+        try:
+            return write_attendance(items)
+        except Exception:
+            with self._lock:
+                for key, attended in items:
+                    self._pending.setdefault(key, attended)
+            raise
+
+
+def attendance_stats(since=None):
+    """Attendance rates from `since` (a date; None for all time).
+
+    Returns (event_count, cadet_rows, event_rows):
+      cadet_rows  (cadet_id, cap_id, first_name, last_name, attended, rate %)
+      event_rows  (event_id, event_name, start, present, rate % of the current roster)
+    """
+    since = since or datetime.date(1000, 1, 1)
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT COUNT(*) FROM event WHERE event_start_date >= %s', (since,))
+        event_count = cur.fetchone()[0]
+        cur.execute('''
+            SELECT c.cadet_id, c.cap_id, c.first_name, c.last_name, COALESCE(a.attended, 0)
+            FROM cadet c
+            LEFT JOIN (
+                SELECT ea.cadet_cadet_id, COUNT(*) AS attended
+                FROM event_attendance ea
+                JOIN event e ON e.event_id = ea.event_event_id
+                WHERE e.event_start_date >= %s AND ea.attended = 1
+                GROUP BY ea.cadet_cadet_id
+            ) a ON a.cadet_cadet_id = c.cadet_id
+        ''', (since,))
+        cadets = cur.fetchall()
+        cur.execute('''
+            SELECT e.event_id, e.event_name, e.event_start_date, COALESCE(SUM(ea.attended = 1), 0)
+            FROM event e
+            LEFT JOIN event_attendance ea ON ea.event_event_id = e.event_id
+            WHERE e.event_start_date >= %s
+            GROUP BY e.event_id
+            ORDER BY e.event_start_date DESC
+        ''', (since,))
+        events = cur.fetchall()
+    finally:
+        conn.close()
+    roster_size = len(cadets)
+    cadet_rows = [(cid, cap, first or '', last or '', int(n), 100.0 * int(n) / event_count if event_count else 0.0)
+                  for cid, cap, first, last, n in cadets]
+    event_rows = [(eid, name, start, int(n), 100.0 * int(n) / roster_size if roster_size else 0.0)
+                  for eid, name, start, n in events]
+    return event_count, cadet_rows, event_rows
+
+
+# --- UI -------------------------------------------------------------------
+
+STATS_WINDOWS = (('Last 30 days', 30), ('Last 90 days', 90), ('Last 365 days', 365), ('All time', None))
+
+
+class AttendanceFrame(ttk.Frame):
+    """Attendance tab: roll call for one event and attendance statistics."""
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self._runner = get_runner(self)
+        self._buffer = CheckInBuffer()
+        self._events = []
+        self._event = None
+        self._by_capid = {}
+        self._present = {}        # cadet_id -> roster row, in check-in order
+        self._flushing = False
+        self._flush_after = None
+        self._build_ui()
+        ROSTER.subscribe(self._on_roster_changed)
+        self.bind('<Destroy>', self._on_destroy, add='+')
+        self.load_events()
+        self._schedule_flush()
+
+    def _build_ui(self):
+        nb = ttk.Notebook(self)
+        nb.pack(fill='both', expand=True, padx=8, pady=8)
+
+        # --- roll call ---
+        roll = ttk.Frame(nb, padding=6)
+        nb.add(roll, text='Roll Call')
+        top = ttk.Frame(roll)
+        top.pack(fill='x')
+        ttk.Label(top, text='Event').pack(side='left')
+        self.event_var = tk.StringVar()
+        self.event_cb = ttk.Combobox(top, textvariable=self.event_var, state='readonly', width=60)
+        self.event_cb.pack(side='left', padx=4)
+        self.event_cb.bind('<<ComboboxSelected>>', lambda e: self._on_event_selected())
+        ttk.Button(top, text='New Event', command=self.new_event).pack(side='left', padx=4)
+        ttk.Button(top, text='Refresh', command=self.load_events).pack(side='left', padx=4)
+        self._busy = LoadingIndicator(top)
+        self._busy.pack(side='left', padx=6)
+
+        entry_row = ttk.Frame(roll)
+        entry_row.pack(fill='x', pady=(10, 0))
+        ttk.Label(entry_row, text='CAP ID').pack(side='left')
+        self.cap_var = tk.StringVar()
+        self.cap_entry = ttk.Entry(entry_row, textvariable=self.cap_var, width=14, font=('TkDefaultFont', 14))
+        self.cap_entry.pack(side='left', padx=6)
+        self.cap_entry.bind('<Return>', lambda e: self.check_in())
+        ttk.Button(entry_row, text='Check In', command=self.check_in).pack(side='left', padx=4)
+        ttk.Button(entry_row, text='Undo Selected', command=self.undo_selected).pack(side='left', padx=4)
+        self.last_var = tk.StringVar(value='Select an event to start')
+        ttk.Label(roll, textvariable=self.last_var, font=('TkDefaultFont', 14, 'bold')).pack(anchor='w', pady=(8, 0))
+        self.count_var = tk.StringVar()
+        ttk.Label(roll, textvariable=self.count_var).pack(anchor='w')
+
+        self.present_tv = ttk.Treeview(roll, columns=('cap_id', 'name'), show='headings', selectmode='extended')
+        self.present_tv.heading('cap_id', text='CAP ID')
+        self.present_tv.heading('name', text='Cadet')
+        self.present_tv.column('cap_id', width=90, anchor='center')
+        self.present_tv.column('name', width=260)
+        self.present_tv.pack(fill='both', expand=True, pady=(6, 0))
+
+        # --- statistics ---
+        stats = ttk.Frame(nb, padding=6)
+        nb.add(stats, text='Statistics')
+        stop = ttk.Frame(stats)
+        stop.pack(fill='x')
+        self.window_var = tk.StringVar(value=STATS_WINDOWS[1][0])
+        ttk.Combobox(stop, textvariable=self.window_var, values=[w[0] for w in STATS_WINDOWS],
+                     state='readonly', width=14).pack(side='left')
+        ttk.Button(stop, text='Refresh', command=self.load_stats).pack(side='left', padx=6)
+        self._stats_busy = LoadingIndicator(stop)
+        self._stats_busy.pack(side='left', padx=6)
+        self.stats_var = tk.StringVar()
+        ttk.Label(stop, textvariable=self.stats_var).pack(side='right')
+        panes = ttk.Panedwindow(stats, orient='horizontal')
+        panes.pack(fill='both', expand=True, pady=(6, 0))
+        self.cadet_tv = self._stats_tree(panes, (('name', 'Cadet', 200), ('cap_id', 'CAP ID', 80),
+                                                 ('attended', 'Attended', 80), ('rate', 'Rate', 70)))
+        self.event_tv = self._stats_tree(panes, (('date', 'Date', 130), ('event', 'Event', 200),
+                                                 ('present', 'Present', 70), ('rate', '% of Roster', 90)))
+
+    def _stats_tree(self, panes, columns):
+        frame = ttk.Frame(panes)
+        panes.add(frame, weight=1)
+        tv = ttk.Treeview(frame, columns=[c[0] for c in columns], show='headings')
+        for key, title, width in columns:
+            tv.heading(key, text=title)
+            tv.column(key, width=width, anchor='w' if key in ('name', 'event') else 'center')
+        sb = ttk.Scrollbar(frame, orient='vertical', command=tv.yview)
+        tv.configure(yscrollcommand=sb.set)
+        sb.pack(side='right', fill='y')
+        tv.pack(side='left', fill='both', expand=True)
+        return tv
+
+    # --- events ---
+    def load_events(self):
+        self._runner.submit(fetch_events, on_done=self._render_events, indicator=self._busy,
+                            error_message='Could not load events (see terminal).')
+
+    def _render_events(self, events):
+        self._events = events
+        self.event_cb['values'] = [e.label for e in events]
+        if self._event is not None:
+            for e in events:
+                if e.event_id == self._event.event_id:
+                    self.event_var.set(e.label)
+                    break
+
+    def _on_event_selected(self):
+        idx = self.event_cb.current()
+        if idx < 0:
+            return
+        event = self._events[idx]
+        if self._event is not None and event.event_id == self._event.event_id:
+            return
+        # the previous event's check-ins are written by the next flush; they are keyed by event
+        self._event = event
+        self._by_capid = {}
+        self._present = {}
+        self._show_present()
+        self.last_var.set('Loading roll...')
+        self.flush_now()
+        self._runner.submit(load_roll, event.event_id, on_done=lambda res: self._render_roll(event, res),
+                            indicator=self._busy, error_message='Could not load the roll (see terminal).')
+
+    def _render_roll(self, event, result):
+        if self._event is None or self._event.event_id != event.event_id:
+            return
+        by_capid, present_ids = result
+        self._by_capid = by_capid
+        rows = {r[0]: r for r in by_capid.values()}
+        # check-ins made while the roll was loading stay
+        merged = {cid: rows[cid] for cid in present_ids if cid in rows}
+        merged.update(self._present)
+        self._present = merged
+        self._show_present()
+        self.last_var.set(f'Ready: {event.name}')
+        self.cap_entry.focus_set()
+
+    def new_event(self):
+        top = tk.Toplevel(self)
+        top.title('New Event')
+        top.transient(self.winfo_toplevel())
+        now = datetime.datetime.now().replace(second=0, microsecond=0)
+        fields = (('Name', ''), ('Start (YYYY-MM-DD HH:MM)', f'{now:%Y-%m-%d %H:%M}'),
+                  ('End (YYYY-MM-DD HH:MM)', f'{now + datetime.timedelta(hours=2):%Y-%m-%d %H:%M}'), ('Location', ''))
+        vars_ = []
+        for row, (label, value) in enumerate(fields):
+            ttk.Label(top, text=label).grid(row=row, column=0, sticky='w', padx=6, pady=3)
+            var = tk.StringVar(value=value)
+            ttk.Entry(top, textvariable=var, width=36).grid(row=row, column=1, padx=6, pady=3)
+            vars_.append(var)
+
+        def save():
+            name, start, end, location = (v.get().strip() for v in vars_)
+            try:
+                start = datetime.datetime.strptime(start, '%Y-%m-%d %H:%M')
+                end = datetime.datetime.strptime(end, '%Y-%m-%d %H:%M')
+            except ValueError:
+                messagebox.showwarning('New Event', 'Dates must be YYYY-MM-DD HH:MM', parent=top)
+                return
+            if not name or not location:
+                messagebox.showwarning('New Event', 'Name and location are required', parent=top)
+                return
+            if end < start:
+                messagebox.showwarning('New Event', 'The event ends before it starts', parent=top)
+                return
+            top.destroy()
+            self._runner.submit(create_event, name, start, end, location, on_done=self._event_created,
+                                indicator=self._busy, error_message='Could not create the event (see terminal).')
+
+        btns = ttk.Frame(top)
+        btns.grid(row=len(fields), column=0, columnspan=2, pady=6)
+        ttk.Button(btns, text='Create', command=save).pack(side='left', padx=4)
+        ttk.Button(btns, text='Cancel', command=top.destroy).pack(side='left', padx=4)
+
+    def _event_created(self, event):
+        self._events.insert(0, event)
+        self.event_cb['values'] = [e.label for e in self._events]
+        self.event_cb.current(0)
+        self._on_event_selected()
+
+    # --- roll call ---
+    def check_in(self):
+        text = self.cap_var.get().strip()
+        self.cap_var.set('')
+        if self._event is None or not self._by_capid:
+            self.last_var.set('Select an event first (or wait for the roll to load)')
+            return
+        try:
+            row = self._by_capid.get(int(text))
+        except ValueError:
+            row = None
+        if row is None:
+            self.last_var.set(f'Unknown CAP ID: {text}')
+            self.bell()
+            return
+        cadet_id, cap_id, first, last = row
+        if cadet_id in self._present:
+            self.last_var.set(f'Already checked in: {last}, {first}')
+            return
+        self._buffer.add(self._event.event_id, cadet_id, 1)
+        self._present[cadet_id] = row
+        self.last_var.set(f'Checked in: {last}, {first} ({cap_id})')
+        self._show_present()
+
+    def undo_selected(self):
+        if self._event is None:
+            return
+        for iid in self.present_tv.selection():
+            cadet_id = int(iid)
+            if self._present.pop(cadet_id, None) is not None:
+                self._buffer.add(self._event.event_id, cadet_id, 0)
+        self._show_present()
+
+    def _show_present(self):
+        # most recent check-in first
+        rows = list(reversed(list(self._present.values())))
+        fill_tree(self.present_tv, rows, key=lambda r: r[0], values=lambda r: (r[1], f'{r[3]}, {r[2]}'))
+        self._update_count()
+
+    def _update_count(self):
+        if self._event is None:
+            self.count_var.set('')
+            return
+        pending = len(self._buffer)
+        text = f'{len(self._present)} of {len(self._by_capid)} present'
+        self.count_var.set(text + (f' ({pending} not yet saved)' if pending else ''))
+
+    def _on_roster_changed(self):
+        # keep CAP ID lookups current when a cadet is added or edited in another tab
+        if self._by_capid:
+            self._by_capid = roster_by_capid(ROSTER.search(''))
+
+    # --- flushing ---
+    def _schedule_flush(self):
+        self._flush_after = self.after(FLUSH_MS, self._on_flush_timer)
+
+    def _on_flush_timer(self):
+        self.flush_now()
+        self._schedule_flush()
+
+    def flush_now(self):
+        if self._flushing or not len(self._buffer):
+            return
+        self._flushing = True
+
+        def done(_count):
+            self._flushing = False
+            self._update_count()
+
+        def failed(exc):
+            # rows stay buffered and the next timer retries
+            self._flushing = False
+            logging.error('Attendance flush failed: %s', exc)
+            self._update_count()
+
+        self._runner.submit(self._buffer.flush, on_done=done, on_error=failed)
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        ROSTER.unsubscribe(self._on_roster_changed)
+        if self._flush_after is not None:
+            try:
+                self.after_cancel(self._flush_after)
+            except tk.TclError:
+                pass
+        # last chance to write: the app is closing, so wait for it here
+        try:
+            self._buffer.flush()
+        except Exception:
+            logging.exception('Could not save buffered check-ins on close')
+
+    # --- statistics ---
+    def load_stats(self):
+        days = dict(STATS_WINDOWS).get(self.window_var.get())
+        since = datetime.date.today() - datetime.timedelta(days=days) if days else None
+        self.flush_now()
+        self._runner.submit(attendance_stats, since, on_done=self._render_stats, indicator=self._stats_busy,
+                            error_message='Could not load attendance statistics (see terminal).')
+
+    def _render_stats(self, result):
+        event_count, cadet_rows, event_rows = result
+        cadet_rows = sorted(cadet_rows, key=lambda r: (-r[5], r[3].casefold(), r[2].casefold()))
+        fill_tree(self.cadet_tv, cadet_rows, key=lambda r: r[0],
+                  values=lambda r: (f'{r[3]}, {r[2]}', r[1], r[4], f'{r[5]:.0f}%'))
+        fill_tree(self.event_tv, event_rows, key=lambda r: r[0],
+                  values=lambda r: (f'{r[2]:%Y-%m-%d %H:%M}', r[1], r[3], f'{r[4]:.0f}%'))
+        avg = sum(r[5] for r in cadet_rows) / len(cadet_rows) if cadet_rows else 0.0
+        self.stats_var.set(f'{event_count} event(s); average attendance {avg:.0f}%')
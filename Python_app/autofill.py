@@ -0,0 +1,149 @@
+"""
+Shared CAP ID / name autofill for the cadet forms.
+
+CadetForm, InspectionForm and the Dashboard profile editor autofill from `trace_add('write')`
+callbacks. They used to query the database on every keystroke, so typing a 6-digit CAP ID
+opened six connections, and the name lookup used LOWER(first_name) = LOWER(%s), which cannot
+use an index. AutofillService replaces that with:
+
+  - debouncing: a lookup only runs once typing pauses for AUTOFILL_DEBOUNCE_MS, and a new
+    keystroke cancels the pending one for the same field;
+  - the in-memory roster (roster.ROSTER) as the cap_id -> cadet and name -> cadet map, so most
+    lookups never touch the database;
+  - a single-row database fallback for complete CAP IDs the roster doesn't know (added by
+    another client), with a negative cache so a miss isn't repeated for NEGATIVE_TTL seconds.
+    Partial CAP IDs (fewer than CAPID_MIN_DIGITS digits) never go to the database.
+
+Callbacks run on the Tk thread with a roster row (cadet_id, cap_id, first_name, last_name) or
+None. Views still check the field hasn't changed since (latest-wins) before using the result.
+"""
+
+import logging
+import time
+import tkinter as tk
+
+from db import checkout_connection
+from roster import ROSTER, ensure_loaded as ensure_roster_loaded
+from tasks import get_runner
+
+AUTOFILL_DEBOUNCE_MS = 250
+# CAP IDs are six digits; shorter input is treated as still being typed
+CAPID_MIN_DIGITS = 6
+NEGATIVE_TTL = 60.0
+
+_service = None
+
+
+def fetch_roster_row(capid):
+    """Return (cadet_id, cap_id, first_name, last_name) for one CAP ID, or None. Worker-thread helper."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE cap_id = %s LIMIT 1', (capid,))
+        return cur.fetchone()
+    finally:
+        conn.close()
+
+
+class AutofillService:
+    def __init__(self, root):
+        self.root = root
+        self._runner = get_runner(root)
+        self._pending = {}   # key -> after() id
+        self._misses = {}    # cap_id -> time of the last database miss
+
+    # ---------------- public API ----------------
+    def lookup_capid(self, key, text, callback, indicator=None, delay_ms=AUTOFILL_DEBOUNCE_MS):
+        """Debounced CAP ID lookup. `key` identifies the field (e.g. (id(self), 'capid'))."""
+        text = (text or '').strip()
+        if not text.isdigit():
+            self.cancel(key)
+            return
+        self._debounce(key, delay_ms, lambda: self._resolve_capid(int(text), callback, indicator))
+
+    def lookup_name(self, key, first, last, callback, indicator=None, delay_ms=AUTOFILL_DEBOUNCE_MS):
+        """Debounced exact (case-insensitive) first + last name lookup against the roster."""
+        if not (first or '').strip():
+            self.cancel(key)
+            return
+        self._debounce(key, delay_ms, lambda: self._when_roster_ready(
+            lambda: self._deliver(callback, ROSTER.by_name(first, last)), indicator))
+
+    def cancel(self, key):
+        after_id = self._pending.pop(key, None)
+        if after_id is not None:
+            try:
+                self.root.after_cancel(after_id)
+            except tk.TclError:
+                pass
+
+    def forget_miss(self, capid):
+        self._misses.pop(capid, None)
+
+    # ---------------- internals ----------------
+    def _debounce(self, key, delay_ms, fn):
+        self.cancel(key)
+
+        def fire():
+            self._pending.pop(key, None)
+            fn()
+
+        self._pending[key] = self.root.after(delay_ms, fire)
+
+    def _when_roster_ready(self, fn, indicator):
+        if ROSTER.loaded:
+            fn()
+            return
+        # first lookup in this process: load the roster once (one query), then answer from it
+        self._runner.submit(ensure_roster_loaded, on_done=lambda _: fn(), indicator=indicator,
+                            on_error=lambda e: logging.error('Could not load roster for autofill: %s', e))
+
+    def _resolve_capid(self, capid, callback, indicator):
+        def from_roster():
+            row = ROSTER.by_capid(capid)
+            if row is not None:
+                self._deliver(callback, row)
+                return
+            if len(str(capid)) < CAPID_MIN_DIGITS or self._recent_miss(capid):
+                self._deliver(callback, None)
+                return
+            # complete CAP ID the roster doesn't know: ask the database once
+            self._runner.submit(fetch_roster_row, capid, on_done=lambda r: self._on_db_result(capid, r, callback),
+                                indicator=indicator,
+                                on_error=lambda e: logging.error('Error looking up cadet by capid: %s', e))
+
+        self._when_roster_ready(from_roster, indicator)
+
+    def _on_db_result(self, capid, row, callback):
+        if row:
+            self.forget_miss(capid)
+            ROSTER.upsert(row)
+        else:
+            self._misses[capid] = time.monotonic()
+        self._deliver(callback, row)
+
+    def _recent_miss(self, capid):
+        at = self._misses.get(capid)
+        if at is None:
+            return False
+        if time.monotonic() - at > NEGATIVE_TTL:
+            del self._misses[capid]
+            return False
+        return True
+
+    @staticmethod
+    def _deliver(callback, row):
+        try:
+            callback(row)
+        except tk.TclError:
+            # the form was closed while the lookup was pending
+            logging.debug('Dropped autofill result for a destroyed widget', exc_info=True)
+
+
+def get_autofill(widget):
+    """Return the process-wide AutofillService, bound to the widget's root window."""
+    global _service
+    root = widget.nametowidget('.')
+    if _service is None or _service.root is not root:
+        _service = AutofillService(root)
+    return _service
@@ -0,0 +1,445 @@
+"""
+Benchmark harness for the data-access functions behind the main screens.
+
+It seeds a scratch MySQL database (never `cadet_tracker`) with synthetic data, times each
+function, and writes p50/p95/p99 latency plus database round trips (statements executed and
+connections checked out) per call to a JSON file. With --baseline it fails (exit 1) when a
+function got slower than the stored baseline by more than --tolerance, or started making
+more round trips.
+
+Needs a local MySQL server reachable with the credentials in db.py (there is no stand-in:
+the point is to measure real queries). The scratch database is created from ../schema.sql.
+
+    python bench.py seed --database cadet_bench --size small        # 40 cadets
+    python bench.py seed --database cadet_bench --size large        # 50k cadets, 2M scores
+    python bench.py seed --database cadet_bench --cadets 5000 --inspections 4
+    python bench.py run --database cadet_bench --out bench_results.json
+    python bench.py run --database cadet_bench --baseline bench_baseline.json
+    python bench.py run --database cadet_bench --save-baseline bench_baseline.json
+
+"cold" runs drop the app's in-process caches (lookups.py, roster.py) before every call;
+"warm" runs keep them. MySQL's own buffer pool is not flushed between runs (that needs a
+server restart), so cold numbers still benefit from pages cached by the server.
+
+Requires: mysql-connector-python
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+
+import db
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'schema.sql')
+PRODUCTION_DB = 'cadet_tracker'
+
+# --size presets: cadets, inspections per cadet, reports per cadet
+SIZES = {
+    'small': (40, 3, 1),
+    'medium': (2000, 4, 1),
+    'large': (50000, 2, 1),      # 50k cadets x 2 inspections x 20 items = 2M scores
+}
+ITEMS = 20
+RANK_COUNT = 16
+REQUIREMENTS_PER_RANK = 5
+POSITION_COUNT = 20
+SEED_BATCH = 10000
+
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+               'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas',
+               'Sarah', 'Charles', 'Karen', 'Daniel', 'Nancy', 'Matthew', 'Lisa', 'Anthony', 'Emily']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+              'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor',
+              'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Clark']
+
+
+# ---------------- seeding ----------------
+def _check_scratch(database):
+    if database == PRODUCTION_DB:
+        raise SystemExit(f'Refusing to use {PRODUCTION_DB!r}; pass a scratch database name with --database')
+
+
+def _schema_statements(database):
+    with open(SCHEMA_PATH, encoding='utf-8') as fh:
+        text = fh.read().replace('`cadet_tracker`', f'`{database}`')
+    text = re.sub(r'^--.*$', '', text, flags=re.M)
+    return [s.strip() for s in text.split(';') if s.strip()]
+
+
+def _batches(rows, size=SEED_BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(cur, sql, rows):
+    n = 0
+    for batch in _batches(rows):
+        cur.executemany(sql, batch)
+        n += len(batch)
+    return n
+
+
+def seed(database, cadets, inspections, reports, rng_seed=1, migrate_after=True):
+    """Drop and recreate `database` from schema.sql and fill it with synthetic data."""
+    _check_scratch(database)
+    import mysql.connector
+    cfg = {k: v for k, v in db.DB_CONFIG.items() if k != 'database'}
+    conn = mysql.connector.connect(**cfg)
+    rng = random.Random(rng_seed)
+    started = time.perf_counter()
+    try:
+        cur = conn.cursor()
+        cur.execute(f'DROP DATABASE IF EXISTS `{database}`')
+        for stmt in _schema_statements(database):
+            cur.execute(stmt)
+        cur.execute(f'USE `{database}`')
+        cur.execute('SET foreign_key_checks = 0, unique_checks = 0')
+
+        today = datetime.date.today()
+        _insert(cur, 'INSERT INTO `rank` (rank_id, rank_name, rank_order) VALUES (%s, %s, %s)',
+                ((i, f'Rank {i:02d}', i) for i in range(1, RANK_COUNT + 1)))
+        req_rows = [(r * 100 + k, f'Requirement {r:02d}-{k}', 'Synthetic requirement')
+                    for r in range(1, RANK_COUNT + 1) for k in range(1, REQUIREMENTS_PER_RANK + 1)]
+        _insert(cur, 'INSERT INTO requirement (requirement_id, requirement_name, description) VALUES (%s, %s, %s)', req_rows)
+        _insert(cur, 'INSERT INTO rank_has_requirement (rank_rank_id, rank_requirement_requirement_id) VALUES (%s, %s)',
+                ((rid // 100, rid) for rid, _n, _d in req_rows))
+        _insert(cur, 'INSERT INTO `position` (position_id, position_name, description, level, line) VALUES (%s, %s, %s, %s, %s)',
+                ((i, f'Position {i:02d}', None, i % 5, i % 2) for i in range(1, POSITION_COUNT + 1)))
+        _insert(cur, 'INSERT INTO inspection_item (item_id, item_name, description) VALUES (%s, %s, %s)',
+                [(i, f'Item {i:02d}', f'Item {i:02d}') for i in range(1, ITEMS + 1)] + [(ITEMS + 1, 'Aggregate', 'Aggregate score for inspection form')])
+
+        def cadet_rows():
+            for cid in range(1, cadets + 1):
+                dob = today - datetime.timedelta(days=rng.randint(12 * 365, 20 * 365))
+                join = today - datetime.timedelta(days=rng.randint(0, 5 * 365))
+                yield (cid, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), dob, join, 100000 + cid)
+        _insert(cur, 'INSERT INTO cadet (cadet_id, first_name, last_name, date_of_birth, join_date, cap_id) VALUES (%s, %s, %s, %s, %s, %s)', cadet_rows())
+
+        held = [rng.randint(1, RANK_COUNT - 1) for _ in range(cadets)]
+        _insert(cur, 'INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s, %s, %s)',
+                ((r, cid, datetime.datetime(2020, 1, 1) + datetime.timedelta(days=r * 30))
+                 for cid, top in enumerate(held, start=1) for r in range(1, top + 1)))
+        _insert(cur, 'INSERT INTO cadet_has_rank_requirement (cadet_cadet_id, requirement_requirement_id, date_completed) VALUES (%s, %s, %s)',
+                ((cid, (top + 1) * 100 + k, today) for cid, top in enumerate(held, start=1)
+                 for k in range(1, REQUIREMENTS_PER_RANK + 1) if rng.random() < 0.5))
+        _insert(cur, 'INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date) VALUES (%s, %s, %s)',
+                ((rng.randint(1, POSITION_COUNT), cid, datetime.datetime(2024, 1, 1)) for cid in range(1, cadets + 1) if rng.random() < 0.3))
+
+        def inspection_rows():
+            iid = 0
+            for cid in range(1, cadets + 1):
+                for k in range(inspections):
+                    iid += 1
+                    yield (iid, today - datetime.timedelta(days=30 * k + cid % 30), None, cid)
+        n_insp = _insert(cur, 'INSERT INTO uniform_inspection (inspection_id, inspection_date, notes, cadet_cadet_id) VALUES (%s, %s, %s, %s)', inspection_rows())
+        n_scores = _insert(cur, 'INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s, %s, %s, %s)',
+                           ((rng.randint(0, 3), '', item, iid) for iid in range(1, n_insp + 1) for item in range(1, ITEMS + 1)))
+        _insert(cur, 'INSERT INTO report (report_type, description, created_by, cadet_cadet_id, Incident_date, resolved) VALUES (%s, %s, %s, %s, %s, %s)',
+                ((rng.choice(['Positive', 'Negative']), f'Synthetic report {cid}-{k}', 'bench', cid,
+                  today - datetime.timedelta(days=rng.randint(0, 700)), rng.randint(0, 1))
+                 for cid in range(1, cadets + 1) for k in range(reports)))
+        cur.execute('SET foreign_key_checks = 1, unique_checks = 1')
+        conn.commit()
+        logging.info('Seeded %s: %d cadets, %d inspections, %d scores in %.1fs',
+                     database, cadets, n_insp, n_scores, time.perf_counter() - started)
+    finally:
+        conn.close()
+    if migrate_after:
+        import migrate
+        db.DB_CONFIG['database'] = database
+        migrate.migrate()
+
+
+# ---------------- round-trip counting ----------------
+class _Counter:
+    def __init__(self):
+        self.statements = 0
+        self.connections = 0
+
+
+class _CountingCursor:
+    def __init__(self, cur, counter):
+        self._cur = cur
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter.statements += 1
+        return self._cur.execute(*args, **kwargs)
+
+    def executemany(self, operation, seq_params):
+        seq_params = list(seq_params)
+        # mysql-connector folds INSERT ... VALUES batches into one statement; others run per row
+        self._counter.statements += 1 if operation.lstrip().upper().startswith('INSERT') else len(seq_params)
+        return self._cur.executemany(operation, seq_params)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class _CountingConnection:
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return _CountingCursor(self._conn.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _install_counter(modules, counter):
+    """Route checkout_connection() in `modules` through a counting wrapper. Returns an undo callable."""
+    original = db.checkout_connection
+
+    def counting_checkout():
+        counter.connections += 1
+        return _CountingConnection(original(), counter)
+
+    saved = [(m, m.checkout_connection) for m in modules]
+    for m in modules:
+        m.checkout_connection = counting_checkout
+
+    def undo():
+        for m, fn in saved:
+            m.checkout_connection = fn
+    return undo
+
+
+# ---------------- benchmarks ----------------
+def _drop_app_caches():
+    import lookups
+    from roster import ROSTER
+    lookups.invalidate()
+    ROSTER.replace([])
+    ROSTER.loaded = False
+
+
+def _sample(cur, sql, n, rng):
+    cur.execute(sql)
+    rows = cur.fetchall()
+    return rng.sample(rows, min(n, len(rows))) if rows else []
+
+
+def build_cases(rng):
+    """Return [(name, fn)] where fn() performs one call of the function under test."""
+    import cadet_detail
+    import dashboard
+    import inspection_form
+    import reports
+    import roster
+
+    conn = db.checkout_connection()
+    try:
+        cur = conn.cursor()
+        cadets = _sample(cur, 'SELECT cadet_id, cap_id, first_name, last_name FROM cadet', 200, rng)
+        insps = _sample(cur, '''
+            SELECT ui.inspection_id, ui.inspection_date, c.cadet_id, c.cap_id, c.first_name, c.last_name
+            FROM uniform_inspection ui JOIN cadet c ON c.cadet_id = ui.cadet_cadet_id
+        ''', 200, rng)
+        cur.execute('SELECT item_name FROM inspection_item WHERE item_name <> %s ORDER BY item_id', ('Aggregate',))
+        items = [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    if not cadets or not insps:
+        raise SystemExit('Benchmark database is empty; run `python bench.py seed` first')
+
+    def pick(rows):
+        return rows[rng.randrange(len(rows))]
+
+    def load_cadets():
+        # Dashboard.load_cadets: load the roster index if needed, then list everyone
+        roster.ensure_loaded()
+        roster.ROSTER.search('')
+
+    def search_cadets():
+        roster.ensure_loaded()
+        roster.ROSTER.search(pick(cadets)[3][:3])
+
+    def save_full():
+        insp_id, insp_date, cadet_id, cap_id, first, last = pick(insps)
+        # a few changed scores, as when an inspector corrects part of a sheet
+        scores = [(name, rng.randint(0, 3) if rng.random() < 0.2 else 2, '') for name in items]
+        dashboard.save_inspection_detail(cadet_id, insp_id, cap_id, first, last, insp_date, None, scores)
+
+    def save_aggregate():
+        insp_id, insp_date, _cid, cap_id, _f, _l = pick(insps)
+        inspection_form.save_inspection(cap_id, insp_id, insp_date, None, rng.randint(20, 60), '')
+
+    return [
+        ('fetch_reports', lambda: reports.load_reports(200, 'date', 'DESC')),
+        ('load_cadets', load_cadets),
+        ('search_cadets', search_cadets),
+        ('fetch_lookups', dashboard.fetch_lookups),
+        ('fetch_cadet_detail', lambda: cadet_detail.fetch_cadet_detail(pick(cadets)[0])),
+        ('fetch_inspection_detail', lambda: dashboard.fetch_inspection_detail(pick(insps)[0])),
+        ('save_inspection_detail', save_full),
+        ('save_inspection', save_aggregate),
+    ], [cadet_detail, dashboard, inspection_form, reports, roster, __import__('lookups')]
+
+
+def _percentile(sorted_ms, pct):
+    if len(sorted_ms) == 1:
+        return sorted_ms[0]
+    k = (len(sorted_ms) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_ms) - 1)
+    return sorted_ms[lo] + (sorted_ms[hi] - sorted_ms[lo]) * (k - lo)
+
+
+def time_case(fn, iterations, warmup, cold, counter):
+    for _ in range(warmup):
+        if cold:
+            _drop_app_caches()
+        fn()
+    timings = []
+    statements = connections = 0
+    for _ in range(iterations):
+        if cold:
+            _drop_app_caches()
+        before = (counter.statements, counter.connections)
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000.0)
+        statements += counter.statements - before[0]
+        connections += counter.connections - before[1]
+    timings.sort()
+    return {
+        'n': iterations,
+        'p50_ms': round(_percentile(timings, 50), 3),
+        'p95_ms': round(_percentile(timings, 95), 3),
+        'p99_ms': round(_percentile(timings, 99), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'statements_per_call': round(statements / iterations, 2),
+        'connections_per_call': round(connections / iterations, 2),
+    }
+
+
+def run(database, iterations, warmup, only=None, rng_seed=1):
+    _check_scratch(database)
+    db.DB_CONFIG['database'] = database
+    rng = random.Random(rng_seed)
+    cases, modules = build_cases(rng)
+    counter = _Counter()
+    undo = _install_counter(modules, counter)
+    results = {}
+    try:
+        for name, fn in cases:
+            if only and name not in only:
+                continue
+            results[name] = {}
+            for mode in ('cold', 'warm'):
+                results[name][mode] = r = time_case(fn, iterations, warmup, mode == 'cold', counter)
+                logging.info('%-24s %-4s p50 %8.2f  p95 %8.2f  p99 %8.2f ms  %5.1f stmts  %4.1f conns',
+                             name, mode, r['p50_ms'], r['p95_ms'], r['p99_ms'], r['statements_per_call'], r['connections_per_call'])
+    finally:
+        undo()
+    conn = db.checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT (SELECT COUNT(*) FROM cadet), (SELECT COUNT(*) FROM uniform_inspection_score), VERSION()')
+        n_cadets, n_scores, version = cur.fetchone()
+    finally:
+        conn.close()
+    return {
+        'meta': {
+            'database': database,
+            'cadets': n_cadets,
+            'scores': n_scores,
+            'mysql_version': version,
+            'python': platform.python_version(),
+            'iterations': iterations,
+            'run_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """Return a list of regression messages (empty when nothing regressed)."""
+    problems = []
+    for name, modes in baseline.get('results', {}).items():
+        for mode, base in modes.items():
+            cur = results['results'].get(name, {}).get(mode)
+            if cur is None:
+                continue
+            limit = base['p95_ms'] * (1 + tolerance) + floor_ms
+            if cur['p95_ms'] > limit:
+                problems.append(f'{name} ({mode}): p95 {cur["p95_ms"]:.2f} ms > {limit:.2f} ms (baseline {base["p95_ms"]:.2f})')
+            if cur['statements_per_call'] > base['statements_per_call'] + 0.5:
+                problems.append(f'{name} ({mode}): {cur["statements_per_call"]} statements/call (baseline {base["statements_per_call"]})')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Seed and benchmark the CAP Cadet Tracker data-access layer.')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+
+    p_seed = sub.add_parser('seed', help='(re)create a scratch database with synthetic data')
+    p_seed.add_argument('--database', required=True)
+    p_seed.add_argument('--size', choices=sorted(SIZES), default='small')
+    p_seed.add_argument('--cadets', type=int, help='override the preset cadet count')
+    p_seed.add_argument('--inspections', type=int, help='inspections per cadet (each has %d item scores)' % ITEMS)
+    p_seed.add_argument('--reports', type=int, help='reports per cadet')
+    p_seed.add_argument('--seed', type=int, default=1)
+    p_seed.add_argument('--no-migrate', action='store_true', help='skip migrate.py after seeding')
+
+    p_run = sub.add_parser('run', help='time the data-access functions')
+    p_run.add_argument('--database', required=True)
+    p_run.add_argument('--iterations', type=int, default=50)
+    p_run.add_argument('--warmup', type=int, default=3)
+    p_run.add_argument('--only', nargs='*', help='benchmark names to run (default: all)')
+    p_run.add_argument('--out', default='bench_results.json')
+    p_run.add_argument('--baseline', help='fail if results regress past this JSON file')
+    p_run.add_argument('--save-baseline', help='also write the results to this baseline file')
+    p_run.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 slowdown (fraction, default 0.25)')
+    p_run.add_argument('--floor-ms', type=float, default=2.0, help='absolute slack added to the p95 limit (default 2 ms)')
+    args = parser.parse_args(argv)
+
+    if args.cmd == 'seed':
+        cadets, inspections, reports = SIZES[args.size]
+        seed(args.database, args.cadets or cadets, args.inspections if args.inspections is not None else inspections,
+             args.reports if args.reports is not None else reports, rng_seed=args.seed, migrate_after=not args.no_migrate)
+        return 0
+
+    results = run(args.database, args.iterations, args.warmup, only=args.only)
+    with open(args.out, 'w', encoding='utf-8') as fh:
+        json.dump(results, fh, indent=2)
+    logging.info('Wrote %s', args.out)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+        logging.info('Saved baseline %s', args.save_baseline)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        problems = compare(results, baseline, args.tolerance, args.floor_ms)
+        for p in problems:
+            logging.error('Regression: %s', p)
+        if problems:
+            return 1
+        logging.info('No regressions against %s', args.baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
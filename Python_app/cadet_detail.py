@@ -0,0 +1,166 @@
+"""
+Cadet detail loader used by the Dashboard.
+
+Selecting a cadet used to fire separate loads for the inspection list, the profile (cadet row,
+ranks, positions) and the next-promotion checklist, each with its own connection and several
+queries. fetch_cadet_detail() gathers everything the three panes need on ONE pooled
+connection with a fixed set of four joined queries, and returns a CadetDetail the panes
+render from.
+
+Like the other worker helpers it raises on DB errors; run it through tasks.TaskRunner. Pass a
+tasks.CancelToken to abandon a load early: the token is checked between queries and
+cancelling it kills the running query on the server.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from db import checkout_connection, cancellable
+from inspection_totals import history_sql
+
+
+@dataclass
+class RankInfo:
+    rank_id: int
+    rank_name: str
+    rank_order: int
+
+
+@dataclass
+class PositionInfo:
+    position_id: int
+    position_name: str
+    line: Optional[int]
+    start_date: Optional[datetime.datetime] = None
+
+
+@dataclass
+class RequirementStatus:
+    requirement_id: int
+    requirement_name: str
+    completed: bool = False
+
+
+@dataclass
+class InspectionSummary:
+    inspection_id: int
+    inspection_date: Optional[datetime.date]
+    total_score: int
+    rating: str
+    notes: Optional[str]
+
+    def as_row(self) -> tuple:
+        return (self.inspection_id, self.inspection_date, self.total_score, self.rating, self.notes)
+
+
+@dataclass
+class CadetDetail:
+    cadet_id: int
+    cap_id: int
+    first_name: str
+    last_name: str
+    date_of_birth: Optional[datetime.date] = None
+    join_date: Optional[datetime.date] = None
+    # every rank the cadet holds, highest rank_order first
+    ranks: List[RankInfo] = field(default_factory=list)
+    # position assignments, most recent first
+    positions: List[PositionInfo] = field(default_factory=list)
+    next_rank: Optional[RankInfo] = None
+    requirements: List[RequirementStatus] = field(default_factory=list)
+    inspections: List[InspectionSummary] = field(default_factory=list)
+
+    @property
+    def current_rank(self) -> Optional[RankInfo]:
+        return self.ranks[0] if self.ranks else None
+
+    @property
+    def current_position_id(self) -> Optional[int]:
+        return self.positions[0].position_id if self.positions else None
+
+    @property
+    def completed_requirement_ids(self) -> Set[int]:
+        return {r.requirement_id for r in self.requirements if r.completed}
+
+    def profile_row(self) -> Tuple:
+        """The (cadet_id, cap_id, first_name, last_name, date_of_birth, join_date) row shape used by the forms."""
+        return (self.cadet_id, self.cap_id, self.first_name, self.last_name, self.date_of_birth, self.join_date)
+
+
+def fetch_cadet_detail(cadet_id: int, token=None) -> Optional[CadetDetail]:
+    """Load profile, ranks, positions, next-rank checklist and inspection summaries for a cadet.
+
+    Returns None if the cadet no longer exists. Raises tasks.TaskCancelled if `token` is
+    cancelled part-way through.
+    """
+    check = token.check if token is not None else (lambda: None)
+    check()
+    conn = checkout_connection()
+    try:
+        return _load_detail(conn, cadet_id, check, token)
+    finally:
+        conn.close()
+
+
+def _load_detail(conn, cadet_id, check, token):
+    with cancellable(conn, token):
+        cur = conn.cursor()
+
+        # 1) cadet row joined to every rank held (one row per rank, highest first)
+        cur.execute('''
+            SELECT c.cadet_id, c.cap_id, c.first_name, c.last_name, c.date_of_birth, c.join_date,
+                   r.rank_id, r.rank_name, r.rank_order
+            FROM cadet c
+            LEFT JOIN rank_has_cadet rh ON rh.cadet_cadet_id = c.cadet_id
+            LEFT JOIN `rank` r ON r.rank_id = rh.rank_rank_id
+            WHERE c.cadet_id = %s
+            ORDER BY r.rank_order DESC
+        ''', (cadet_id,))
+        rows = cur.fetchall()
+        if not rows:
+            return None
+        first = rows[0]
+        detail = CadetDetail(cadet_id=first[0], cap_id=first[1], first_name=first[2] or '', last_name=first[3] or '',
+                             date_of_birth=first[4], join_date=first[5])
+        detail.ranks = [RankInfo(r[6], r[7], r[8]) for r in rows if r[6] is not None]
+
+        check()
+        # 2) position assignments
+        cur.execute('''
+            SELECT p.position_id, p.position_name, p.line, ph.start_date
+            FROM position_has_cadet ph
+            JOIN `position` p ON p.position_id = ph.position_position_id
+            WHERE ph.cadet_cadet_id = %s
+            ORDER BY ph.start_date DESC
+        ''', (cadet_id,))
+        detail.positions = [PositionInfo(*r) for r in cur.fetchall()]
+
+        check()
+        # 3) next rank and its requirements with completion flags; with no current rank the
+        #    lowest rank is the promotion target
+        current_order = detail.current_rank.rank_order if detail.current_rank else None
+        cur.execute('''
+            SELECT nr.rank_id, nr.rank_name, nr.rank_order, req.requirement_id, req.requirement_name,
+                   (done.requirement_requirement_id IS NOT NULL) AS completed
+            FROM (
+                SELECT rank_id, rank_name, rank_order FROM `rank`
+                WHERE %s IS NULL OR rank_order > %s
+                ORDER BY rank_order ASC LIMIT 1
+            ) nr
+            LEFT JOIN rank_has_requirement rr ON rr.rank_rank_id = nr.rank_id
+            LEFT JOIN requirement req ON req.requirement_id = rr.rank_requirement_requirement_id
+            LEFT JOIN cadet_has_rank_requirement done
+                   ON done.requirement_requirement_id = req.requirement_id AND done.cadet_cadet_id = %s
+            ORDER BY req.requirement_id
+        ''', (current_order, current_order, cadet_id))
+        for r in cur.fetchall():
+            if detail.next_rank is None:
+                detail.next_rank = RankInfo(r[0], r[1], r[2])
+            if r[3] is not None:
+                detail.requirements.append(RequirementStatus(r[3], r[4], bool(r[5])))
+
+        check()
+        # 4) inspection summaries with their stored totals and ratings, newest first
+        cur.execute(history_sql(cur), (cadet_id,))
+        detail.inspections = [InspectionSummary(*r) for r in cur.fetchall()]
+        return detail
@@ -4,40 +4,229 @@ import datetime
 import logging
 try:
     # Theming helpers (safe no-ops if module not present)
-    from ui_theme import apply_accent, enable_alt_row_colors
+    from ui_theme import apply_accent
 except Exception:
     def apply_accent(_btn):
         return
-    def enable_alt_row_colors(_tv):
-        return
 
-# reuse DB helper from add_cadet if available
-try:
-    from add_cadet import get_connection
-except Exception:
-    # fallback - simple local connector if import fails; inform user when used
-    import mysql.connector
-    from mysql.connector import Error
+# shared pooled DB helpers and the background task runner
+from db import checkout_connection
+from tasks import get_runner, LoadingIndicator, CancelToken
+from cadet_detail import fetch_cadet_detail
+from lookups import RANKS, POSITIONS, ensure_inspection_items, invalidate as invalidate_lookups
+from roster import ROSTER, ensure_loaded as ensure_roster_loaded
+from autofill import get_autofill
+from treefill import fill_tree
+import progress
+from inspection_totals import compute_rating, store_totals, history_sql, totals_available, ITEM_MAX_SCORE, INSPECTION_SECTIONS
 
-    DB_CONFIG = {
-        'host': 'localhost',
-        'user': 'Michael',
-        'password': 'hogbog89',
-        'database': 'cadet_tracker',
-    }
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
+# quiet period after the last <<ListboxSelect>> before the cadet detail is loaded, so holding an
+# arrow key through the list only loads the row the user stops on
+SELECT_DEBOUNCE_MS = 150
 
-    def get_connection():
-        try:
-            return mysql.connector.connect(**DB_CONFIG)
-        except Exception as e:
-            logging.exception('DB connect failed')
-            messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-            return None
 
+# ---------------- data access ------------------
+# These run on worker threads through tasks.TaskRunner: they must not touch widgets, and they
+# raise on failure so the runner can report the error on the UI thread.
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+def fetch_lookups():
+    """Return (ranks, positions) for the profile comboboxes from the lookup cache.
+
+    ranks: (rank_id, rank_name, rank_order) by rank_order; positions: (position_id, position_name, line, level).
+    """
+    return RANKS.rows(), POSITIONS.rows()
+
+
+def fetch_inspection_history(cadet_id):
+    """Return (inspection_id, date, total_score, rating, notes) rows for a cadet, newest first."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # stored totals and ratings (inspection_totals.py); summed from the scores on an old schema
+        cur.execute(history_sql(cur), (cadet_id,))
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def set_requirement_complete(cadet_id, req_id, value):
+    """Insert or delete the cadet_has_rank_requirement row for one requirement."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if value:
+            # insert completion row with today's date
+            cur.execute('INSERT INTO cadet_has_rank_requirement (cadet_cadet_id, requirement_requirement_id, date_completed) VALUES (%s, %s, CURDATE())', (cadet_id, req_id))
+            progress.requirement_toggled(cur, cadet_id, req_id, 1)
+        else:
+            cur.execute('DELETE FROM cadet_has_rank_requirement WHERE cadet_cadet_id = %s AND requirement_requirement_id = %s', (cadet_id, req_id))
+            if cur.rowcount:
+                progress.requirement_toggled(cur, cadet_id, req_id, -1)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def save_cadet_profile(cadet_id, capid, fname, lname, birthday, rank_id, linepos_id, staffpos_id):
+    """Update the cadet row and its rank/position mappings in one transaction."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # update cadet master row
+        cur.execute('UPDATE cadet SET cap_id=%s, first_name=%s, last_name=%s, date_of_birth=%s WHERE cadet_id = %s', (capid or None, fname or None, lname or None, birthday, cadet_id))
+        cur.execute('DELETE FROM rank_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
+        if rank_id:
+            cur.execute('INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s,%s,NOW())', (rank_id, cadet_id))
+        progress.refresh_cadets(cur, [cadet_id])
+        cur.execute('DELETE FROM position_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
+        # Insert both line and support positions if selected
+        if linepos_id:
+            cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s,%s,NOW(), NULL, NULL)', (linepos_id, cadet_id))
+        if staffpos_id:
+            cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s,%s,NOW(), NULL, NULL)', (staffpos_id, cadet_id))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def delete_inspection_record(insp_id):
+    """Delete an inspection and its per-item scores."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # delete scores then inspection header in new schema
+        cur.execute('DELETE FROM uniform_inspection_score WHERE uniform_inspection_inspection_id = %s', (insp_id,))
+        cur.execute('DELETE FROM uniform_inspection WHERE inspection_id = %s', (insp_id,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def fetch_inspection_detail(insp_id):
+    """Return (header, score_map) for the inspection editor.
+
+    header is (inspection_date, notes, total_score); score_map maps item_name -> [(score, comments)]
+    in saved order ('Cleanliness' is on the sheet twice and has a row for each).
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if totals_available(cur):
+            cur.execute('SELECT inspection_date, notes, total_score FROM uniform_inspection WHERE inspection_id = %s', (insp_id,))
+            header = cur.fetchone()
+        else:
+            header = None
+        if header is None or header[2] is None:
+            # old schema, or a row the backfill has not reached
+            cur.execute('''
+                SELECT ui.inspection_date, ui.notes, COALESCE(SUM(u.score),0) AS total_score
+                FROM uniform_inspection ui
+                LEFT JOIN uniform_inspection_score u ON ui.inspection_id = u.uniform_inspection_inspection_id
+                WHERE ui.inspection_id = %s
+                GROUP BY ui.inspection_id
+            ''', (insp_id,))
+            header = cur.fetchone()
+        cur.execute('''
+            SELECT i.item_name, u.score, u.comments
+            FROM uniform_inspection_score u
+            JOIN inspection_item i ON u.inspection_item_item_id = i.item_id
+            WHERE u.uniform_inspection_inspection_id = %s
+            ORDER BY u.score_id
+        ''', (insp_id,))
+        score_map = {}
+        for name, score_val, comment_text in cur.fetchall():
+            score_map.setdefault(name, []).append((score_val, comment_text))
+        return header, score_map
+    finally:
+        conn.close()
+
+
+def sync_inspection_scores(cur, insp_id, scores):
+    """Make the inspection's score rows match scores [(item_name, score, comment)] on cur.
+
+    Item ids come from the cached catalog (missing items are created in one batch). Existing
+    rows are diffed by (item, occurrence), since an item may appear more than once on the sheet
+    ('Cleanliness'); the n-th row of an item in score_id order matches its n-th input. Changed
+    rows are updated, new ones inserted in one multi-row insert, and rows with no matching
+    input deleted. Unchanged rows are left alone. Returns (total, max_score) of the stored
+    scores.
+    """
+    item_ids = ensure_inspection_items(cur, [s[0] for s in scores])
+    wanted = {}
+    seen = {}
+    for name, score_val, comment_text in scores:
+        item_id = item_ids[name]
+        n = seen[item_id] = seen.get(item_id, -1) + 1
+        wanted[(item_id, n)] = (score_val, comment_text or '')
+
+    cur.execute('SELECT score_id, inspection_item_item_id, score, comments FROM uniform_inspection_score '
+                'WHERE uniform_inspection_inspection_id = %s ORDER BY score_id FOR UPDATE', (insp_id,))
+    current = {}
+    deletes = []
+    seen = {}
+    for score_id, item_id, score_val, comment_text in cur.fetchall():
+        n = seen[item_id] = seen.get(item_id, -1) + 1
+        if (item_id, n) in wanted:
+            current[(item_id, n)] = (score_id, score_val, comment_text or '')
+        else:
+            deletes.append(score_id)
+
+    updates, inserts = [], []
+    for (item_id, n), (score_val, comment_text) in wanted.items():
+        row = current.get((item_id, n))
+        if row is None:
+            inserts.append((score_val, comment_text, item_id, insp_id))
+        elif (row[1], row[2]) != (score_val, comment_text):
+            updates.append((score_val, comment_text, row[0]))
+
+    if deletes:
+        cur.execute('DELETE FROM uniform_inspection_score WHERE score_id IN (%s)' % ', '.join(['%s'] * len(deletes)), tuple(deletes))
+    if updates:
+        cur.executemany('UPDATE uniform_inspection_score SET score = %s, comments = %s WHERE score_id = %s', updates)
+    if inserts:
+        cur.executemany('INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s,%s,%s,%s)', inserts)
+    logging.debug('Inspection %s scores: %d inserted, %d updated, %d deleted', insp_id, len(inserts), len(updates), len(deletes))
+    return sum(int(s[1] or 0) for s in scores), len(scores) * ITEM_MAX_SCORE
+
+
+def save_inspection_detail(cadet_id, insp_id, capid, fname, lname, inspection_date, notes, scores):
+    """Save the full inspection editor: cadet name/CAP ID, header and per-item scores.
+
+    scores is a list of (item_name, score, comment).
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # update cadet table if capid or name changed
+        if capid or fname or lname:
+            cur.execute('UPDATE cadet SET cap_id=%s, first_name=%s, last_name=%s WHERE cadet_id = %s', (capid or None, fname or None, lname or None, cadet_id))
+
+        # update uniform_inspection header
+        cur.execute('UPDATE uniform_inspection SET inspection_date=%s, notes=%s WHERE inspection_id = %s', (inspection_date, notes, insp_id))
+
+        # bring the per-item scores in line with the inputs, touching only rows that differ
+        total, max_score = sync_inspection_scores(cur, insp_id, scores)
+        store_totals(cur, insp_id, total, max_score)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        # items remembered by ensure_inspection_items() may have been rolled back
+        invalidate_lookups('inspection_item')
+        raise
+    finally:
+        conn.close()
 
 
 class Dashboard(ttk.Frame):
@@ -56,9 +245,22 @@ class Dashboard(ttk.Frame):
         self.selected_cadet = None
         self._cadets = []
         self.requirements_state = {}
+        # guards the profile CAP ID trace while the form is filled programmatically
+        self._suppress_traces = False
+        self._runner = get_runner(self)
+        # pending debounced selection load and the token of the detail load in flight
+        self._select_after = None
+        self._detail_token = None
         self._build_ui()
+        # re-filter the cadet list whenever a form adds or edits a cadet
+        ROSTER.subscribe(self._filter_cadets)
+        self.bind('<Destroy>', self._on_destroy, add='+')
         self.load_cadets()
 
+    def _on_destroy(self, event):
+        if event.widget is self:
+            ROSTER.unsubscribe(self._filter_cadets)
+
     def _build_ui(self):
         # layout a 2x2 grid
         self.columnconfigure(0, weight=1)
@@ -78,7 +280,11 @@ class Dashboard(ttk.Frame):
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.grid(row=0, column=1, sticky='ew', padx=(6,0))
-        search_entry.bind('<Return>', lambda e: self.load_cadets())
+        search_entry.bind('<Return>', lambda e: self._filter_cadets())
+        # search as you type against the in-memory roster index
+        self.search_var.trace_add('write', lambda *_: self._filter_cadets())
+        self._cadets_busy = LoadingIndicator(search_frame)
+        self._cadets_busy.grid(row=0, column=2, sticky='e', padx=(6,0))
 
         self.cadet_list = tk.Listbox(left_top)
         self.cadet_list.grid(row=1, column=0, sticky='nsew', padx=6, pady=6)
@@ -105,6 +311,8 @@ class Dashboard(ttk.Frame):
         btn_edit.grid(row=0, column=1, padx=4)
         btn_delete = ttk.Button(it_btn_frame, text='Delete', command=self.delete_inspection)
         btn_delete.grid(row=0, column=2, padx=4)
+        self._insp_busy = LoadingIndicator(it_btn_frame)
+        self._insp_busy.grid(row=0, column=4, padx=4)
         # Accent the primary action (Edit)
         try:
             apply_accent(btn_edit)
@@ -135,6 +343,8 @@ class Dashboard(ttk.Frame):
         self.req_canvas.grid(row=0, column=0, sticky='nsew')
         self.req_canvas.create_window((0,0), window=self.req_frame, anchor='nw')
         self.req_frame.bind('<Configure>', lambda e: self.req_canvas.configure(scrollregion=self.req_canvas.bbox('all')))
+        self._req_busy = LoadingIndicator(left_bottom)
+        self._req_busy.grid(row=1, column=0, sticky='w')
 
         # Bottom-right: profile
         right_bottom = ttk.Labelframe(self, text='Profile')
@@ -204,105 +414,71 @@ class Dashboard(ttk.Frame):
             apply_accent(btn_save_profile)
         except Exception:
             pass
-        ttk.Button(profile_btns, text='Refresh', command=self.load_profile).grid(row=0, column=1, padx=6)
+        ttk.Button(profile_btns, text='Refresh', command=self.load_detail).grid(row=0, column=1, padx=6)
+        self._profile_busy = LoadingIndicator(profile_btns)
+        self._profile_busy.grid(row=0, column=2, padx=6)
 
         # load lookup lists for comboboxes
         self._load_lookups()
 
     # ---------------- DB interactions and UI callbacks ------------------
-    def load_cadets(self):
-        """Load cadets into the left list, optionally filtered by search."""
-        self.cadet_list.delete(0, 'end')
-        term = self.search_var.get().strip()
-        conn = get_connection()
-        if not conn:
+    def load_cadets(self, reload=False):
+        """Load the roster index (once, or again when reload is set) and show the filtered list."""
+        if ROSTER.loaded and not reload:
+            self._filter_cadets()
             return
-        try:
-            cur = conn.cursor()
-            if term:
-                like = '%' + term + '%'
-                cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE CONCAT(first_name, " ", last_name) LIKE %s OR cap_id LIKE %s ORDER BY last_name, first_name', (like, like))
-            else:
-                cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet ORDER BY last_name, first_name')
-            rows = cur.fetchall()
-            self._cadets = rows
-            for r in rows:
-                display = f"{r[2]} {r[3]} ({r[1]})"
-                self.cadet_list.insert('end', display)
-        except Exception:
-            logging.exception('Error loading cadets')
-            messagebox.showerror('DB Error', 'Could not load cadets (see terminal).')
-        finally:
-            conn.close()
+        fn = ROSTER.load if reload else ensure_roster_loaded
+        self._runner.submit(fn, on_done=lambda _: self._filter_cadets(),
+                            indicator=self._cadets_busy, error_message='Could not load cadets (see terminal).')
+
+    def _filter_cadets(self):
+        # in-memory lookup (prefix/token match, trigram fallback); cheap enough for every keystroke
+        if not ROSTER.loaded:
+            return
+        self._render_cadets(ROSTER.search(self.search_var.get()))
+
+    def _render_cadets(self, rows):
+        self.cadet_list.delete(0, 'end')
+        self._cadets = rows
+        if rows:
+            # one insert call for the whole list; per-row inserts are slow with a large roster
+            self.cadet_list.insert('end', *[f"{r[2]} {r[3]} ({r[1]})" for r in rows])
+        # keep the current cadet highlighted (selection_set doesn't fire <<ListboxSelect>>)
+        if self.selected_cadet:
+            for idx, r in enumerate(rows):
+                if r[0] == self.selected_cadet[0]:
+                    self.cadet_list.selection_set(idx)
+                    self.cadet_list.see(idx)
+                    break
 
     def _load_lookups(self):
-        """Load lookup lists for ranks, flights, line positions and staff positions into comboboxes.
+        """Load lookup lists for ranks, line positions and staff positions into comboboxes.
 
-        This version uses smaller helper fetchers and stores id->name maps and id lists so
-        selections can be resolved reliably by id instead of parsing label text.
+        Stores id->name maps and id lists so selections can be resolved reliably by id instead
+        of parsing label text.
         """
-        try:
-            # ranks
-            try:
-                cur_conn = get_connection()
-                if not cur_conn:
-                    return
-                cur = cur_conn.cursor()
-                cur.execute('SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC')
-                ranks = cur.fetchall()
-            except Exception:
-                logging.exception('Error fetching ranks')
-                ranks = []
-            finally:
-                try:
-                    cur_conn.close()
-                except Exception:
-                    pass
+        self._runner.submit(fetch_lookups, on_done=self._render_lookups, indicator=self._profile_busy,
+                            on_error=lambda e: logging.error('Could not load lookups: %s', e))
 
+    def _render_lookups(self, result):
+        ranks, positions = result
+        try:
             self._rank_map = {r[0]: r[1] for r in ranks}
             self._rank_ids = [r[0] for r in ranks]
             self.rank_cb['values'] = [r[1] or f'Rank {r[0]}' for r in ranks]
 
-            # positions (use the position table, split by 'line' flag like add_cadet.py)
-            try:
-                pos_conn = get_connection()
-                positions = []
-                if pos_conn:
-                    try:
-                        cur = pos_conn.cursor()
-                        # try to include the 'line' column if present to allow categorization
-                        try:
-                            cur.execute('SELECT position_id, position_name, line, level FROM `position` ORDER BY position_id')
-                            positions = cur.fetchall()
-                        except Exception:
-                            # fallback to older schema without 'line' flag
-                            cur.execute('SELECT position_id, position_name, level FROM `position` ORDER BY position_id')
-                            rows = cur.fetchall()
-                            # normalize to (id, name, None)
-                            positions = [(r[0], r[1], None) for r in rows]
-                    finally:
-                        try:
-                            pos_conn.close()
-                        except Exception:
-                            pass
-                else:
-                    positions = []
-            except Exception:
-                logging.exception('Error fetching positions')
-                positions = []
-
             # Split positions into line (line=1) and support (line!=1) like add_cadet.py
             line_positions = [p for p in positions if (p[2] if len(p) > 2 else None) == 1]
             support_positions = [p for p in positions if (p[2] if len(p) > 2 else None) != 1]
-            
+
             # Store all positions for mapping
             self._position_map = {r[0]: r[1] for r in positions}
             self._position_ids = [r[0] for r in positions]
-            
+
             # Line positions
             self._linepos_ids = [r[0] for r in line_positions]
             self.linepos_cb['values'] = [r[1] or f'Position {r[0]}' for r in line_positions]
-            
+
             # Support positions
             self._staffpos_ids = [r[0] for r in support_positions]
             self.staffpos_cb['values'] = [r[1] or f'Position {r[0]}' for r in support_positions]
@@ -334,9 +510,20 @@ class Dashboard(ttk.Frame):
         row = self._cadets[idx]
         # idcadet, capid, fname, lname
         self.selected_cadet = (row[0], row[1], row[2], row[3])
-        self.load_inspections()
-        self.load_profile()
-        self.load_requirements()
+        # drop whatever the previous selection is still loading and wait for the keys to settle
+        self._cancel_detail_load()
+        if self._select_after is not None:
+            self.after_cancel(self._select_after)
+        self._select_after = self.after(SELECT_DEBOUNCE_MS, self._on_select_settled)
+
+    def _on_select_settled(self):
+        self._select_after = None
+        self.load_detail()
+
+    def _cancel_detail_load(self):
+        if self._detail_token is not None:
+            self._detail_token.cancel()
+            self._detail_token = None
 
     # ---------------- lookup helper methods ----------------
     def fetch_flights(self):
@@ -351,58 +538,6 @@ class Dashboard(ttk.Frame):
         # support_position table not present; return empty
         return []
 
-    def fetch_ranks(self):
-        conn = get_connection()
-        if not conn:
-            return []
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC')
-            return cur.fetchall()
-        except Exception:
-            logging.exception('Error fetching ranks')
-            return []
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
-
-    def fetch_cadet_ranks(self, cadet_id: int):
-        conn = get_connection()
-        if not conn:
-            return []
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT rank_rank_id FROM rank_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
-            rows = cur.fetchall()
-            return [r[0] for r in rows]
-        except Exception:
-            logging.exception('Error fetching cadet ranks')
-            return []
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
-
-    def fetch_cadet_by_capid(self, capid: int):
-        conn = get_connection()
-        if not conn:
-            return None
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT cadet_id, cap_id, first_name, last_name, date_of_birth, join_date FROM cadet WHERE cap_id = %s', (capid,))
-            return cur.fetchone()
-        except Exception:
-            logging.exception('Error fetching cadet by capid')
-            return None
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
-
     # ---------------- email generation and CAPID auto-fill ----------------
     def _clean_name(self, s: str) -> str:
         s = (s or "").strip().lower()
@@ -430,6 +565,8 @@ class Dashboard(ttk.Frame):
 
     def _on_profile_capid_change(self, *_):
         # attempt to auto-fill when user types a numeric CAP ID
+        if self._suppress_traces:
+            return
         val = self.profile_capid.get().strip()
         if not val or not val.isdigit():
             return
@@ -437,47 +574,37 @@ class Dashboard(ttk.Frame):
             capid = int(val)
         except Exception:
             return
-        row = self.fetch_cadet_by_capid(capid)
-        if row:
-            # load into the profile editor
-            try:
-                self.selected_cadet = (row[0], row[1], row[2], row[3])
-            except Exception:
-                pass
-            self.load_profile()
+        get_autofill(self).lookup_capid((id(self), 'profile_capid'), val,
+                                        lambda row: self._on_profile_capid_found(capid, row),
+                                        indicator=self._profile_busy)
+
+    def _on_profile_capid_found(self, capid, row):
+        # ignore answers for a CAP ID the user has already typed past
+        if not row or self.profile_capid.get().strip() != str(capid):
+            return
+        # load into the profile editor
+        try:
+            self.selected_cadet = (row[0], row[1], row[2], row[3])
+        except Exception:
+            pass
+        self.load_detail()
 
     def load_inspections(self):
-        for i in self.inspection_tv.get_children():
-            self.inspection_tv.delete(i)
+        # the rows stay up until the new ones arrive; fill_tree then only applies the changes
         if not self.selected_cadet:
+            fill_tree(self.inspection_tv, [])
             return
         cadet_id = self.selected_cadet[0]
-        conn = get_connection()
-        if not conn:
+        self._runner.submit(fetch_inspection_history, cadet_id,
+                            on_done=lambda rows: self._render_inspections(cadet_id, rows),
+                            indicator=self._insp_busy, error_message='Could not load inspections (see terminal).')
+
+    def _render_inspections(self, cadet_id, rows):
+        # a newer selection may have been made while this load was running
+        if not self.selected_cadet or self.selected_cadet[0] != cadet_id:
             return
-        try:
-            cur = conn.cursor()
-            # Use uniform_inspection and aggregate scores from uniform_inspection_score
-            cur.execute('''
-                SELECT ui.inspection_id, ui.inspection_date, COALESCE(SUM(u.score),0) AS total_score, '' AS rating, ui.notes
-                FROM uniform_inspection ui
-                LEFT JOIN uniform_inspection_score u ON ui.inspection_id = u.uniform_inspection_inspection_id
-                WHERE ui.cadet_cadet_id = %s
-                GROUP BY ui.inspection_id
-                ORDER BY ui.inspection_date DESC
-            ''', (cadet_id,))
-            rows = cur.fetchall()
-            for r in rows:
-                self.inspection_tv.insert('', 'end', values=(r[0], r[1], r[2], r[3], (r[4] or '')[:80]))
-            try:
-                enable_alt_row_colors(self.inspection_tv)
-            except Exception:
-                pass
-        except Exception:
-            logging.exception('Error loading inspections')
-            messagebox.showerror('DB Error', 'Could not load inspections (see terminal).')
-        finally:
-            conn.close()
+        fill_tree(self.inspection_tv, rows, key=lambda r: r[0],
+                  values=lambda r: (r[0], r[1], r[2], r[3], (r[4] or '')[:80]))
 
     def edit_inspection(self):
         sel = self.inspection_tv.selection()
@@ -486,27 +613,12 @@ class Dashboard(ttk.Frame):
         item = sel[0]
         vals = self.inspection_tv.item(item, 'values')
         insp_id = vals[0]
-        # fetch full inspection row including linked inspection_score id
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            # Fetch inspection header and aggregate score from new schema
-            cur.execute('''
-                SELECT ui.inspection_date, ui.notes, COALESCE(SUM(u.score),0) AS total_score
-                FROM uniform_inspection ui
-                LEFT JOIN uniform_inspection_score u ON ui.inspection_id = u.uniform_inspection_inspection_id
-                WHERE ui.inspection_id = %s
-                GROUP BY ui.inspection_id
-            ''', (insp_id,))
-            row = cur.fetchone()
-        except Exception:
-            logging.exception('Error fetching inspection')
-            messagebox.showerror('DB Error', 'Could not fetch inspection (see terminal).')
-            conn.close()
-            return
+        # fetch the inspection header and per-item scores, then open the editor
+        self._runner.submit(fetch_inspection_detail, insp_id,
+                            on_done=lambda res: self._open_inspection_editor(insp_id, res[0], res[1]),
+                            indicator=self._insp_busy, error_message='Could not fetch inspection (see terminal).')
 
+    def _open_inspection_editor(self, insp_id, row, score_map):
         # Build a full inspection-sheet editor (per-item controls) and allow editing personal info
         top = tk.Toplevel(self.master)
         top.title(f'Edit Inspection {insp_id}')
@@ -560,12 +672,12 @@ class Dashboard(ttk.Frame):
                         btn.config(bg='SystemButtonFace', relief='raised')
 
         # sections/items
-        personal_items = ['Haircut', 'Cleanliness', 'Shave/Cosmetics']
-        garments_items = ['Cleanliness', 'Press/Ironing', 'No loose strings/frays', 'Shirt tucked properly',
-                          'Proper sizing/fit', 'No unauthorized bracelets', 'Sleeves rolled properly (cuff visible)', 'Undershirt correct (color/cut)']
-        accouterments_items = ['Patches', 'Insignia', 'Ribbons/order', 'Gig line']
-        footwear_items = ['Boot blousing', 'Shine / Cleanliness']
-        military_items = ['Posture', 'Hands at seam', 'Focus / Bearing']
+        sections = dict(INSPECTION_SECTIONS)
+        personal_items = sections['Personal Appearance']
+        garments_items = sections['Garments']
+        accouterments_items = sections['Accouterments']
+        footwear_items = sections['Footwear']
+        military_items = sections['Military Bearing']
 
         inputs = []
         r = 2
@@ -589,36 +701,9 @@ class Dashboard(ttk.Frame):
         add_section('Footwear', footwear_items)
         add_section('Military Bearing', military_items)
 
-        # Attempt to load per-item scores/comments for this inspection and populate controls
-        try:
-            cur.execute('''
-                SELECT i.item_name, u.score, u.comments
-                FROM uniform_inspection_score u
-                JOIN inspection_item i ON u.inspection_item_item_id = i.item_id
-                WHERE u.uniform_inspection_inspection_id = %s
-            ''', (insp_id,))
-            score_rows = cur.fetchall()
-            score_map = {r[0]: (r[1], r[2]) for r in score_rows}
-            for label_text, control, comment in inputs:
-                if label_text in score_map:
-                    try:
-                        control.set(int(score_map[label_text][0]) if score_map[label_text][0] is not None else 0)
-                    except Exception:
-                        logging.exception('Error setting control value for %s', label_text)
-                    try:
-                        comment.delete(0, 'end')
-                        if score_map[label_text][1]:
-                            comment.insert(0, score_map[label_text][1])
-                    except Exception:
-                        logging.exception('Error setting comment for %s', label_text)
-            # recalc total/rating after populating per-item values
-            calculate_total_local()
-        except Exception:
-            logging.exception('Could not load per-item scores for inspection %s', insp_id)
-
         total_var = tk.StringVar(value=str(row[2] if row and row[2] is not None else 0))
         rating_var = tk.StringVar(value='')
-        comments_var = tk.StringVar(value=str(row[1] or ''))
+        comments_var = tk.StringVar(value=str(row[1] or '') if row else '')
 
         ttk.Label(top, text='Total Score:').grid(row=r, column=0, sticky='e')
         ttk.Entry(top, textvariable=total_var, width=10, state='readonly').grid(row=r, column=1, sticky='w')
@@ -636,20 +721,41 @@ class Dashboard(ttk.Frame):
                 for label_text, control, comment in inputs:
                     tot += int(control.get())
                 total_var.set(str(tot))
-                # compute rating mapping
-                if tot >= 45:
-                    rating = 'Excellent'
-                elif tot >= 30:
-                    rating = 'Meets Standard'
-                elif tot >= 16:
-                    rating = 'Needs Improvement'
-                else:
-                    rating = 'Unacceptable'
-                rating_var.set(rating)
+                rating_var.set(compute_rating(tot))
             except Exception:
                 logging.exception('Error calculating local total')
                 messagebox.showerror('Error', 'Could not calculate total')
 
+        # Populate per-item scores/comments for this inspection
+        matched = False
+        # an item on the sheet twice takes its saved rows in order
+        used = {}
+        for label_text, control, comment in inputs:
+            n = used[label_text] = used.get(label_text, -1) + 1
+            saved_rows = score_map.get(label_text, ())
+            if n < len(saved_rows):
+                matched = True
+                score_val, comment_text = saved_rows[n]
+                try:
+                    control.set(int(score_val) if score_val is not None else 0)
+                except Exception:
+                    logging.exception('Error setting control value for %s', label_text)
+                try:
+                    comment.delete(0, 'end')
+                    if comment_text:
+                        comment.insert(0, comment_text)
+                except Exception:
+                    logging.exception('Error setting comment for %s', label_text)
+        if matched:
+            # recalc total/rating after populating per-item values
+            calculate_total_local()
+        else:
+            # aggregate-only inspection (saved from the Inspections tab): keep the stored total
+            try:
+                rating_var.set(compute_rating(int(total_var.get())))
+            except Exception:
+                pass
+
         def do_save_full():
             # update cadet info if changed
             new_capid = capid_var.get().strip()
@@ -661,53 +767,25 @@ class Dashboard(ttk.Frame):
                 new_fname = parts[0]
                 new_lname = parts[-1] if len(parts) > 1 else ''
             try:
-                tot = int(total_var.get())
+                int(total_var.get())
             except Exception:
                 messagebox.showerror('Validation', 'Total score invalid')
                 return
-            new_rating = rating_var.get().strip()
             new_comments = comments_var.get().strip()
             new_date = date_var.get().strip() or None
-            new_inspector = inspector_var.get().strip() or None
-
-            try:
-                # update cadet table if capid or name changed
-                cur2 = conn.cursor()
-                if new_capid or new_fname or new_lname:
-                    cur2.execute('UPDATE cadet SET cap_id=%s, first_name=%s, last_name=%s WHERE cadet_id = %s', (new_capid or None, new_fname or None, new_lname or None, self.selected_cadet[0]))
-
-                # update uniform_inspection header
-                cur2.execute('UPDATE uniform_inspection SET inspection_date=%s, notes=%s WHERE inspection_id = %s', (new_date, new_comments, insp_id))
+            scores = [(label_text, int(control.get()) if control else 0, comment.get().strip() if comment else '')
+                      for label_text, control, comment in inputs]
 
-                # replace existing per-item scores for this inspection with the values from the inputs
-                try:
-                    # delete old scores
-                    cur2.execute('DELETE FROM uniform_inspection_score WHERE uniform_inspection_inspection_id = %s', (insp_id,))
-                    # for each input label, ensure an inspection_item exists and insert score row
-                    for label_text, control, comment in inputs:
-                        score_val = int(control.get()) if control else 0
-                        comment_text = comment.get().strip() if comment else ''
-                        # find or create inspection_item by name
-                        cur2.execute('SELECT item_id FROM inspection_item WHERE item_name = %s LIMIT 1', (label_text,))
-                        item_row = cur2.fetchone()
-                        if item_row and item_row[0]:
-                            item_id = item_row[0]
-                        else:
-                            cur2.execute('INSERT INTO inspection_item (item_name, description) VALUES (%s, %s)', (label_text, label_text))
-                            item_id = cur2.lastrowid
-                        cur2.execute('INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s,%s,%s,%s)', (score_val, comment_text, item_id, insp_id))
-                except Exception:
-                    logging.exception('Error saving per-item scores')
-
-                conn.commit()
+            def saved(_):
                 messagebox.showinfo('Saved', 'Inspection and profile updated')
                 top.destroy()
-                self.load_inspections()
-                self.load_profile()
-            except Exception:
-                conn.rollback()
-                logging.exception('Error saving full inspection')
-                messagebox.showerror('DB Error', 'Failed to save inspection (see terminal).')
+                self.load_detail()
+
+            btn_save.state(['disabled'])
+            self._runner.submit(save_inspection_detail, self.selected_cadet[0], insp_id, new_capid, new_fname, new_lname,
+                                new_date, new_comments, scores, on_done=saved,
+                                on_error=lambda e: (btn_save.state(['!disabled']),
+                                                    messagebox.showerror('DB Error', 'Failed to save inspection (see terminal).')))
 
         btnf = ttk.Frame(top)
         btnf.grid(row=r, column=0, columnspan=4, pady=(8,0))
@@ -728,23 +806,6 @@ class Dashboard(ttk.Frame):
         except Exception:
             pass
 
-        # initial total/rating from fetched row
-        try:
-            total_var.set(str(row[2] if row and row[2] is not None else 0))
-            rating_var.set(str(row[3] or ''))
-            comments_var.set(str(row[4] or ''))
-        except Exception:
-            pass
-
-        def on_close():
-            try:
-                conn.close()
-            except Exception:
-                pass
-            top.destroy()
-
-        top.protocol('WM_DELETE_WINDOW', on_close)
-
     def delete_inspection(self):
         sel = self.inspection_tv.selection()
         if not sel or not self.selected_cadet:
@@ -753,57 +814,52 @@ class Dashboard(ttk.Frame):
         insp_id = vals[0]
         if not messagebox.askyesno('Confirm', f'Delete inspection {insp_id}?'):
             return
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            # delete scores then inspection header in new schema
-            cur.execute('DELETE FROM uniform_inspection_score WHERE uniform_inspection_inspection_id = %s', (insp_id,))
-            cur.execute('DELETE FROM uniform_inspection WHERE inspection_id = %s', (insp_id,))
-            conn.commit()
+
+        def deleted(_):
             self.load_inspections()
             messagebox.showinfo('Deleted', 'Inspection deleted')
-        except Exception:
-            conn.rollback()
-            logging.exception('Error deleting inspection')
-            messagebox.showerror('DB Error', 'Could not delete inspection (see terminal).')
-        finally:
-            conn.close()
 
-    def load_profile(self):
-        """Load profile for selected cadet and populate UI fields.
+        self._runner.submit(delete_inspection_record, insp_id, on_done=deleted, indicator=self._insp_busy,
+                            error_message='Could not delete inspection (see terminal).')
 
-        Uses robust lookups to select combobox values by id rather than parsing text.
+    def load_detail(self):
+        """Load the inspection list, profile and requirement checklist for the selected cadet.
+
+        Everything comes from one cadet_detail.fetch_cadet_detail() round trip; the three
+        panes render from the returned CadetDetail.
         """
+        for child in self.req_frame.winfo_children():
+            child.destroy()
         if not self.selected_cadet:
+            fill_tree(self.inspection_tv, [])
             return
         cadet_id = self.selected_cadet[0]
-
-        # fetch cadet row
-        row = self.fetch_cadet_by_capid(self.selected_cadet[1]) if self.selected_cadet and self.selected_cadet[1] else None
-        # If fetch by capid didn't work (maybe capid changed), fetch by id directly
-        if not row:
-            conn = get_connection()
-            if not conn:
-                return
-            try:
-                cur = conn.cursor()
-                cur.execute('SELECT cadet_id, cap_id, first_name, last_name, date_of_birth, join_date FROM cadet WHERE cadet_id = %s', (cadet_id,))
-                row = cur.fetchone()
-            except Exception:
-                logging.exception('Error loading profile by id')
-                messagebox.showerror('DB Error', 'Could not load profile (see terminal).')
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-
-        if not row:
+        # only the latest load may render; an older one still running is cancelled (and its
+        # query killed on the server)
+        self._cancel_detail_load()
+        token = self._detail_token = CancelToken()
+        self._runner.submit(fetch_cadet_detail, cadet_id, token, token=token,
+                            on_done=lambda detail: self._render_detail(cadet_id, detail),
+                            indicator=(self._insp_busy, self._profile_busy, self._req_busy),
+                            error_message='Could not load cadet details (see terminal).')
+
+    def _render_detail(self, cadet_id, detail):
+        # a newer selection may have been made while this load was running
+        if detail is None or not self.selected_cadet or self.selected_cadet[0] != cadet_id:
+            return
+        self._render_inspections(cadet_id, [i.as_row() for i in detail.inspections])
+        self._render_profile(cadet_id, detail.profile_row(), [r.rank_id for r in detail.ranks], detail.current_position_id)
+        next_rank = detail.next_rank
+        self._render_requirements(cadet_id, next_rank.rank_id if next_rank else None, next_rank.rank_name if next_rank else None,
+                                  [(r.requirement_id, r.requirement_name) for r in detail.requirements],
+                                  detail.completed_requirement_ids)
+
+    def _render_profile(self, cadet_id, row, rank_ids, pos_id):
+        if not row or not self.selected_cadet or self.selected_cadet[0] != cadet_id:
             return
 
-        # populate fields
+        # populate fields; suppress the CAP ID trace so filling the form doesn't trigger another lookup
+        self._suppress_traces = True
         try:
             self.profile_capid.set(str(row[1] or ''))
             self.profile_fname.set(row[2] or '')
@@ -822,9 +878,8 @@ class Dashboard(ttk.Frame):
 
             # select rank mapping (first rank if multiple)
             try:
-                cadet_ranks = self.fetch_cadet_ranks(row[0])
-                if cadet_ranks:
-                    rank_id = cadet_ranks[0]
+                if rank_ids:
+                    rank_id = rank_ids[0]
                     if hasattr(self, '_rank_ids') and rank_id in self._rank_ids:
                         pos = self._rank_ids.index(rank_id)
                         try:
@@ -834,38 +889,28 @@ class Dashboard(ttk.Frame):
             except Exception:
                 logging.exception('Error selecting rank')
 
-            # select position mapping (first position if multiple)
+            # select position mapping (most recent position)
             try:
-                conn2 = get_connection()
-                if conn2:
-                    cur2 = conn2.cursor()
-                    cur2.execute('SELECT position_position_id FROM position_has_cadet WHERE cadet_cadet_id = %s ORDER BY start_date DESC LIMIT 1', (row[0],))
-                    r = cur2.fetchone()
-                    if r and r[0] is not None:
-                        pos_id = r[0]
-                        # Check if it's a line position (line=1) or support position
-                        # Try to set the appropriate combobox based on which list contains this position
-                        if hasattr(self, '_linepos_ids') and pos_id in self._linepos_ids:
-                            pos = self._linepos_ids.index(pos_id)
-                            try:
-                                self.linepos_cb.current(pos)
-                            except Exception:
-                                pass
-                        elif hasattr(self, '_staffpos_ids') and pos_id in self._staffpos_ids:
-                            pos = self._staffpos_ids.index(pos_id)
-                            try:
-                                self.staffpos_cb.current(pos)
-                            except Exception:
-                                pass
+                if pos_id is not None:
+                    # Set the appropriate combobox based on which list contains this position
+                    if hasattr(self, '_linepos_ids') and pos_id in self._linepos_ids:
+                        pos = self._linepos_ids.index(pos_id)
+                        try:
+                            self.linepos_cb.current(pos)
+                        except Exception:
+                            pass
+                    elif hasattr(self, '_staffpos_ids') and pos_id in self._staffpos_ids:
+                        pos = self._staffpos_ids.index(pos_id)
+                        try:
+                            self.staffpos_cb.current(pos)
+                        except Exception:
+                            pass
             except Exception:
                 logging.exception('Error selecting position')
-            finally:
-                try:
-                    conn2.close()
-                except Exception:
-                    pass
         except Exception:
             logging.exception('Error populating profile fields')
+        finally:
+            self._suppress_traces = False
 
     def save_profile(self):
         if not self.selected_cadet:
@@ -917,114 +962,32 @@ class Dashboard(ttk.Frame):
                 messagebox.showerror('Validation', 'Birthday must be YYYY-MM-DD')
                 return
 
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            # update cadet master row
-            cur.execute('UPDATE cadet SET cap_id=%s, first_name=%s, last_name=%s, date_of_birth=%s WHERE cadet_id = %s', (capid or None, fname or None, lname or None, birthday, cadet_id))
-            # update mappings inside transaction
+        def saved(_):
             try:
-                cur.execute('DELETE FROM rank_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
-                if sel_rank:
-                    cur.execute('INSERT INTO rank_has_cadet (rank_rank_id, cadet_cadet_id, date_received) VALUES (%s,%s,NOW())', (sel_rank, cadet_id))
-
-                cur.execute('DELETE FROM position_has_cadet WHERE cadet_cadet_id = %s', (cadet_id,))
-                # Insert both line and support positions if selected
-                if sel_linepos:
-                    cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s,%s,NOW(), NULL, NULL)', (sel_linepos, cadet_id))
-                if sel_staffpos:
-                    cur.execute('INSERT INTO position_has_cadet (position_position_id, cadet_cadet_id, start_date, end_date, notes) VALUES (%s,%s,NOW(), NULL, NULL)', (sel_staffpos, cadet_id))
-            except Exception:
-                logging.exception('Error updating mappings, rolling back inner changes')
-                conn.rollback()
-                messagebox.showerror('DB Error', 'Failed to update related mappings (see terminal).')
-                return
-
-            conn.commit()
+                capid_val = int(capid)
+            except ValueError:
+                capid_val = capid
+            self.selected_cadet = (cadet_id, capid_val, fname, lname)
+            # update the roster index in place; its listener re-filters the list
+            ROSTER.upsert(self.selected_cadet)
             messagebox.showinfo('Saved', 'Profile updated')
-            self.load_cadets()
-            self.load_profile()
-        except Exception:
-            conn.rollback()
-            logging.exception('Error saving profile')
-            messagebox.showerror('DB Error', 'Could not save profile (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            self.load_detail()
 
+        self._runner.submit(save_cadet_profile, cadet_id, capid, fname, lname, birthday, sel_rank, sel_linepos, sel_staffpos,
+                            on_done=saved, indicator=self._profile_busy,
+                            error_message='Could not save profile (see terminal).')
 
-    def load_requirements(self):
-        # Clear previous UI
+    def _render_requirements(self, cadet_id, next_rank_id, next_rank_name, tasks, completed):
+        if not self.selected_cadet or self.selected_cadet[0] != cadet_id:
+            return
         for child in self.req_frame.winfo_children():
             child.destroy()
-        if not self.selected_cadet:
-            return
-        cadet_id = self.selected_cadet[0]
-
-        # Determine next rank for this cadet using rank_order
-        next_rank_id = None
-        next_rank_name = None
-        conn = get_connection()
-        if conn:
-            try:
-                cur = conn.cursor()
-                # find the cadet's highest current rank_order (if any)
-                cur.execute('''
-                    SELECT r.rank_order
-                    FROM rank_has_cadet rh
-                    JOIN `rank` r ON rh.rank_rank_id = r.rank_id
-                    WHERE rh.cadet_cadet_id = %s
-                    ORDER BY r.rank_order DESC LIMIT 1
-                ''', (cadet_id,))
-                rowr = cur.fetchone()
-                if rowr and rowr[0] is not None:
-                    current_order = int(rowr[0])
-                    cur.execute('SELECT rank_id, rank_name FROM `rank` WHERE rank_order > %s ORDER BY rank_order ASC LIMIT 1', (current_order,))
-                    nr = cur.fetchone()
-                    if nr:
-                        next_rank_id = int(nr[0])
-                        next_rank_name = nr[1]
-                else:
-                    # no current rank, offer the lowest rank as next target
-                    cur.execute('SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC LIMIT 1')
-                    nr = cur.fetchone()
-                    if nr:
-                        next_rank_id = int(nr[0])
-                        next_rank_name = nr[1]
-            except Exception:
-                logging.exception('Error determining next rank')
-            finally:
-                conn.close()
+        self.requirements_state = {}
 
         if not next_rank_id:
             ttk.Label(self.req_frame, text='No promotion target found for this cadet.').grid(row=0, column=0, sticky='w', pady=4)
             return
 
-        # Fetch requirements linked to next rank
-        tasks = []  # list of (requirement_id, requirement_name)
-        conn2 = get_connection()
-        if conn2:
-            try:
-                cur2 = conn2.cursor()
-                cur2.execute('''
-                    SELECT req.requirement_id, req.requirement_name
-                    FROM rank_has_requirement rr
-                    JOIN requirement req ON rr.rank_requirement_requirement_id = req.requirement_id
-                    WHERE rr.rank_rank_id = %s
-                    ORDER BY req.requirement_id
-                ''', (next_rank_id,))
-                rows = cur2.fetchall()
-                for r in rows:
-                    tasks.append((r[0], r[1]))
-            except Exception:
-                logging.exception('Could not read requirements for next rank')
-            finally:
-                conn2.close()
-
         if not tasks:
             label = f'No requirements defined for next promotion (rank id {next_rank_id}'
             if next_rank_name:
@@ -1033,21 +996,6 @@ class Dashboard(ttk.Frame):
             ttk.Label(self.req_frame, text=label).grid(row=0, column=0, sticky='w', pady=4)
             return
 
-        # load completed requirements for this cadet
-        completed = set()
-        conn3 = get_connection()
-        if conn3:
-            try:
-                cur3 = conn3.cursor()
-                cur3.execute('SELECT requirement_requirement_id, date_completed FROM cadet_has_rank_requirement WHERE cadet_cadet_id = %s', (cadet_id,))
-                rows = cur3.fetchall()
-                for req_id, date_completed in rows:
-                    completed.add(req_id)
-            except Exception:
-                logging.exception('Could not read cadet_has_rank_requirement')
-            finally:
-                conn3.close()
-
         for idx, (req_id, text) in enumerate(tasks):
             var = tk.BooleanVar(value=(req_id in completed))
             cb = ttk.Checkbutton(self.req_frame, text=text, variable=var, command=lambda r=req_id, v=var: self.toggle_requirement(r, v.get()))
@@ -1059,26 +1007,15 @@ class Dashboard(ttk.Frame):
         if not self.selected_cadet:
             return
         cadet_id = self.selected_cadet[0]
-        conn = get_connection()
-        if not conn:
-            # update in-memory state if DB not available
-            if req_id in self.requirements_state:
-                self.requirements_state[req_id].set(value)
-            return
-        try:
-            cur = conn.cursor()
-            if value:
-                # insert completion row with today's date
-                cur.execute('INSERT INTO cadet_has_rank_requirement (cadet_cadet_id, requirement_requirement_id, date_completed) VALUES (%s, %s, CURDATE())', (cadet_id, req_id))
-            else:
-                cur.execute('DELETE FROM cadet_has_rank_requirement WHERE cadet_cadet_id = %s AND requirement_requirement_id = %s', (cadet_id, req_id))
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            logging.exception('Error toggling requirement')
+
+        def failed(_exc):
+            # put the checkbox back so the UI matches the database
+            var = self.requirements_state.get(req_id)
+            if var is not None and self.selected_cadet and self.selected_cadet[0] == cadet_id:
+                var.set(not value)
             messagebox.showerror('DB Error', 'Could not update requirement (see terminal).')
-        finally:
-            conn.close()
+
+        self._runner.submit(set_requirement_complete, cadet_id, req_id, value, on_error=failed, indicator=self._req_busy)
 
 
 def main():
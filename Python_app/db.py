@@ -0,0 +1,212 @@
+"""
+Shared MySQL connection layer for the CAP Cadet Tracker GUI modules.
+
+Every module used to open its own `mysql.connector.connect(**DB_CONFIG)` per query, which meant
+a full TCP + auth handshake for each helper call. This module keeps one process-wide, bounded
+`MySQLConnectionPool` instead. `get_connection()` keeps the old contract (a connection or None),
+and calling `conn.close()` hands the connection back to the pool rather than dropping it.
+
+Tuning (environment variables, all optional):
+  CADET_DB_POOL_SIZE         connections kept in the pool (default 5, mysql-connector max 32)
+  CADET_DB_CONNECT_TIMEOUT   seconds to wait for the server when opening a socket (default 10)
+  CADET_DB_CHECKOUT_TIMEOUT  seconds to wait for a free pooled connection (default 15)
+  CADET_DB_PING_ATTEMPTS     reconnect attempts when a checked-out socket has gone stale (default 2)
+
+Requires: mysql-connector-python
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from tkinter import messagebox
+
+import dbtrace
+
+try:
+    import mysql.connector
+    from mysql.connector import Error, pooling
+    from mysql.connector.errors import PoolError
+except Exception:
+    mysql = None
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'Michael',
+    'password': 'hogbog89',
+    'database': 'cadet_tracker',
+}
+
+POOL_NAME = 'cadet_tracker_pool'
+POOL_SIZE = max(1, min(32, int(os.environ.get('CADET_DB_POOL_SIZE', 5))))
+CONNECT_TIMEOUT = int(os.environ.get('CADET_DB_CONNECT_TIMEOUT', 10))
+CHECKOUT_TIMEOUT = float(os.environ.get('CADET_DB_CHECKOUT_TIMEOUT', 15))
+PING_ATTEMPTS = int(os.environ.get('CADET_DB_PING_ATTEMPTS', 2))
+
+# how long to sleep between attempts while every pooled connection is checked out
+_CHECKOUT_POLL = 0.05
+
+_pool = None
+_pool_lock = threading.Lock()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+
+def _get_pool():
+    """Create the shared pool on first use. Safe to call from any thread."""
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=POOL_SIZE,
+                pool_reset_session=True,
+                connection_timeout=CONNECT_TIMEOUT,
+                **DB_CONFIG,
+            )
+            logging.info('Opened MySQL pool %s (size %s)', POOL_NAME, POOL_SIZE)
+    return _pool
+
+
+def _checkout(timeout: float):
+    """Borrow a healthy connection from the pool, waiting up to `timeout` seconds for a free slot.
+
+    The pool itself reconnects sockets it finds disconnected; the explicit ping below also
+    catches connections the server dropped while they sat idle (wait_timeout, network blips).
+    """
+    started = time.perf_counter()
+    pool = _get_pool()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = pool.get_connection()
+        except PoolError:
+            # pool exhausted: every connection is checked out by another caller
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(_CHECKOUT_POLL)
+            continue
+        try:
+            conn.ping(reconnect=True, attempts=PING_ATTEMPTS, delay=0)
+            # statements on the connection are timed and attributed by dbtrace
+            return dbtrace.instrument(conn, (time.perf_counter() - started) * 1000.0)
+        except Error:
+            logging.warning('Discarding stale pooled connection')
+            try:
+                conn.close()
+            except Exception:
+                pass
+            if time.monotonic() >= deadline:
+                raise
+
+
+def get_connection(show_errors: bool = None):
+    """Return a pooled connection or None if the database is unreachable.
+
+    Callers keep using the usual try/finally `conn.close()` pattern; close() returns the
+    connection to the pool. Errors are shown in a message box only when called from the Tk
+    (main) thread unless show_errors says otherwise; worker threads must never open dialogs.
+    """
+    if show_errors is None:
+        show_errors = threading.current_thread() is threading.main_thread()
+    if mysql is None:
+        logging.error('mysql-connector-python is not installed')
+        if show_errors:
+            messagebox.showerror('DB Error', 'mysql-connector-python is not installed.')
+        return None
+    try:
+        return _checkout(CHECKOUT_TIMEOUT)
+    except PoolError as e:
+        logging.exception('No pooled DB connection available')
+        if show_errors:
+            messagebox.showerror('DB Error', f'All database connections are busy:\n{e}')
+        return None
+    except Exception as e:
+        logging.exception('DB connect failed')
+        if show_errors:
+            messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
+        return None
+
+
+def checkout_connection():
+    """Like get_connection() but raises instead of returning None.
+
+    Meant for functions run through tasks.TaskRunner: the exception travels back to the UI
+    thread, which decides how to report it.
+    """
+    if mysql is None:
+        raise RuntimeError('mysql-connector-python is not installed')
+    return _checkout(CHECKOUT_TIMEOUT)
+
+
+def kill_query(connection_id: int, still_running=None):
+    """Abort the statement currently running on server connection `connection_id`.
+
+    Uses KILL QUERY (not KILL), so the pooled connection itself survives and goes back to the
+    pool once its owner sees the "query execution was interrupted" error. The kill goes over a
+    direct connection outside the pool, so it never waits behind the workers for a slot.
+
+    still_running, when given, is a (lock, state) pair from cancellable(): the kill is only sent
+    while state['active'] is set, checked under the lock, so a connection that has already gone
+    back to the pool (and may be running someone else's query) is never touched.
+    """
+    if mysql is None:
+        return
+    conn = mysql.connector.connect(connection_timeout=CONNECT_TIMEOUT, **DB_CONFIG)
+    try:
+        cur = conn.cursor()
+        if still_running is None:
+            cur.execute('KILL QUERY %d' % int(connection_id))
+            return
+        lock, state = still_running
+        with lock:
+            if not state['active']:
+                logging.debug('Connection %s already released; not killing', connection_id)
+                return
+            cur.execute('KILL QUERY %d' % int(connection_id))
+    except Error as e:
+        # the query may already have finished; nothing to do
+        logging.debug('KILL QUERY %s: %s', connection_id, e)
+    finally:
+        conn.close()
+
+
+@contextmanager
+def cancellable(conn, token):
+    """While active, cancelling `token` kills whatever `conn` is executing on the server.
+
+    The kill runs on a short-lived thread because cancel() is usually called from the Tk
+    thread, which must not wait on the database. Leaving the block marks the connection
+    inactive under a lock before the caller can return it to the pool, and the kill re-checks
+    that mark under the same lock right before sending KILL QUERY.
+    """
+    if token is None:
+        yield conn
+        return
+    try:
+        connection_id = conn.connection_id
+    except Exception:
+        connection_id = None
+    guard = (threading.Lock(), {'active': True})
+
+    def hook():
+        if connection_id:
+            threading.Thread(target=_kill_quietly, args=(connection_id, guard), name='db-kill', daemon=True).start()
+
+    token.add_cancel_hook(hook)
+    try:
+        yield conn
+    finally:
+        token.remove_cancel_hook(hook)
+        with guard[0]:
+            guard[1]['active'] = False
+
+
+def _kill_quietly(connection_id, still_running=None):
+    try:
+        kill_query(connection_id, still_running)
+    except Exception:
+        logging.exception('Could not kill query on connection %s', connection_id)
@@ -3,9 +3,22 @@ DB Browser GUI - lightweight explorer for the configured MySQL database.
 
 Features:
 - List all tables in the configured database.
-- Show selected table's columns and a paginated/limited set of rows.
+- Show selected table's columns and browse its rows page by page as you scroll.
 - Refresh table list and rows.
 - Export current table page to CSV.
+- Export a whole table (optionally filtered by a WHERE clause) to CSV or gzip'd CSV.
+
+Rows are fetched by primary-key keyset (`WHERE pk > last ORDER BY pk LIMIT page`), so the
+cost of a page doesn't grow with how far into the table you are. Only WINDOW_PAGES pages are
+kept in the Treeview at once; pages scrolled far out of view are dropped and re-fetched if
+you scroll back. The next page is prefetched in the background. Tables without a primary
+key fall back to LIMIT/OFFSET paging. Row counts come from information_schema and are
+estimates for InnoDB tables.
+
+Whole-table exports stream from an unbuffered cursor in EXPORT_BATCH-row fetchmany() batches
+straight to the file on a background thread, so memory use stays flat however large the
+table is. The file is written under a .part name and only renamed into place once complete;
+cancelling kills the query and removes the partial file.
 
 Usage: python db_browser.py
 
@@ -14,26 +27,24 @@ Requires: mysql-connector-python
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import mysql.connector
 import csv
+import gzip
 import logging
+import os
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
-logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+from db import checkout_connection, cancellable
+from tasks import get_runner, LoadingIndicator, CancelToken
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Exception as e:
-        logging.exception('DB connect failed')
-        messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-        return None
+# pages held in the Treeview at once (the rest of the table stays in MySQL)
+WINDOW_PAGES = 3
+# fraction of the scroll range from either end at which the neighbouring page is loaded
+SCROLL_EDGE = 0.1
+# rows per fetchmany() call when streaming an export
+EXPORT_BATCH = 2000
+# how often the export dialog refreshes its progress
+EXPORT_POLL_MS = 200
 
 
 class DBBrowser(ttk.Frame):
@@ -41,6 +52,8 @@ class DBBrowser(ttk.Frame):
         super().__init__(master, padding=8)
         self.master = master
         self.pack(fill='both', expand=True)
+        self._runner = get_runner(self)
+        self._reset_paging(None)
         self._build_ui()
 
     def _build_ui(self):
@@ -58,12 +71,13 @@ class DBBrowser(ttk.Frame):
         tbl_btns.grid(row=1, column=0, pady=(6,0))
         ttk.Button(tbl_btns, text='Refresh', command=self.load_tables).grid(row=0, column=0, padx=4)
         ttk.Button(tbl_btns, text='Export CSV', command=self.export_current_page).grid(row=0, column=1, padx=4)
+        ttk.Button(tbl_btns, text='Export Table...', command=self.export_table).grid(row=1, column=0, columnspan=2, pady=(4,0))
 
         # Right: table viewer
         right = ttk.Frame(self)
         right.grid(row=0, column=1, sticky='nsew')
         right.columnconfigure(0, weight=1)
-        right.rowconfigure(1, weight=1)
+        right.rowconfigure(2, weight=1)
 
         top_row = ttk.Frame(right)
         top_row.grid(row=0, column=0, sticky='ew')
@@ -71,10 +85,12 @@ class DBBrowser(ttk.Frame):
         self.table_name_var = tk.StringVar()
         ttk.Label(top_row, textvariable=self.table_name_var, font=('TkDefaultFont', 10, 'bold')).grid(row=0, column=1, sticky='w', padx=(6,12))
 
-        ttk.Label(top_row, text='Row limit:').grid(row=0, column=2, sticky='e')
+        ttk.Label(top_row, text='Page size:').grid(row=0, column=2, sticky='e')
         self.row_limit_var = tk.IntVar(value=100)
         ttk.Entry(top_row, textvariable=self.row_limit_var, width=6).grid(row=0, column=3, sticky='w')
         ttk.Button(top_row, text='Load rows', command=self.load_rows).grid(row=0, column=4, sticky='w', padx=(6,0))
+        self._busy = LoadingIndicator(top_row)
+        self._busy.grid(row=0, column=5, sticky='w', padx=(6,0))
 
         # columns and rows treeview
         cols_frame = ttk.Frame(right)
@@ -87,35 +103,36 @@ class DBBrowser(ttk.Frame):
         self.cols_tv.heading('type', text='Type')
         self.cols_tv.grid(row=0, column=0, sticky='nsew')
 
-        self.rows_tv = ttk.Treeview(right, show='headings')
-        self.rows_tv.grid(row=2, column=0, sticky='nsew', pady=(8,0))
+        rows_frame = ttk.Frame(right)
+        rows_frame.grid(row=2, column=0, sticky='nsew', pady=(8,0))
+        rows_frame.columnconfigure(0, weight=1)
+        rows_frame.rowconfigure(0, weight=1)
+        self.rows_tv = ttk.Treeview(rows_frame, show='headings')
+        self.rows_tv.grid(row=0, column=0, sticky='nsew')
+        self._rows_vsb = ttk.Scrollbar(rows_frame, orient='vertical', command=self.rows_tv.yview)
+        self._rows_vsb.grid(row=0, column=1, sticky='ns')
+        rows_hsb = ttk.Scrollbar(rows_frame, orient='horizontal', command=self.rows_tv.xview)
+        rows_hsb.grid(row=1, column=0, sticky='ew')
+        # every scroll passes through _on_rows_scroll, which pages rows in and out
+        self.rows_tv.configure(yscrollcommand=self._on_rows_scroll, xscrollcommand=rows_hsb.set)
 
         rows_btns = ttk.Frame(right)
         rows_btns.grid(row=3, column=0, sticky='ew', pady=(6,0))
         ttk.Button(rows_btns, text='Refresh Rows', command=self.load_rows).grid(row=0, column=0, padx=4)
         ttk.Button(rows_btns, text='Row Details', command=self.show_row_details).grid(row=0, column=1, padx=4)
+        self.rows_status_var = tk.StringVar()
+        ttk.Label(rows_btns, textvariable=self.rows_status_var, foreground='#6b7280').grid(row=0, column=2, padx=12, sticky='w')
 
         self.load_tables()
 
     def load_tables(self):
+        self._runner.submit(fetch_tables, on_done=self._render_tables, indicator=self._busy,
+                            error_message='Could not load table list (see terminal).')
+
+    def _render_tables(self, rows):
         self.tbl_list.delete(0, 'end')
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = DATABASE() ORDER BY table_name")
-            rows = cur.fetchall()
-            for r in rows:
-                self.tbl_list.insert('end', r[0])
-        except Exception:
-            logging.exception('Error loading table list')
-            messagebox.showerror('DB Error', 'Could not load table list (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        for r in rows:
+            self.tbl_list.insert('end', r[0])
 
     def on_table_select(self):
         sel = self.tbl_list.curselection()
@@ -123,65 +140,221 @@ class DBBrowser(ttk.Frame):
             return
         tbl = self.tbl_list.get(sel[0])
         self.table_name_var.set(tbl)
-        # load columns
-        conn = get_connection()
-        if not conn:
+        self._reset_paging(None)
+        # load columns, primary key and row estimate, then the first page
+        self._runner.submit(fetch_table_meta, tbl, on_done=lambda meta: self._render_columns(tbl, meta), indicator=self._busy,
+                            error_message='Could not load columns (see terminal).')
+
+    def _render_columns(self, tbl, meta):
+        # another table was selected while this one loaded
+        if self.table_name_var.get() != tbl:
             return
+        cols, pk_cols, est_rows = meta
+        # populate cols_tv
+        for i in self.cols_tv.get_children():
+            self.cols_tv.delete(i)
+        for c in cols:
+            label = c[1] + ('  (PK)' if c[0] in pk_cols else '')
+            self.cols_tv.insert('', 'end', values=(c[0], label))
+        # configure rows_tv columns
+        col_names = [c[0] for c in cols]
+        self.rows_tv['columns'] = col_names
+        for col in col_names:
+            self.rows_tv.heading(col, text=col)
+            self.rows_tv.column(col, width=120)
+        self._reset_paging({'table': tbl, 'cols': col_names, 'pk': pk_cols, 'est': est_rows})
+        self.load_rows()
+
+    # ---------------- paging ----------------
+    def _reset_paging(self, meta):
+        """Forget the current window. meta is None until a table's columns are loaded."""
+        if hasattr(self, 'rows_tv'):
+            self.rows_tv.delete(*self.rows_tv.get_children())
+        self._meta = meta
+        # window of pages in the Treeview, top to bottom: {'rows', 'iids', 'first', 'last'}
+        self._pages = []
+        self._window_start = 0      # rows of the table above the first page in the window
+        self._at_end = False
+        self._in_flight = set()     # directions ('next'/'prev') with a fetch running
+        self._prefetched = None     # (boundary, rows) for the page after the window
+        self._iid_seq = 0
+        if hasattr(self, 'rows_status_var'):
+            self._update_rows_status()
+
+    def _page_size(self):
         try:
-            cur = conn.cursor()
-            cur.execute('SELECT column_name, column_type FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s ORDER BY ordinal_position', (tbl,))
-            cols = cur.fetchall()
-            # populate cols_tv
-            for i in self.cols_tv.get_children():
-                self.cols_tv.delete(i)
-            for c in cols:
-                self.cols_tv.insert('', 'end', values=(c[0], c[1]))
-            # configure rows_tv columns
-            col_names = [c[0] for c in cols]
-            self.rows_tv['columns'] = col_names
-            for col in col_names:
-                self.rows_tv.heading(col, text=col)
-                self.rows_tv.column(col, width=120)
-            # clear any previous rows
-            for i in self.rows_tv.get_children():
-                self.rows_tv.delete(i)
-        except Exception:
-            logging.exception('Error loading columns for table %s', tbl)
-            messagebox.showerror('DB Error', 'Could not load columns (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            return max(10, min(5000, int(self.row_limit_var.get() or 100)))
+        except (tk.TclError, ValueError):
+            return 100
 
     def load_rows(self):
+        """(Re)load the selected table from its first page."""
         tbl = self.table_name_var.get()
         if not tbl:
             messagebox.showinfo('Select Table', 'Please select a table first')
             return
-        limit = self.row_limit_var.get() or 100
-        conn = get_connection()
-        if not conn:
+        if not self._meta or self._meta['table'] != tbl:
+            # columns not loaded yet; on_table_select will call back here
             return
-        try:
-            cur = conn.cursor()
-            cur.execute(f'SELECT * FROM `{tbl}` LIMIT %s', (limit,))
-            rows = cur.fetchall()
-            # clear tree
-            for i in self.rows_tv.get_children():
-                self.rows_tv.delete(i)
-            for r in rows:
-                # convert to strings for display
-                vals = [str(x) if x is not None else '' for x in r]
-                self.rows_tv.insert('', 'end', values=vals)
-        except Exception:
-            logging.exception('Error loading rows for table %s', tbl)
-            messagebox.showerror('DB Error', 'Could not load rows (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        self._reset_paging(self._meta)
+        self._load_page('next')
+
+    def _boundary(self, direction):
+        """Key (or OFFSET for tables without a primary key) next to the window in `direction`."""
+        if not self._pages:
+            return None
+        if not self._meta['pk']:
+            if direction == 'next':
+                return self._window_start + sum(len(p['rows']) for p in self._pages)
+            return max(0, self._window_start - self._page_size())
+        return self._pages[-1]['last'] if direction == 'next' else self._pages[0]['first']
+
+    def _load_page(self, direction):
+        meta = self._meta
+        if not meta or direction in self._in_flight:
+            return
+        if direction == 'next' and self._at_end:
+            return
+        if direction == 'prev' and self._window_start <= 0:
+            return
+        boundary = self._boundary(direction)
+        limit = self._page_size()
+        if direction == 'prev' and not meta['pk']:
+            limit = min(limit, self._window_start)
+        if direction == 'next' and self._prefetched and self._prefetched[0] == boundary:
+            rows = self._prefetched[1]
+            self._prefetched = None
+            self._add_page(meta, 'next', rows)
+            return
+        self._in_flight.add(direction)
+        self._runner.submit(fetch_page, meta['table'], meta['cols'], meta['pk'], boundary, direction, limit,
+                            on_done=lambda rows: self._on_page(meta, direction, rows), indicator=self._busy,
+                            on_error=lambda e: self._on_page_error(meta, direction, e))
+
+    def _on_page(self, meta, direction, rows):
+        if meta is not self._meta:
+            return
+        self._in_flight.discard(direction)
+        self._add_page(meta, direction, rows)
+
+    def _on_page_error(self, meta, direction, exc):
+        if meta is not self._meta:
+            return
+        self._in_flight.discard(direction)
+        messagebox.showerror('DB Error', 'Could not load rows (see terminal).')
+
+    def _key_of(self, row):
+        idx = self._meta.get('key_idx')
+        if idx is None:
+            idx = self._meta['key_idx'] = [self._meta['cols'].index(c) for c in self._meta['pk']]
+        return tuple(row[i] for i in idx)
+
+    def _add_page(self, meta, direction, rows):
+        tv = self.rows_tv
+        limit = self._page_size()
+        if direction == 'next' and len(rows) < limit:
+            self._at_end = True
+        if not rows:
+            self._update_rows_status()
+            return
+        if direction == 'prev':
+            # rows arrive nearest-first; put them back in table order
+            rows = rows[::-1]
+        total_before = len(tv.get_children())
+        top_index = int(round(tv.yview()[0] * total_before)) if total_before else 0
+
+        iids = []
+        display = [[str(x) if x is not None else '' for x in r] for r in rows]
+        if direction == 'next':
+            for vals in display:
+                self._iid_seq += 1
+                iids.append(tv.insert('', 'end', iid=f'r{self._iid_seq}', values=vals))
+        else:
+            # insert above the window, keeping table order
+            for pos, vals in enumerate(display):
+                self._iid_seq += 1
+                iids.append(tv.insert('', pos, iid=f'r{self._iid_seq}', values=vals))
+            top_index += len(rows)
+            self._window_start -= len(rows)
+        page = {'rows': rows, 'iids': iids}
+        if meta['pk']:
+            page['first'], page['last'] = self._key_of(rows[0]), self._key_of(rows[-1])
+        if direction == 'next':
+            self._pages.append(page)
+        else:
+            self._pages.insert(0, page)
+
+        # keep the window bounded: drop the page furthest from where rows were added
+        while len(self._pages) > WINDOW_PAGES:
+            if direction == 'next':
+                old = self._pages.pop(0)
+                self._window_start += len(old['rows'])
+                top_index -= len(old['rows'])
+            else:
+                old = self._pages.pop()
+                self._at_end = False
+            tv.delete(*old['iids'])
+        # keep the rows the user was looking at in place after inserting/removing above them
+        total = len(tv.get_children())
+        if total_before and total:
+            tv.yview_moveto(max(0, top_index) / total)
+        self._update_rows_status()
+        self._prefetch_next(meta)
+
+    def _prefetch_next(self, meta):
+        """Fetch the page after the window in the background so scrolling down is instant."""
+        if self._at_end or 'next' in self._in_flight or self._prefetched is not None:
+            return
+        boundary = self._boundary('next')
+        # registered like a normal 'next' load so reaching the edge meanwhile does not fetch
+        # the same page twice; the set is captured because _reset_paging replaces it
+        in_flight = self._in_flight
+        in_flight.add('next')
+
+        def finished():
+            in_flight.discard('next')
+            return meta is self._meta and in_flight is self._in_flight
+
+        def store(rows):
+            if not finished() or self._boundary('next') != boundary:
+                return
+            self._prefetched = (boundary, rows)
+            # the user scrolled to the edge while the prefetch ran: show it now
+            if self.rows_tv.yview()[1] >= 1.0 - SCROLL_EDGE:
+                self._load_page('next')
+
+        def failed(exc):
+            finished()
+            logging.debug('Prefetch failed: %s', exc)
+
+        self._runner.submit(fetch_page, meta['table'], meta['cols'], meta['pk'], boundary, 'next', self._page_size(),
+                            on_done=store, on_error=failed)
+
+    def _on_rows_scroll(self, first, last):
+        self._rows_vsb.set(first, last)
+        if not self._pages:
+            return
+        first, last = float(first), float(last)
+        if last >= 1.0 - SCROLL_EDGE:
+            self._load_page('next')
+        if first <= SCROLL_EDGE and self._window_start > 0:
+            self._load_page('prev')
+
+    def _update_rows_status(self):
+        meta = self._meta
+        if not meta:
+            self.rows_status_var.set('')
+            return
+        shown = sum(len(p['rows']) for p in self._pages)
+        est = meta.get('est')
+        est_text = f'~{est:,}' if est is not None else '?'
+        if shown:
+            text = f'Rows {self._window_start + 1:,}-{self._window_start + shown:,} of {est_text} (estimate)'
+        else:
+            text = f'No rows (table estimate {est_text})'
+        if not meta['pk']:
+            text += ' - no primary key, using OFFSET paging'
+        self.rows_status_var.set(text)
 
     def export_current_page(self):
         tbl = self.table_name_var.get()
@@ -207,6 +380,14 @@ class DBBrowser(ttk.Frame):
             logging.exception('Error exporting CSV')
             messagebox.showerror('Error', 'Could not export CSV (see terminal).')
 
+    def export_table(self):
+        """Stream the whole selected table (or a filtered subset) to a file."""
+        tbl = self.table_name_var.get()
+        if not tbl or not self._meta or self._meta['table'] != tbl:
+            messagebox.showinfo('Select Table', 'Please select a table first')
+            return
+        ExportDialog(self, tbl, list(self._meta['cols']), self._meta.get('est'))
+
     def show_row_details(self):
         sel = self.rows_tv.selection()
         if not sel:
@@ -224,6 +405,239 @@ class DBBrowser(ttk.Frame):
             txt.config(state='disabled')
 
 
+class ExportDialog(tk.Toplevel):
+    """Options, progress bar and Cancel button for one streaming table export."""
+
+    def __init__(self, browser, tbl, col_names, est_rows):
+        super().__init__(browser.master)
+        self.title(f'Export {tbl}')
+        self.transient(browser.master)
+        self.resizable(False, False)
+        self._runner = browser._runner
+        self._tbl = tbl
+        self._cols = col_names
+        self._est = est_rows
+        self._token = None
+        self._progress = None
+        self._poll_id = None
+
+        frm = ttk.Frame(self, padding=10)
+        frm.grid(row=0, column=0, sticky='nsew')
+        frm.columnconfigure(1, weight=1)
+        ttk.Label(frm, text='Filter (WHERE):').grid(row=0, column=0, sticky='w')
+        self.where_var = tk.StringVar()
+        self._where_entry = ttk.Entry(frm, textvariable=self.where_var, width=50)
+        self._where_entry.grid(row=0, column=1, sticky='ew', padx=(6,0))
+        ttk.Label(frm, text='Leave empty to export every row. Save as .csv.gz to compress.',
+                  foreground='#6b7280').grid(row=1, column=0, columnspan=2, sticky='w', pady=(2,8))
+
+        self.bar = ttk.Progressbar(frm, length=360, mode='determinate')
+        self.bar.grid(row=2, column=0, columnspan=2, sticky='ew')
+        self.status_var = tk.StringVar(value='')
+        ttk.Label(frm, textvariable=self.status_var).grid(row=3, column=0, columnspan=2, sticky='w', pady=(4,8))
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=4, column=0, columnspan=2, sticky='e')
+        self.start_btn = ttk.Button(btns, text='Export...', command=self.start)
+        self.start_btn.grid(row=0, column=0, padx=4)
+        self.cancel_btn = ttk.Button(btns, text='Close', command=self.cancel)
+        self.cancel_btn.grid(row=0, column=1, padx=4)
+        self.protocol('WM_DELETE_WINDOW', self.cancel)
+
+    def start(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension='.csv', initialfile=f'{self._tbl}.csv',
+                                            filetypes=[('CSV files', '*.csv'), ('Gzipped CSV', '*.csv.gz')])
+        if not path:
+            return
+        where = self.where_var.get().strip()
+        self._token = CancelToken()
+        self._progress = {'rows': 0}
+        self.start_btn.state(['disabled'])
+        self._where_entry.state(['disabled'])
+        self.cancel_btn.configure(text='Cancel')
+        # the table estimate is only a useful total for unfiltered exports
+        if self._est and not where:
+            self.bar.configure(mode='determinate', maximum=self._est, value=0)
+        else:
+            self.bar.configure(mode='indeterminate')
+            self.bar.start(15)
+        self._runner.submit(stream_export, self._tbl, self._cols, where, path, self._progress, self._token,
+                            token=self._token, on_done=self._on_done, on_error=self._on_error)
+        self._poll()
+
+    def _poll(self):
+        self._poll_id = None
+        if self._progress is None:
+            return
+        rows = self._progress['rows']
+        if str(self.bar.cget('mode')) == 'determinate':
+            # the estimate can be low; keep the bar just short of full until the export ends
+            self.bar.configure(value=min(rows, self._est * 0.99))
+        self.status_var.set(f'{rows:,} rows written...')
+        self._poll_id = self.after(EXPORT_POLL_MS, self._poll)
+
+    def _finish(self):
+        self._progress = None
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.bar.stop()
+
+    def _on_done(self, result):
+        rows, path = result
+        self._finish()
+        self.bar.configure(mode='determinate', maximum=max(rows, 1), value=max(rows, 1))
+        self.status_var.set(f'Exported {rows:,} rows to {path}')
+        self.cancel_btn.configure(text='Close')
+        self._token = None
+
+    def _on_error(self, exc):
+        self._finish()
+        self.status_var.set('Export failed.')
+        self.cancel_btn.configure(text='Close')
+        self.start_btn.state(['!disabled'])
+        self._where_entry.state(['!disabled'])
+        self._token = None
+        messagebox.showerror('DB Error', 'Could not export table (see terminal).', parent=self)
+
+    def cancel(self):
+        if self._token is not None:
+            # the worker removes the partial file; its result is dropped by the runner
+            self._token.cancel()
+            self._token = None
+            self._finish()
+        self.destroy()
+
+
+# --- queries (run on TaskRunner worker threads; they raise on DB errors) ---
+
+def fetch_tables():
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = DATABASE() ORDER BY table_name")
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _quote(name):
+    return '`' + str(name).replace('`', '``') + '`'
+
+
+def fetch_table_meta(tbl):
+    """Return (columns, primary_key_columns, estimated_rows) for a table.
+
+    columns are (column_name, column_type) in ordinal order. The row count is
+    information_schema's estimate, which avoids a COUNT(*) scan of large tables.
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT column_name, column_type, column_key FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s ORDER BY ordinal_position', (tbl,))
+        cols = cur.fetchall()
+        cur.execute('''
+            SELECT column_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = 'PRIMARY'
+            ORDER BY seq_in_index
+        ''', (tbl,))
+        pk_cols = [r[0] for r in cur.fetchall()]
+        cur.execute('SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s', (tbl,))
+        est = cur.fetchone()
+        return [(c[0], c[1]) for c in cols], pk_cols, (int(est[0]) if est and est[0] is not None else None)
+    finally:
+        conn.close()
+
+
+def fetch_page(tbl, col_names, pk_cols, boundary, direction, limit):
+    """Fetch one page of rows next to `boundary`.
+
+    With a primary key, boundary is the key tuple of the last (direction 'next') or first
+    ('prev') row in view and the query is a keyset seek on the primary key index; 'prev' rows
+    come back nearest-first. Without a primary key, boundary is an OFFSET.
+    """
+    cols_sql = ', '.join(_quote(c) for c in col_names)
+    sql = f'SELECT {cols_sql} FROM {_quote(tbl)}'
+    params = []
+    if pk_cols:
+        key_sql = ', '.join(_quote(c) for c in pk_cols)
+        if len(pk_cols) > 1:
+            key_sql = f'({key_sql})'
+        if boundary is not None:
+            placeholders = ', '.join(['%s'] * len(pk_cols))
+            if len(pk_cols) > 1:
+                placeholders = f'({placeholders})'
+            sql += f" WHERE {key_sql} {'>' if direction == 'next' else '<'} {placeholders}"
+            params.extend(boundary)
+        order = 'ASC' if direction == 'next' else 'DESC'
+        sql += ' ORDER BY ' + ', '.join(f'{_quote(c)} {order}' for c in pk_cols) + ' LIMIT %s'
+        params.append(limit)
+    else:
+        sql += ' LIMIT %s OFFSET %s'
+        params.extend([limit, boundary or 0])
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, tuple(params))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    if not pk_cols and direction == 'prev':
+        # OFFSET pages come back in table order; hand them over nearest-first like keyset pages
+        rows.reverse()
+    return rows
+
+
+def stream_export(tbl, col_names, where, path, progress, token=None):
+    """Write every row of `tbl` (optionally filtered by a raw `where` clause) to `path` as CSV.
+
+    Rows are read from an unbuffered cursor EXPORT_BATCH at a time, so only one batch is ever
+    held in memory. A path ending in .gz is gzip-compressed. progress['rows'] is updated after
+    each batch for the UI to poll. Returns (rows_written, path).
+    """
+    cols_sql = ', '.join(_quote(c) for c in col_names)
+    sql = f'SELECT {cols_sql} FROM {_quote(tbl)}'
+    if where:
+        sql += f' WHERE {where}'
+    tmp_path = path + '.part'
+    opener = gzip.open if path.lower().endswith('.gz') else open
+    check = token.check if token is not None else (lambda: None)
+    written = 0
+    finished = False
+    conn = checkout_connection()
+    try:
+        with cancellable(conn, token):
+            cur = conn.cursor(buffered=False)
+            cur.execute(sql)
+            with opener(tmp_path, 'wt', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(col_names)
+                while True:
+                    check()
+                    batch = cur.fetchmany(EXPORT_BATCH)
+                    if not batch:
+                        break
+                    writer.writerows(['' if v is None else v for v in r] for r in batch)
+                    written += len(batch)
+                    progress['rows'] = written
+            finished = True
+        os.replace(tmp_path, path)
+        logging.info('Exported %d rows from %s to %s', written, tbl, path)
+        return written, path
+    finally:
+        if not finished:
+            # drain what is left of a killed/abandoned result so the connection is reusable
+            try:
+                conn.consume_results()
+            except Exception:
+                logging.debug('Could not drain export results', exc_info=True)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        conn.close()
+
+
 def main():
     root = tk.Tk()
     root.title('DB Browser')
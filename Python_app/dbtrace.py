@@ -0,0 +1,365 @@
+"""
+Statement-level instrumentation for the shared connection pool.
+
+db._checkout() hands out connections wrapped by instrument(), so every cursor.execute in the
+app is timed without the call sites changing. For each statement we record:
+
+  - a fingerprint (literals and %s placeholders replaced by ?, IN lists collapsed), so the
+    same query with different values aggregates together;
+  - duration (execute plus any fetch on the same cursor) and rows returned;
+  - the time spent waiting for a pooled connection (recorded per checkout);
+  - the UI action that caused it: MainApp reports every click/keypress with set_ui_action(),
+    and tasks.TaskRunner carries the action current at submit() time over to the worker
+    thread (action_scope), so background queries are charged to the click that queued them.
+
+Statements slower than CADET_SLOW_QUERY_MS (default 200) are appended to CADET_SLOW_QUERY_LOG
+(default slow_queries.log). DBActivityPanel shows per-tab totals and the most expensive
+actions live; actions averaging HEAVY_ACTION_STATEMENTS or more statements per click are
+highlighted. Set CADET_DB_TRACE=0 to hand out unwrapped connections.
+
+This module must not import db or tasks (both import it).
+"""
+
+import collections
+import datetime
+import functools
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+import tkinter as tk
+from tkinter import ttk
+
+TRACE_ENABLED = os.environ.get('CADET_DB_TRACE', '1') != '0'
+SLOW_QUERY_MS = float(os.environ.get('CADET_SLOW_QUERY_MS', 200))
+SLOW_QUERY_LOG = os.environ.get('CADET_SLOW_QUERY_LOG', 'slow_queries.log')
+# statements kept for the "recent" view
+RECENT_STATEMENTS = 200
+# actions at or above this many statements per click are highlighted in the panel
+HEAVY_ACTION_STATEMENTS = 10
+# repeated identical actions within this many seconds (typing, double clicks) count once
+ACTION_COALESCE_S = 1.0
+PANEL_REFRESH_MS = 1000
+
+IDLE_ACTION = ('', '(background)')
+
+_local = threading.local()
+_last_action = IDLE_ACTION
+_last_action_at = 0.0
+
+
+# ---------------- UI action attribution ----------------
+def set_ui_action(tab, label):
+    """Record the user action now in progress (Tk thread)."""
+    global _last_action, _last_action_at
+    action = (tab or '', label or '')
+    now = time.monotonic()
+    if action != _last_action or now - _last_action_at > ACTION_COALESCE_S:
+        STATS.count_click(action)
+    _last_action = action
+    _last_action_at = now
+
+
+def current_action():
+    """The action to charge DB work to: the worker's inherited action, else the last UI action."""
+    return getattr(_local, 'action', None) or _last_action
+
+
+@contextmanager
+def action_scope(action):
+    """Charge DB work on this thread to `action` (used by TaskRunner workers)."""
+    previous = getattr(_local, 'action', None)
+    _local.action = action
+    try:
+        yield
+    finally:
+        _local.action = previous
+
+
+# ---------------- fingerprints ----------------
+_FP_RULES = [
+    (re.compile(r"'(?:[^'\\]|\\.)*'"), '?'),
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(?+)'),
+]
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    fp = sql if isinstance(sql, str) else sql.decode('utf-8', 'replace')
+    for pattern, repl in _FP_RULES:
+        fp = pattern.sub(repl, fp)
+    return fp.strip()
+
+
+# ---------------- aggregation ----------------
+class QueryEvent:
+    __slots__ = ('at', 'fingerprint', 'ms', 'rows', 'action', 'slow_logged', 'sql')
+
+    def __init__(self, sql, action):
+        self.at = time.time()
+        self.sql = sql
+        self.fingerprint = fingerprint(sql)
+        self.ms = 0.0
+        self.rows = 0
+        self.action = action
+        self.slow_logged = False
+
+
+def _totals():
+    return {'statements': 0, 'ms': 0.0, 'rows': 0, 'connections': 0, 'acquire_ms': 0.0, 'clicks': 0}
+
+
+class QueryStats:
+    """Thread-safe counters behind the DB activity panel."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.recent = collections.deque(maxlen=RECENT_STATEMENTS)
+        self.by_tab = collections.defaultdict(_totals)
+        self.by_action = collections.defaultdict(_totals)
+        self.by_fingerprint = collections.defaultdict(lambda: {'count': 0, 'ms': 0.0, 'max_ms': 0.0})
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def count_click(self, action):
+        with self._lock:
+            self.by_action[action]['clicks'] += 1
+            self.by_tab[action[0]]['clicks'] += 1
+
+    def record_acquire(self, action, ms):
+        with self._lock:
+            for bucket in (self.by_action[action], self.by_tab[action[0]]):
+                bucket['connections'] += 1
+                bucket['acquire_ms'] += ms
+
+    def record_statement(self, event):
+        with self._lock:
+            self.recent.append(event)
+            for bucket in (self.by_action[event.action], self.by_tab[event.action[0]]):
+                bucket['statements'] += 1
+                bucket['ms'] += event.ms
+            fp = self.by_fingerprint[event.fingerprint]
+            fp['count'] += 1
+            fp['ms'] += event.ms
+            fp['max_ms'] = max(fp['max_ms'], event.ms)
+
+    def add_fetch(self, event, rows, ms):
+        with self._lock:
+            event.rows += rows
+            event.ms += ms
+            for bucket in (self.by_action[event.action], self.by_tab[event.action[0]]):
+                bucket['rows'] += rows
+                bucket['ms'] += ms
+            fp = self.by_fingerprint[event.fingerprint]
+            fp['ms'] += ms
+            fp['max_ms'] = max(fp['max_ms'], event.ms)
+
+    def snapshot(self):
+        with self._lock:
+            return ({k: dict(v) for k, v in self.by_tab.items()},
+                    {k: dict(v) for k, v in self.by_action.items()},
+                    list(self.recent))
+
+
+STATS = QueryStats()
+
+_slow_logger = None
+
+
+def _log_slow(event):
+    global _slow_logger
+    if event.slow_logged or event.ms < SLOW_QUERY_MS:
+        return
+    event.slow_logged = True
+    if _slow_logger is None:
+        _slow_logger = logging.getLogger('cadet.slow_query')
+        _slow_logger.propagate = False
+        try:
+            handler = logging.FileHandler(SLOW_QUERY_LOG, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _slow_logger.addHandler(handler)
+        except OSError:
+            logging.exception('Could not open slow query log %s', SLOW_QUERY_LOG)
+    tab, label = event.action
+    _slow_logger.warning('%s\t%.1f ms\t%d rows\t%s / %s\t%s',
+                         datetime.datetime.fromtimestamp(event.at).isoformat(timespec='milliseconds'),
+                         event.ms, event.rows, tab or '-', label, event.fingerprint)
+    logging.warning('Slow query (%.0f ms, %s / %s): %s', event.ms, tab or '-', label, event.fingerprint[:200])
+
+
+# ---------------- connection / cursor wrappers ----------------
+class InstrumentedCursor:
+    def __init__(self, cur):
+        self._cur = cur
+        self._event = None
+
+    def _run(self, method, operation, *args, **kwargs):
+        event = QueryEvent(operation, current_action())
+        t0 = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            event.ms = (time.perf_counter() - t0) * 1000.0
+            self._event = event
+            STATS.record_statement(event)
+            _log_slow(event)
+
+    def execute(self, operation, *args, **kwargs):
+        return self._run(self._cur.execute, operation, *args, **kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._run(self._cur.executemany, operation, *args, **kwargs)
+
+    def _fetched(self, rows, t0):
+        if self._event is not None:
+            STATS.add_fetch(self._event, rows, (time.perf_counter() - t0) * 1000.0)
+            _log_slow(self._event)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = self._cur.fetchone()
+        self._fetched(1 if row is not None else 0, t0)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        rows = self._cur.fetchmany(*args, **kwargs)
+        self._fetched(len(rows), t0)
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = self._cur.fetchall()
+        self._fetched(len(rows), t0)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def instrument(conn, acquire_ms=0.0):
+    """Wrap a freshly checked-out connection and record how long the checkout took."""
+    if not TRACE_ENABLED:
+        return conn
+    STATS.record_acquire(current_action(), acquire_ms)
+    return InstrumentedConnection(conn)
+
+
+# ---------------- UI ----------------
+def describe_widget(widget):
+    """Short human label for the widget a click or keypress landed on."""
+    try:
+        text = widget.cget('text')
+    except Exception:
+        text = ''
+    try:
+        cls = widget.winfo_class()
+        name = widget.winfo_name()
+    except Exception:
+        return str(widget)
+    if isinstance(text, str) and text.strip():
+        return f'{cls} "{text.strip()[:40]}"'
+    return f'{cls} {name}'
+
+
+class DBActivityPanel(ttk.Frame):
+    """Live per-tab totals and the heaviest UI actions, refreshed every PANEL_REFRESH_MS."""
+
+    TAB_COLS = ('tab', 'clicks', 'statements', 'rows', 'db_ms', 'conns', 'wait_ms')
+    ACTION_COLS = ('tab', 'action', 'clicks', 'per_click', 'statements', 'db_ms')
+
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=2)
+
+        self.tabs_tv = ttk.Treeview(self, columns=self.TAB_COLS, show='headings', height=6)
+        for c, text, width in zip(self.TAB_COLS, ('Tab', 'Clicks', 'Stmts', 'Rows', 'DB ms', 'Conns', 'Wait ms'),
+                                  (140, 60, 60, 70, 80, 60, 70)):
+            self.tabs_tv.heading(c, text=text)
+            self.tabs_tv.column(c, width=width, anchor='w' if c == 'tab' else 'e')
+        self.tabs_tv.grid(row=0, column=0, sticky='nsew', padx=(0,6))
+
+        self.actions_tv = ttk.Treeview(self, columns=self.ACTION_COLS, show='headings', height=6)
+        for c, text, width in zip(self.ACTION_COLS, ('Tab', 'Action', 'Clicks', 'Stmts/click', 'Stmts', 'DB ms'),
+                                  (110, 220, 60, 80, 60, 80)):
+            self.actions_tv.heading(c, text=text)
+            self.actions_tv.column(c, width=width, anchor='w' if c in ('tab', 'action') else 'e')
+        self.actions_tv.tag_configure('heavy', foreground='#b91c1c')
+        self.actions_tv.grid(row=0, column=1, sticky='nsew')
+
+        bottom = ttk.Frame(self)
+        bottom.grid(row=1, column=0, columnspan=2, sticky='ew', pady=(4,0))
+        ttk.Button(bottom, text='Reset', command=self._reset).pack(side='left')
+        self.summary_var = tk.StringVar()
+        ttk.Label(bottom, textvariable=self.summary_var, foreground='#6b7280').pack(side='left', padx=8)
+        self._after_id = None
+        self.refresh()
+
+    def _reset(self):
+        STATS.reset()
+        self.refresh()
+
+    def refresh(self):
+        self._after_id = None
+        by_tab, by_action, recent = STATS.snapshot()
+        self.tabs_tv.delete(*self.tabs_tv.get_children())
+        for tab, t in sorted(by_tab.items(), key=lambda kv: -kv[1]['statements']):
+            self.tabs_tv.insert('', 'end', values=(tab or '-', t['clicks'], t['statements'], t['rows'],
+                                                   f"{t['ms']:.0f}", t['connections'], f"{t['acquire_ms']:.0f}"))
+        self.actions_tv.delete(*self.actions_tv.get_children())
+        rows = []
+        for (tab, label), t in by_action.items():
+            if not t['statements']:
+                continue
+            per_click = t['statements'] / max(1, t['clicks'])
+            rows.append((per_click, tab, label, t))
+        rows.sort(key=lambda r: -r[0])
+        for per_click, tab, label, t in rows[:50]:
+            tags = ('heavy',) if per_click >= HEAVY_ACTION_STATEMENTS else ()
+            self.actions_tv.insert('', 'end', values=(tab or '-', label, t['clicks'], f'{per_click:.1f}',
+                                                      t['statements'], f"{t['ms']:.0f}"), tags=tags)
+        if recent:
+            last = recent[-1]
+            self.summary_var.set(f'{sum(t["statements"] for t in by_tab.values())} statements; '
+                                 f'last: {last.ms:.1f} ms {last.fingerprint[:80]}')
+        else:
+            self.summary_var.set('No statements yet')
+        try:
+            self._after_id = self.after(PANEL_REFRESH_MS, self.refresh)
+        except tk.TclError:
+            pass
+
+    def destroy(self):
+        if self._after_id is not None:
+            try:
+                self.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        super().destroy()
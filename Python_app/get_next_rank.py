@@ -1,35 +1,13 @@
 # --- Requirements Editor GUI ---
 import tkinter as tk
-from tkinter import ttk, messagebox
-import mysql.connector
+from tkinter import ttk
+from db import get_connection
+from lookups import RANKS
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
-
-
-
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Exception as e:
-        messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-        return None
 
 def fetch_ranks():
-    conn = get_connection()
-    if not conn:
-        return []
-    try:
-        cur = conn.cursor()
-        cur.execute('SELECT idrank, rank_name FROM `rank` ORDER BY idrank ASC')
-        rows = cur.fetchall()
-        return rows
-    finally:
-        conn.close()
+    # (rank_id, rank_name) in rank order, from the shared lookups cache
+    return [(r[0], r[1]) for r in RANKS.rows()]
 
 def fetch_req_id_for_rank(rank_id):
     conn = get_connection()
@@ -75,15 +53,7 @@ def fetch_req(req_id):
 
         # Data helpers matching the provided DDL
         def fetch_ranks():
-            conn = get_connection()
-            if not conn:
-                return []
-            try:
-                cur = conn.cursor()
-                cur.execute('SELECT rank_id, rank_name FROM `rank` ORDER BY rank_order ASC')
-                return cur.fetchall()
-            finally:
-                conn.close()
+            return [(r[0], r[1]) for r in RANKS.rows()]
 
 
         def fetch_requirements_for_rank(rank_id):
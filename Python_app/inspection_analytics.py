@@ -0,0 +1,268 @@
+"""
+Squadron-wide uniform inspection analytics.
+
+Scores are bulk-loaded once into NumPy arrays: a (inspection x item) score matrix with NaN
+where an item was not scored, plus per-inspection cadet and month indexes. Every statistic is
+then a handful of array operations instead of a Python loop over score rows, which keeps years
+of weekly inspections for hundreds of cadets (~1-2 million score rows) interactive:
+
+  item_averages()     squadron average per item, with how many times it was scored
+  section_averages()  average item score per inspection sheet section
+  weakest_items()     each cadet's lowest-scoring items (averaged over their inspections)
+  monthly_trend()     average item score per month and the change from the previous month
+
+Section membership comes from inspection_totals.INSPECTION_SECTIONS; 'Cleanliness' is one
+inspection_item shared by two sections and is counted under the first, and items outside the
+sheet fall under 'Other'. Aggregate-only inspections (the Inspections tab stores a single
+total) carry no per-item detail and are left out.
+
+load_analytics() runs the query and raises on DB errors; run it through tasks.TaskRunner.
+InspectionAnalyticsFrame is the tab shown in the main window.
+
+Requires: numpy
+"""
+
+import logging
+import math
+import time
+import tkinter as tk
+from tkinter import ttk
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from db import checkout_connection
+from inspection_totals import INSPECTION_SECTIONS, AGGREGATE_ITEM
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+
+# score rows per fetchmany() while loading
+FETCH_BATCH = 20000
+# items listed per cadet in the weakest-items view
+WEAKEST_ITEMS = 3
+OTHER_SECTION = 'Other'
+
+
+class InspectionAnalytics:
+    """Score matrix and indexes for every itemized inspection.
+
+    scores         float (n_inspections, n_items), NaN where not scored; an item with several
+                   rows on one inspection ('Cleanliness' is on the sheet twice) holds their mean
+    insp_cadet     int   (n_inspections,) index into cadet_ids
+    insp_month     int   (n_inspections,) months since year 0 (year * 12 + month - 1)
+    item_section   int   (n_items,) index into section_names
+    """
+
+    def __init__(self, scores, insp_cadet, insp_month, item_ids, item_names, cadet_ids, cadet_names):
+        self.scores = scores
+        self.insp_cadet = insp_cadet
+        self.insp_month = insp_month
+        self.item_ids = item_ids
+        self.item_names = item_names
+        self.cadet_ids = cadet_ids
+        self.cadet_names = cadet_names
+        self.section_names = [name for name, _items in INSPECTION_SECTIONS] + [OTHER_SECTION]
+        first_section = {}
+        for idx, (_name, items) in enumerate(INSPECTION_SECTIONS):
+            for item in items:
+                first_section.setdefault(item, idx)
+        other = len(self.section_names) - 1
+        self.item_section = np.array([first_section.get(n, other) for n in item_names], dtype=np.int64)
+        self.valid = ~np.isnan(scores)
+
+    @property
+    def inspection_count(self):
+        return self.scores.shape[0]
+
+    def item_averages(self):
+        """[(item, average, times scored)], lowest average first."""
+        counts = self.valid.sum(axis=0)
+        sums = np.where(self.valid, self.scores, 0.0).sum(axis=0)
+        means = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+        order = np.argsort(np.where(counts > 0, means, np.inf), kind='stable')
+        return [(self.item_names[i], float(means[i]), int(counts[i])) for i in order if counts[i]]
+
+    def section_averages(self):
+        """[(section, average item score, items scored)] in sheet order."""
+        rows, cols = np.nonzero(self.valid)
+        sec = self.item_section[cols]
+        n = len(self.section_names)
+        sums = np.bincount(sec, weights=self.scores[rows, cols], minlength=n)
+        counts = np.bincount(sec, minlength=n)
+        return [(self.section_names[s], float(sums[s] / counts[s]), int(counts[s])) for s in range(n) if counts[s]]
+
+    def _cadet_item_means(self):
+        """(n_cadets, n_items) mean score per cadet and item, NaN where never scored."""
+        n_items = len(self.item_ids)
+        rows, cols = np.nonzero(self.valid)
+        cell = self.insp_cadet[rows] * n_items + cols
+        size = len(self.cadet_ids) * n_items
+        sums = np.bincount(cell, weights=self.scores[rows, cols], minlength=size)
+        counts = np.bincount(cell, minlength=size)
+        means = np.divide(sums, counts, out=np.full(size, np.nan), where=counts > 0)
+        return means.reshape(len(self.cadet_ids), n_items)
+
+    def weakest_items(self, k=WEAKEST_ITEMS):
+        """[(cadet_id, cadet name, inspections, [(item, average)...])], worst first per cadet."""
+        means = self._cadet_item_means()
+        k = min(k, means.shape[1])
+        if k == 0:
+            return []
+        ranked = np.where(np.isnan(means), np.inf, means)
+        # argpartition finds the k lowest per row in linear time; only those k are sorted
+        lowest = np.argpartition(ranked, k - 1, axis=1)[:, :k]
+        lowest_vals = np.take_along_axis(ranked, lowest, axis=1)
+        lowest = np.take_along_axis(lowest, np.argsort(lowest_vals, axis=1, kind='stable'), axis=1)
+        inspections = np.bincount(self.insp_cadet, minlength=len(self.cadet_ids))
+        out = []
+        for c, cadet_id in enumerate(self.cadet_ids):
+            items = [(self.item_names[i], float(means[c, i])) for i in lowest[c] if not np.isnan(means[c, i])]
+            if items:
+                out.append((cadet_id, self.cadet_names.get(cadet_id, str(cadet_id)), int(inspections[c]), items))
+        return out
+
+    def monthly_trend(self):
+        """[(year, month, inspections, average item score, change from the previous month)]."""
+        if not self.inspection_count:
+            return []
+        counts = self.valid.sum(axis=1)
+        sums = np.where(self.valid, self.scores, 0.0).sum(axis=1)
+        months, inv = np.unique(self.insp_month, return_inverse=True)
+        month_sums = np.bincount(inv, weights=sums)
+        month_counts = np.bincount(inv, weights=counts)
+        month_insp = np.bincount(inv)
+        avg = np.divide(month_sums, month_counts, out=np.full(month_sums.shape, np.nan), where=month_counts > 0)
+        delta = np.concatenate(([np.nan], np.diff(avg)))
+        return [(int(m // 12), int(m % 12) + 1, int(n), float(a), float(d))
+                for m, n, a, d in zip(months, month_insp, avg, delta)]
+
+
+def _load(cur):
+    cur.execute('SELECT item_id, item_name FROM inspection_item WHERE item_name <> %s ORDER BY item_id', (AGGREGATE_ITEM,))
+    items = cur.fetchall()
+    cur.execute('SELECT cadet_id, first_name, last_name FROM cadet')
+    cadet_names = {r[0]: f'{r[2] or ""}, {r[1] or ""}' for r in cur.fetchall()}
+
+    # the month is computed by the server so every column arrives as an integer
+    cur.execute('''
+        SELECT ui.inspection_id, ui.cadet_cadet_id,
+               YEAR(ui.inspection_date) * 12 + MONTH(ui.inspection_date) - 1,
+               u.inspection_item_item_id, u.score
+        FROM uniform_inspection_score u
+        JOIN uniform_inspection ui ON ui.inspection_id = u.uniform_inspection_inspection_id
+        JOIN inspection_item i ON i.item_id = u.inspection_item_item_id
+        WHERE i.item_name <> %s AND u.score IS NOT NULL AND ui.inspection_date IS NOT NULL
+    ''', (AGGREGATE_ITEM,))
+    chunks = []
+    while True:
+        batch = cur.fetchmany(FETCH_BATCH)
+        if not batch:
+            break
+        chunks.append(np.array(batch, dtype=np.int64))
+    data = np.concatenate(chunks) if chunks else np.empty((0, 5), dtype=np.int64)
+
+    item_ids = np.array([r[0] for r in items], dtype=np.int64)
+    item_names = [r[1] for r in items]
+    insp_ids, insp_idx = np.unique(data[:, 0], return_index=True)
+    insp_row = np.searchsorted(insp_ids, data[:, 0])
+    # item ids are sorted (ORDER BY item_id), so searchsorted maps each score to its column
+    item_col = np.searchsorted(item_ids, data[:, 3])
+    # a plain scores[insp_row, item_col] = ... would keep only the last of duplicate rows;
+    # accumulate instead and average
+    shape = (len(insp_ids), len(item_ids))
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    np.add.at(sums, (insp_row, item_col), data[:, 4])
+    np.add.at(counts, (insp_row, item_col), 1)
+    scores = np.divide(sums, counts, out=np.full(shape, np.nan), where=counts > 0)
+
+    cadet_ids, insp_cadet = np.unique(data[insp_idx, 1], return_inverse=True)
+    return InspectionAnalytics(scores, insp_cadet, data[insp_idx, 2], item_ids, item_names,
+                               [int(c) for c in cadet_ids], cadet_names)
+
+
+def load_analytics():
+    """Bulk-load every itemized inspection score. Raises on DB errors (and without numpy)."""
+    if np is None:
+        raise RuntimeError('numpy is not installed (pip install numpy)')
+    t0 = time.perf_counter()
+    conn = checkout_connection()
+    try:
+        analytics = _load(conn.cursor())
+    finally:
+        conn.close()
+    logging.info('Inspection analytics: %d inspections x %d items loaded in %.0f ms',
+                 analytics.inspection_count, len(analytics.item_ids), (time.perf_counter() - t0) * 1000.0)
+    return analytics
+
+
+def _summaries():
+    # all statistics are computed on the worker; the Tk thread only fills the trees
+    a = load_analytics()
+    return a.inspection_count, a.item_averages(), a.section_averages(), a.weakest_items(), a.monthly_trend()
+
+
+class InspectionAnalyticsFrame(ttk.Frame):
+    """Inspection analytics tab: item, section, weakest-item and monthly views."""
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self._runner = get_runner(self)
+        self._build_ui()
+        if np is None:
+            self.status_var.set('NumPy is not installed; run pip install numpy to enable inspection analytics.')
+        else:
+            self.load()
+
+    def _tree(self, parent, columns):
+        frame = ttk.Frame(parent, padding=6)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show='headings')
+        for key, title, width in columns:
+            tree.heading(key, text=title)
+            tree.column(key, width=width, anchor='w' if width > 120 else 'center')
+        sb = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=sb.set)
+        tree.grid(row=0, column=0, sticky='nsew')
+        sb.grid(row=0, column=1, sticky='ns')
+        return frame, tree
+
+    def _build_ui(self):
+        top = ttk.Frame(self, padding=(8, 8, 8, 0))
+        top.pack(fill='x')
+        ttk.Button(top, text='Refresh', command=self.load).pack(side='left')
+        self._busy = LoadingIndicator(top)
+        self._busy.pack(side='left', padx=6)
+        self.status_var = tk.StringVar()
+        ttk.Label(top, textvariable=self.status_var).pack(side='left', padx=6)
+
+        nb = ttk.Notebook(self)
+        nb.pack(fill='both', expand=True, padx=8, pady=8)
+        f, self.items_tv = self._tree(nb, (('item', 'Item', 260), ('avg', 'Average (0-3)', 100), ('n', 'Times scored', 100)))
+        nb.add(f, text='By item')
+        f, self.sections_tv = self._tree(nb, (('section', 'Section', 200), ('avg', 'Average (0-3)', 100), ('n', 'Item scores', 100)))
+        nb.add(f, text='By section')
+        f, self.weakest_tv = self._tree(nb, (('cadet', 'Cadet', 200), ('n', 'Inspections', 90), ('items', 'Weakest items (average)', 520)))
+        nb.add(f, text='Weakest items per cadet')
+        f, self.trend_tv = self._tree(nb, (('month', 'Month', 100), ('n', 'Inspections', 90), ('avg', 'Average (0-3)', 100), ('delta', 'Change', 90)))
+        nb.add(f, text='Monthly trend')
+
+    def load(self):
+        if np is None:
+            return
+        self._runner.submit(_summaries, on_done=self._render, indicator=self._busy,
+                            error_message='Could not load inspection analytics (see terminal).')
+
+    def _render(self, result):
+        count, items, sections, weakest, trend = result
+        self.status_var.set(f'{count} itemized inspections')
+        fill_tree(self.items_tv, items, key=lambda r: r[0], values=lambda r: (r[0], f'{r[1]:.2f}', r[2]))
+        fill_tree(self.sections_tv, sections, key=lambda r: r[0], values=lambda r: (r[0], f'{r[1]:.2f}', r[2]))
+        fill_tree(self.weakest_tv, weakest, key=lambda r: r[0],
+                  values=lambda r: (r[1], r[2], '; '.join(f'{name} ({avg:.1f})' for name, avg in r[3])))
+        # newest month first
+        fill_tree(self.trend_tv, list(reversed(trend)), key=lambda r: f'{r[0]}-{r[1]:02d}',
+                  values=lambda r: (f'{r[0]}-{r[1]:02d}', r[2], f'{r[3]:.2f}',
+                                    '' if math.isnan(r[4]) else f'{r[4]:+.2f}'))
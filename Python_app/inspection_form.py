@@ -26,7 +26,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkfont
 import datetime
-import mysql.connector
 import traceback
 import logging
 import sys
@@ -38,36 +37,86 @@ except Exception:
     def apply_accent(_btn):
         return
 
-# --- DB config (same as other scripts) ------------------------------------
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
+# --- DB helper (shared connection pool, same DB as other scripts) ---------
+from db import checkout_connection
+from lookups import ensure_inspection_item, invalidate as invalidate_lookups
+from tasks import get_runner, LoadingIndicator
+from autofill import get_autofill
+from inspection_totals import compute_rating, store_totals, FORM_MAX_SCORE, INSPECTION_SECTIONS
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
 
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Exception as e:
-        logging.exception('DB connection failed')
-        messagebox.showerror('Database Error', f'Could not connect to database:\n{e}')
-        return None
-
+# --- Data access (runs on worker threads via tasks.TaskRunner) -------------
+def fetch_existing_inspection(capid, date_text):
+    """Look up the inspection for a CAP ID on a date.
 
-# --- Rating helpers -------------------------------------------------------
-def compute_rating(total, max_total=60):
-    if total >= 45:
-        return 'Excellent'
-    if total >= 30:
-        return 'Meets Standard'
-    if total >= 16:
-        return 'Needs Improvement'
-    return 'Unacceptable'
+    Returns None if the cadet doesn't exist, otherwise a tuple
+    (inspection_id or None, notes, aggregate score row or None, cadet name row).
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT cadet_id, first_name, last_name FROM cadet WHERE cap_id = %s', (capid,))
+        cadet_row = cur.fetchone()
+        if not cadet_row:
+            return None
+        cadet_id = cadet_row[0]
+        # find an existing inspection for this cadet on the given date
+        cur.execute('SELECT inspection_id, notes FROM uniform_inspection WHERE cadet_cadet_id = %s AND inspection_date = %s', (cadet_id, date_text))
+        insp = cur.fetchone()
+        if not insp:
+            return None, None, None, cadet_row[1:]
+        # load aggregate score if present
+        cur.execute('SELECT u.score, u.comments, u.inspection_item_item_id FROM uniform_inspection_score u WHERE u.uniform_inspection_inspection_id = %s', (insp[0],))
+        score_row = cur.fetchone()
+        # drain any further score rows so the pooled connection is clean
+        cur.fetchall()
+        return insp[0], insp[1], score_row, cadet_row[1:]
+    finally:
+        conn.close()
+
+
+def save_inspection(capid, inspection_id, inspection_date, notes, total, comments_combined):
+    """Insert a new inspection (inspection_id None) or replace the aggregate score of an existing one.
+
+    Returns (inspection_id, cadet_id), or None if no cadet has this CAP ID.
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT cadet_id, first_name, last_name FROM cadet WHERE cap_id = %s', (capid,))
+        cadet_row = cur.fetchone()
+        if not cadet_row:
+            return None
+        cadet_id = cadet_row[0]
+
+        # ensure an 'Aggregate' inspection_item exists to record the aggregate score
+        agg_item_id = ensure_inspection_item(cur, 'Aggregate', 'Aggregate score for inspection form')
+
+        if inspection_id:
+            # update existing inspection header and replace aggregate score
+            cur.execute('UPDATE uniform_inspection SET inspection_date=%s, notes=%s WHERE inspection_id = %s', (inspection_date, notes, inspection_id))
+            # delete existing aggregate scores for this inspection and insert new aggregate
+            cur.execute('DELETE FROM uniform_inspection_score WHERE uniform_inspection_inspection_id = %s', (inspection_id,))
+        else:
+            # insert new inspection header
+            cur.execute('INSERT INTO uniform_inspection (inspection_date, notes, cadet_cadet_id) VALUES (%s,%s,%s)',
+                        (inspection_date, notes, cadet_id))
+            inspection_id = cur.lastrowid
+        cur.execute('INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s,%s,%s,%s)',
+                    (total, comments_combined, agg_item_id, inspection_id))
+        store_totals(cur, inspection_id, total, FORM_MAX_SCORE)
+        conn.commit()
+        return inspection_id, cadet_id
+    except Exception:
+        conn.rollback()
+        # the Aggregate item may have been inserted in this rolled-back transaction
+        invalidate_lookups('inspection_item')
+        raise
+    finally:
+        conn.close()
 
 
 # --- The form -------------------------------------------------------------
@@ -80,6 +129,7 @@ class InspectionForm(ttk.Frame):
         self.header_font = tkfont.Font(size=14, weight='bold')
         # used to avoid recursive trace callbacks when we programmatically set vars
         self._suppress_traces = False
+        self._runner = get_runner(self)
         self._build_ui()
         # current loaded inspection id (if any) for editing instead of inserting
         self._current_inspection_id = None
@@ -182,12 +232,12 @@ class InspectionForm(ttk.Frame):
         # Define sections and items
         self.inputs = []
 
-        personal_items = ['Haircut', 'Cleanliness', 'Shave/Cosmetics']
-        garments_items = ['Cleanliness', 'Press/Ironing', 'No loose strings/frays', 'Shirt tucked properly',
-                          'Proper sizing/fit', 'No unauthorized bracelets', 'Sleeves rolled properly (cuff visible)', 'Undershirt correct (color/cut)']
-        accouterments_items = ['Patches', 'Insignia', 'Ribbons/order', 'Gig line']
-        footwear_items = ['Boot blousing', 'Shine / Cleanliness']
-        military_items = ['Posture', 'Hands at seam', 'Focus / Bearing']
+        sections = dict(INSPECTION_SECTIONS)
+        personal_items = sections['Personal Appearance']
+        garments_items = sections['Garments']
+        accouterments_items = sections['Accouterments']
+        footwear_items = sections['Footwear']
+        military_items = sections['Military Bearing']
 
         # Personal Appearance
         for s, c in make_section('Personal Appearance', personal_items):
@@ -245,6 +295,9 @@ class InspectionForm(ttk.Frame):
         clear_btn = ttk.Button(btn_frame, text='Clear', command=self.clear_form)
         clear_btn.grid(row=0, column=2, padx=6)
 
+        self._busy = LoadingIndicator(btn_frame)
+        self._busy.grid(row=0, column=3, padx=6)
+
         self.status_var = tk.StringVar()
         status = ttk.Label(self, textvariable=self.status_var, relief='sunken', anchor='w')
         status.grid(row=row_idx+1, column=0, columnspan=4, sticky='ew', pady=(8,0), ipady=4)
@@ -297,19 +350,6 @@ class InspectionForm(ttk.Frame):
                 return
             capid = int(capid_text)
 
-            # find cadet id
-            conn = get_connection()
-            if not conn:
-                return
-            cur = conn.cursor()
-            cur.execute('SELECT cadet_id, first_name, last_name FROM cadet WHERE cap_id = %s', (capid,))
-            cadet_row = cur.fetchone()
-            if not cadet_row:
-                messagebox.showerror('Not found', f'No cadet found with CAP ID {capid}.')
-                conn.close()
-                return
-            cadet_id = cadet_row[0]
-
             total = int(self.total_var.get())
             rating = self.rating_var.get() or compute_rating(total)
             inspector_capid = int(self.inspector_var.get()) if self.inspector_var.get().strip().isdigit() else None
@@ -317,10 +357,6 @@ class InspectionForm(ttk.Frame):
             # combine comments
             comments_parts = []
             for section, control, comment in self.inputs:
-                try:
-                    v = control.get()
-                except Exception:
-                    v = '0'
                 c = comment.get().strip()
                 if c:
                     comments_parts.append(f'{section} - {c}')
@@ -328,54 +364,31 @@ class InspectionForm(ttk.Frame):
             if overall_comments:
                 comments_parts.append('Overall: ' + overall_comments)
             comments_combined = ' | '.join(comments_parts)[:255]
-
-            try:
-                notes = f"Inspector: {inspector_capid or 'N/A'}; Rating: {rating}; Comments: {comments_combined}"
-
-                # ensure an 'Aggregate' inspection_item exists to record the aggregate score
-                cur.execute('SELECT item_id FROM inspection_item WHERE item_name = %s', ('Aggregate',))
-                item_row = cur.fetchone()
-                if item_row:
-                    agg_item_id = item_row[0]
-                else:
-                    cur.execute('INSERT INTO inspection_item (item_name, description) VALUES (%s,%s)', ('Aggregate', 'Aggregate score for inspection form'))
-                    agg_item_id = cur.lastrowid
-
-                if self._current_inspection_id:
-                    # update existing inspection header and replace aggregate score
-                    inspection_id = self._current_inspection_id
-                    cur.execute('UPDATE uniform_inspection SET inspection_date=%s, notes=%s WHERE inspection_id = %s', (inspection_date, notes, inspection_id))
-                    # delete existing aggregate scores for this inspection and insert new aggregate
-                    cur.execute('DELETE FROM uniform_inspection_score WHERE uniform_inspection_inspection_id = %s', (inspection_id,))
-                    cur.execute('INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s,%s,%s,%s)',
-                                (total, comments_combined, agg_item_id, inspection_id))
-                    conn.commit()
-                    messagebox.showinfo('Updated', f'Inspection updated (id {inspection_id}).')
-                    self.status_var.set(f'Updated inspection id {inspection_id} for cadet id {cadet_id}')
-                    # after update, clear loaded inspection to avoid accidental double-updates
-                    self._current_inspection_id = None
-                    self.clear_form()
-                else:
-                    # insert new inspection and aggregate score
-                    cur.execute('INSERT INTO uniform_inspection (inspection_date, notes, cadet_cadet_id) VALUES (%s,%s,%s)',
-                                (inspection_date, notes, cadet_id))
-                    inspection_id = cur.lastrowid
-                    cur.execute('INSERT INTO uniform_inspection_score (score, comments, inspection_item_item_id, uniform_inspection_inspection_id) VALUES (%s,%s,%s,%s)',
-                                (total, comments_combined, agg_item_id, inspection_id))
-                    conn.commit()
-                    messagebox.showinfo('Success', f'Inspection saved (id {inspection_id}).')
-                    self.status_var.set(f'Saved inspection id {inspection_id} for cadet id {cadet_id}')
-                    self.clear_form()
-            except Exception:
-                conn.rollback()
-                logging.exception('Error saving inspection')
-                messagebox.showerror('Database Error', 'Failed to save inspection (see terminal).')
-            finally:
-                conn.close()
-
+            notes = f"Inspector: {inspector_capid or 'N/A'}; Rating: {rating}; Comments: {comments_combined}"
+            updating = bool(self._current_inspection_id)
         except Exception:
             logging.exception('Unexpected error on submit')
             messagebox.showerror('Error', 'Unexpected error (see terminal).')
+            return
+
+        def saved(result):
+            if result is None:
+                messagebox.showerror('Not found', f'No cadet found with CAP ID {capid}.')
+                return
+            inspection_id, cadet_id = result
+            if updating:
+                messagebox.showinfo('Updated', f'Inspection updated (id {inspection_id}).')
+                self.status_var.set(f'Updated inspection id {inspection_id} for cadet id {cadet_id}')
+                # after update, clear loaded inspection to avoid accidental double-updates
+                self._current_inspection_id = None
+            else:
+                messagebox.showinfo('Success', f'Inspection saved (id {inspection_id}).')
+                self.status_var.set(f'Saved inspection id {inspection_id} for cadet id {cadet_id}')
+            self.clear_form()
+
+        self._runner.submit(save_inspection, capid, self._current_inspection_id, inspection_date, notes, total, comments_combined,
+                            on_done=saved, indicator=self._busy, error_title='Database Error',
+                            error_message='Failed to save inspection (see terminal).')
 
     # --- autofill helpers -------------------------------------------------
     def _on_capid_change(self):
@@ -384,32 +397,28 @@ class InspectionForm(ttk.Frame):
         val = self.capid_var.get().strip()
         if not val or not val.isdigit():
             return
-        capid = int(val)
-        conn = get_connection()
-        if not conn:
+        get_autofill(self).lookup_capid((id(self), 'capid'), val, lambda row: self._on_capid_found(val, row),
+                                        indicator=self._busy)
+
+    def _on_capid_found(self, val, row):
+        # ignore answers for a CAP ID the user has already typed past
+        if self.capid_var.get().strip() != val:
             return
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT first_name, last_name FROM cadet WHERE cap_id = %s', (capid,))
-            row = cur.fetchone()
-            if row:
-                # prevent trace recursion while setting name
-                try:
-                    self._suppress_traces = True
-                    fname, lname = row[0] or '', row[1] or ''
-                    name = (fname + ' ' + lname).strip()
-                    self.name_var.set(name)
-                finally:
-                    self._suppress_traces = False
-            # after filling name, attempt to load an existing inspection if date present
+        if row:
+            # prevent trace recursion while setting name
             try:
-                self.load_existing_inspection_if_any()
-            except Exception:
-                logging.exception('Error attempting to load existing inspection after capid lookup')
+                self._suppress_traces = True
+                # roster row: (cadet_id, cap_id, first_name, last_name)
+                fname, lname = row[2] or '', row[3] or ''
+                name = (fname + ' ' + lname).strip()
+                self.name_var.set(name)
+            finally:
+                self._suppress_traces = False
+        # after filling name, attempt to load an existing inspection if date present
+        try:
+            self.load_existing_inspection_if_any()
         except Exception:
-            logging.exception('Error looking up cadet by capid')
-        finally:
-            conn.close()
+            logging.exception('Error attempting to load existing inspection after capid lookup')
 
     def _on_name_change(self):
         if getattr(self, '_suppress_traces', False):
@@ -423,32 +432,24 @@ class InspectionForm(ttk.Frame):
             return
         fname = parts[0]
         lname = parts[-1] if len(parts) > 1 else ''
-        conn = get_connection()
-        if not conn:
+        get_autofill(self).lookup_name((id(self), 'name'), fname, lname, lambda row: self._on_name_found(name, row),
+                                       indicator=self._busy)
+
+    def _on_name_found(self, name, row):
+        if self.name_var.get().strip() != name:
             return
-        try:
-            cur = conn.cursor()
-            # look for matching cadet by first and last name (case-insensitive)
-            cur.execute('SELECT cap_id FROM cadet WHERE LOWER(first_name) = LOWER(%s) AND LOWER(last_name) = LOWER(%s) LIMIT 1', (fname, lname))
-            row = cur.fetchone()
-            if row:
-                try:
-                    self._suppress_traces = True
-                    self.capid_var.set(str(row[0]))
-                finally:
-                    self._suppress_traces = False
-            # after filling capid, try to load existing inspection for the date
+        capid = row[1] if row else None
+        if capid is not None:
             try:
-                self.load_existing_inspection_if_any()
-            except Exception:
-                logging.exception('Error attempting to load existing inspection after name lookup')
+                self._suppress_traces = True
+                self.capid_var.set(str(capid))
+            finally:
+                self._suppress_traces = False
+        # after filling capid, try to load existing inspection for the date
+        try:
+            self.load_existing_inspection_if_any()
         except Exception:
-            logging.exception('Error looking up cadet by name')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            logging.exception('Error attempting to load existing inspection after name lookup')
 
     def _on_date_change(self):
         # when date changes, try to load existing inspection for the current capid+date
@@ -468,73 +469,57 @@ class InspectionForm(ttk.Frame):
         date_text = self.date_var.get().strip()
         if not capid_text or not capid_text.isdigit() or not date_text:
             return
+        capid = int(capid_text)
+        self._runner.submit(fetch_existing_inspection, capid, date_text,
+                            on_done=lambda res: self._apply_existing_inspection(capid_text, date_text, res),
+                            indicator=self._busy, on_error=lambda e: logging.error('Error loading existing inspection: %s', e))
+
+    def _apply_existing_inspection(self, capid_text, date_text, result):
+        # the form moved on to another cadet/date while the lookup ran
+        if self.capid_var.get().strip() != capid_text or self.date_var.get().strip() != date_text:
+            return
+        if result is None:
+            return
+        insp_id, notes, score_row, name_row = result
+        if not insp_id:
+            # no matching inspection; clear current inspection id
+            self._current_inspection_id = None
+            return
+        # populate fields from DB
         try:
-            # normalize date string to YYYY-MM-DD, but allow same string comparison
-            # Attempt to find cadet first
-            capid = int(capid_text)
-            conn = get_connection()
-            if not conn:
-                return
-            cur = conn.cursor()
-            cur.execute('SELECT cadet_id FROM cadet WHERE cap_id = %s', (capid,))
-            cadet_row = cur.fetchone()
-            if not cadet_row:
-                return
-            cadet_id = cadet_row[0]
-            # find an existing inspection for this cadet on the given date
-            cur.execute('SELECT inspection_id, notes FROM uniform_inspection WHERE cadet_cadet_id = %s AND inspection_date = %s', (cadet_id, date_text))
-            insp = cur.fetchone()
-            if not insp:
-                # no matching inspection; clear current inspection id
-                self._current_inspection_id = None
-                return
-            insp_id, notes = insp[0], insp[1]
-            # load aggregate score if present
-            cur.execute('SELECT u.score, u.comments, u.inspection_item_item_id FROM uniform_inspection_score u WHERE u.uniform_inspection_inspection_id = %s', (insp_id,))
-            score_row = cur.fetchone()
-            # populate fields from DB
-            try:
-                self._suppress_traces = True
-                # Fill capid and name (name lookup will be suppressed)
-                self.capid_var.set(str(capid))
-                cur.execute('SELECT first_name, last_name FROM cadet WHERE cadet_id = %s', (cadet_id,))
-                c = cur.fetchone()
-                if c:
-                    self.name_var.set(((c[0] or '') + ' ' + (c[1] or '')).strip())
-                # fill notes into overall_comments and inspector if possible
-                if notes:
-                    # attempt to parse Inspector: <capid> from notes
-                    try:
-                        if 'Inspector:' in notes:
-                            # crude parse
-                            part = notes.split('Inspector:')[1].split(';')[0].strip()
-                            if part and part.isdigit():
-                                self.inspector_var.set(part)
-                    except Exception:
-                        pass
-                if score_row:
-                    try:
-                        score_val = int(score_row[0]) if score_row[0] is not None else 0
-                        comments = score_row[1] or ''
-                        # set aggregate into overall comments and set total/rating
-                        self.overall_comments.delete(0, 'end')
-                        self.overall_comments.insert(0, comments)
-                        self.total_var.set(str(score_val))
-                        self.rating_var.set(compute_rating(score_val))
-                    except Exception:
-                        logging.exception('Error parsing score row')
-                # leave individual item controls as default (since we only store aggregate)
-                self._current_inspection_id = insp_id
-                self.status_var.set(f'Loaded existing inspection id {insp_id} for editing')
-            finally:
-                self._suppress_traces = False
+            self._suppress_traces = True
+            # Fill name (name lookup will be suppressed)
+            if name_row:
+                self.name_var.set(((name_row[0] or '') + ' ' + (name_row[1] or '')).strip())
+            # fill notes into overall_comments and inspector if possible
+            if notes:
+                # attempt to parse Inspector: <capid> from notes
+                try:
+                    if 'Inspector:' in notes:
+                        # crude parse
+                        part = notes.split('Inspector:')[1].split(';')[0].strip()
+                        if part and part.isdigit():
+                            self.inspector_var.set(part)
+                except Exception:
+                    pass
+            if score_row:
+                try:
+                    score_val = int(score_row[0]) if score_row[0] is not None else 0
+                    comments = score_row[1] or ''
+                    # set aggregate into overall comments and set total/rating
+                    self.overall_comments.delete(0, 'end')
+                    self.overall_comments.insert(0, comments)
+                    self.total_var.set(str(score_val))
+                    self.rating_var.set(compute_rating(score_val))
+                except Exception:
+                    logging.exception('Error parsing score row')
+            # leave individual item controls as default (since we only store aggregate)
+            self._current_inspection_id = insp_id
+            self.status_var.set(f'Loaded existing inspection id {insp_id} for editing')
         except Exception:
             logging.exception('Error loading existing inspection')
         finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            self._suppress_traces = False
 
 
 def main():
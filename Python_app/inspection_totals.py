@@ -0,0 +1,167 @@
+"""
+Stored inspection totals and ratings.
+
+Inspection lists used to compute COALESCE(SUM(score), 0) ... GROUP BY inspection_id over
+uniform_inspection_score for every row on every cadet click, and never showed a rating.
+Migration 0004 adds total_score, max_score and rating to uniform_inspection. The save paths
+(inspection_form.save_inspection and dashboard.save_inspection_detail) write them with
+store_totals() in the same transaction as the scores, so a history read is a range scan of
+idx_uniform_inspection_cadet_date with no join.
+
+Rows saved before the migration are filled by the backfill job:
+
+  python inspection_totals.py --backfill        rows whose totals are still NULL
+  python inspection_totals.py --backfill --all  recompute every row (e.g. after a rating change)
+
+Until the migration has run, store_totals() does nothing and readers fall back to summing the
+scores (totals_available()).
+
+Requires: mysql-connector-python
+"""
+
+import argparse
+import logging
+import sys
+
+from db import checkout_connection
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+# the inspection sheet: (section, items), in form order. Item names are the inspection_item
+# names the scores are stored under ('Cleanliness' appears twice and is one item).
+INSPECTION_SECTIONS = (
+    ('Personal Appearance', ('Haircut', 'Cleanliness', 'Shave/Cosmetics')),
+    ('Garments', ('Cleanliness', 'Press/Ironing', 'No loose strings/frays', 'Shirt tucked properly',
+                  'Proper sizing/fit', 'No unauthorized bracelets', 'Sleeves rolled properly (cuff visible)',
+                  'Undershirt correct (color/cut)')),
+    ('Accouterments', ('Patches', 'Insignia', 'Ribbons/order', 'Gig line')),
+    ('Footwear', ('Boot blousing', 'Shine / Cleanliness')),
+    ('Military Bearing', ('Posture', 'Hands at seam', 'Focus / Bearing')),
+)
+
+# each inspection item is scored 0-3
+ITEM_MAX_SCORE = 3
+# the Inspections tab form has 20 items and stores one Aggregate row
+FORM_MAX_SCORE = 60
+AGGREGATE_ITEM = 'Aggregate'
+# inspections per backfill transaction
+BACKFILL_BATCH = 1000
+
+
+def compute_rating(total, max_total=FORM_MAX_SCORE):
+    """Rating for `total` out of `max_total`. The bands are set on the 60-point form
+    (45 / 30 / 16) and scaled for sheets with fewer items."""
+    if max_total and max_total != FORM_MAX_SCORE:
+        total = total * FORM_MAX_SCORE / max_total
+    if total >= 45:
+        return 'Excellent'
+    if total >= 30:
+        return 'Meets Standard'
+    if total >= 16:
+        return 'Needs Improvement'
+    return 'Unacceptable'
+
+
+_available = None
+
+
+def totals_available(cur):
+    """True once uniform_inspection has the stored total columns (checked once per process)."""
+    global _available
+    if _available is None:
+        cur.execute("SELECT COUNT(*) FROM information_schema.columns "
+                    "WHERE table_schema = DATABASE() AND table_name = 'uniform_inspection' AND column_name = 'rating'")
+        _available = bool(cur.fetchone()[0])
+    return _available
+
+
+def store_totals(cur, insp_id, total, max_score):
+    """Write total, max and rating for one inspection on the caller's cursor and transaction."""
+    if not totals_available(cur):
+        return
+    cur.execute('UPDATE uniform_inspection SET total_score = %s, max_score = %s, rating = %s WHERE inspection_id = %s',
+                (total, max_score, compute_rating(total, max_score), insp_id))
+
+
+def history_sql(cur):
+    """SELECT for (inspection_id, date, total_score, rating, notes) of one cadet, newest first."""
+    if totals_available(cur):
+        # rows the backfill has not reached yet still show their summed score
+        return '''
+            SELECT ui.inspection_id, ui.inspection_date,
+                   COALESCE(ui.total_score, (SELECT COALESCE(SUM(u.score),0) FROM uniform_inspection_score u
+                                             WHERE u.uniform_inspection_inspection_id = ui.inspection_id)) AS total_score,
+                   COALESCE(ui.rating, '') AS rating, ui.notes
+            FROM uniform_inspection ui
+            WHERE ui.cadet_cadet_id = %s
+            ORDER BY ui.inspection_date DESC
+        '''
+    return '''
+        SELECT ui.inspection_id, ui.inspection_date, COALESCE(SUM(u.score),0) AS total_score, '' AS rating, ui.notes
+        FROM uniform_inspection ui
+        LEFT JOIN uniform_inspection_score u ON ui.inspection_id = u.uniform_inspection_inspection_id
+        WHERE ui.cadet_cadet_id = %s
+        GROUP BY ui.inspection_id
+        ORDER BY ui.inspection_date DESC
+    '''
+
+
+def backfill(recompute_all=False, batch=BACKFILL_BATCH):
+    """Fill total_score/max_score/rating from the score rows. Returns the number of rows written.
+
+    Inspections are walked in inspection_id order, `batch` per transaction. An inspection
+    holding only the Aggregate row is out of FORM_MAX_SCORE; otherwise each scored item counts
+    ITEM_MAX_SCORE.
+    """
+    conn = checkout_connection()
+    written = 0
+    last_id = 0
+    try:
+        cur = conn.cursor()
+        if not totals_available(cur):
+            raise RuntimeError('uniform_inspection has no total columns; run python migrate.py first')
+        only_missing = '' if recompute_all else 'AND ui.total_score IS NULL '
+        while True:
+            cur.execute(f'''
+                SELECT ui.inspection_id, COALESCE(SUM(u.score),0), COUNT(u.score_id),
+                       COALESCE(SUM(i.item_name = %s), 0)
+                FROM uniform_inspection ui
+                LEFT JOIN uniform_inspection_score u ON u.uniform_inspection_inspection_id = ui.inspection_id
+                LEFT JOIN inspection_item i ON i.item_id = u.inspection_item_item_id
+                WHERE ui.inspection_id > %s {only_missing}
+                GROUP BY ui.inspection_id
+                ORDER BY ui.inspection_id
+                LIMIT %s
+            ''', (AGGREGATE_ITEM, last_id, batch))
+            rows = cur.fetchall()
+            if not rows:
+                break
+            updates = []
+            for insp_id, total, items, aggregates in rows:
+                total = int(total)
+                max_score = FORM_MAX_SCORE if aggregates or not items else int(items) * ITEM_MAX_SCORE
+                updates.append((total, max_score, compute_rating(total, max_score), insp_id))
+            cur.executemany('UPDATE uniform_inspection SET total_score = %s, max_score = %s, rating = %s WHERE inspection_id = %s', updates)
+            conn.commit()
+            written += len(updates)
+            last_id = rows[-1][0]
+            logging.info('Backfilled %d inspections (through id %s)', written, last_id)
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fill stored inspection totals and ratings.')
+    parser.add_argument('--backfill', action='store_true', required=True, help='fill totals from the score rows')
+    parser.add_argument('--all', action='store_true', help='recompute every inspection, not only unfilled ones')
+    args = parser.parse_args(argv)
+    logging.info('Done: %d inspections updated', backfill(recompute_all=args.all))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Process-wide cache of the small lookup tables: rank, position, inspection_item and requirement.
+
+These tables change rarely but were re-queried by every form (fetch_ranks() alone existed in
+four modules) and the inspection save paths looked up inspection_item by name once per item.
+Each table is loaded once into an id -> row dict and a name -> id dict, so lookups are O(1)
+dict hits after the first load.
+
+Freshness:
+  - writers call invalidate('position') / invalidate('requirement', ...) after committing, so
+    the next read reloads (manage_positions.py and add_requirements.py do this);
+  - otherwise an entry expires after CADET_LOOKUP_TTL seconds (default 600) to pick up
+    changes made outside the app.
+
+Loads use db.checkout_connection() and raise on DB errors, so call the accessors from
+tasks.TaskRunner worker functions (or pass an open cursor when already inside one).
+"""
+
+import logging
+import os
+import threading
+import time
+
+from db import checkout_connection
+
+LOOKUP_TTL = float(os.environ.get('CADET_LOOKUP_TTL', 600))
+
+
+class LookupTable:
+    """One cached table. Rows keep the column order of `sql`; column 0 is the id and
+    column `name_col` the display name."""
+
+    def __init__(self, key, sql, name_col=1, ttl=None):
+        self.key = key
+        self.sql = sql
+        self.name_col = name_col
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rows = None
+        self._by_id = {}
+        self._by_name = {}
+        self._loaded_at = 0.0
+
+    def _fresh(self):
+        ttl = LOOKUP_TTL if self.ttl is None else self.ttl
+        return self._rows is not None and (time.monotonic() - self._loaded_at) < ttl
+
+    def _ensure(self, cur=None):
+        if self._fresh():
+            return
+        with self._lock:
+            if self._fresh():
+                return
+            if cur is not None:
+                cur.execute(self.sql)
+                rows = cur.fetchall()
+            else:
+                conn = checkout_connection()
+                try:
+                    c = conn.cursor()
+                    c.execute(self.sql)
+                    rows = c.fetchall()
+                finally:
+                    conn.close()
+            self._set_rows(rows)
+            logging.debug('Loaded %d %s lookup rows', len(rows), self.key)
+
+    def _set_rows(self, rows):
+        self._rows = list(rows)
+        self._by_id = {r[0]: r for r in self._rows}
+        # first row wins if names are duplicated (schema doesn't enforce uniqueness everywhere)
+        by_name = {}
+        for r in self._rows:
+            by_name.setdefault(r[self.name_col], r[0])
+        self._by_name = by_name
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = None
+
+    # ---- accessors (load on first use) ----
+    def rows(self, cur=None):
+        self._ensure(cur)
+        return list(self._rows)
+
+    def get(self, row_id, cur=None):
+        self._ensure(cur)
+        return self._by_id.get(row_id)
+
+    def id_for(self, name, cur=None):
+        self._ensure(cur)
+        return self._by_name.get(name)
+
+    def name_for(self, row_id, cur=None):
+        row = self.get(row_id, cur)
+        return row[self.name_col] if row else None
+
+    def remember(self, row):
+        """Add a row we just inserted ourselves, so the cache stays valid without a reload."""
+        with self._lock:
+            if self._rows is None:
+                return
+            self._rows.append(row)
+            self._by_id[row[0]] = row
+            self._by_name.setdefault(row[self.name_col], row[0])
+
+
+RANKS = LookupTable('rank', 'SELECT rank_id, rank_name, rank_order FROM `rank` ORDER BY rank_order ASC')
+POSITIONS = LookupTable('position', 'SELECT position_id, position_name, line, level FROM `position` ORDER BY position_id')
+INSPECTION_ITEMS = LookupTable('inspection_item', 'SELECT item_id, item_name, description FROM inspection_item ORDER BY item_id')
+REQUIREMENTS = LookupTable('requirement', 'SELECT requirement_id, requirement_name, description FROM requirement ORDER BY requirement_id')
+
+_TABLES = {t.key: t for t in (RANKS, POSITIONS, INSPECTION_ITEMS, REQUIREMENTS)}
+
+
+def invalidate(*keys):
+    """Drop cached tables by name ('rank', 'position', 'inspection_item', 'requirement'); all if none given."""
+    for key in keys or _TABLES:
+        _TABLES[key].invalidate()
+
+
+def ensure_inspection_item(cur, name, description=None):
+    """Return the item_id for `name`, inserting the inspection_item row if needed.
+
+    Runs on the caller's cursor so the insert joins the caller's transaction.
+    """
+    item_id = INSPECTION_ITEMS.id_for(name, cur)
+    if item_id:
+        return item_id
+    cur.execute('INSERT INTO inspection_item (item_name, description) VALUES (%s, %s)', (name, description if description is not None else name))
+    item_id = cur.lastrowid
+    INSPECTION_ITEMS.remember((item_id, name, description))
+    return item_id
+
+
+def ensure_inspection_items(cur, names):
+    """Return {name: item_id} for every name, inserting any missing inspection_item rows.
+
+    Known names come from the cache; the missing ones are inserted in one executemany batch
+    and read back with a single query. Runs on the caller's cursor and transaction.
+    """
+    ids = {}
+    missing = []
+    for name in names:
+        item_id = INSPECTION_ITEMS.id_for(name, cur)
+        if item_id:
+            ids[name] = item_id
+        elif name not in missing:
+            missing.append(name)
+    if missing:
+        cur.executemany('INSERT INTO inspection_item (item_name, description) VALUES (%s, %s)', [(n, n) for n in missing])
+        cur.execute('SELECT item_id, item_name, description FROM inspection_item WHERE item_name IN (%s)'
+                    % ', '.join(['%s'] * len(missing)), tuple(missing))
+        for row in cur.fetchall():
+            if row[1] not in ids:
+                ids[row[1]] = row[0]
+                INSPECTION_ITEMS.remember(row)
+    return ids
@@ -1,3 +1,8 @@
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 try:
@@ -8,17 +13,50 @@ except Exception:
         return
     def enable_alt_row_colors(_tv):
         return
+import datetime
 import logging
+import os
 from importlib import import_module
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
+# connection settings and the shared pool live in db.py; it is first imported by whichever
+# tab is built first, so nothing touches mysql.connector before the window is up
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+from dbtrace import DBActivityPanel, set_ui_action, describe_widget, STATS as DB_STATS
+from warmup import warm_up, PHASES as WARMUP_PHASES
+
+# warn when the window takes longer than this to become interactive
+STARTUP_BUDGET_MS = float(os.environ.get('CADET_STARTUP_BUDGET_MS', 1500))
+# longest the splash waits for the warm-up before showing the window anyway (it keeps running)
+WARMUP_TIMEOUT_MS = int(os.environ.get('CADET_WARMUP_TIMEOUT_MS', 5000))
+# the Reports list fetches the next page once the view is scrolled this close to the bottom
+REPORTS_SCROLL_EDGE = 0.1
+
+
+class SplashScreen(tk.Toplevel):
+    """Borderless startup window with a progress bar fed by the warm-up."""
+
+    def __init__(self, master, steps):
+        super().__init__(master)
+        self.overrideredirect(True)
+        frm = ttk.Frame(self, padding=20)
+        frm.pack(fill='both', expand=True)
+        ttk.Label(frm, text='CAP Cadet Tracker', font=('TkDefaultFont', 14, 'bold')).pack(anchor='w')
+        self.status_var = tk.StringVar(value='Starting...')
+        ttk.Label(frm, textvariable=self.status_var).pack(anchor='w', pady=(8,4))
+        self.bar = ttk.Progressbar(frm, length=320, mode='determinate', maximum=steps)
+        self.bar.pack(fill='x')
+        self.update_idletasks()
+        w, h = self.winfo_reqwidth(), self.winfo_reqheight()
+        x = (self.winfo_screenwidth() - w) // 2
+        y = (self.winfo_screenheight() - h) // 3
+        self.geometry(f'+{x}+{y}')
+
+    def show(self, text, step):
+        self.status_var.set(text)
+        self.bar.configure(value=step)
 
 # Map module names to filenames (assumes all scripts are in the same folder)
 MODULES = {
@@ -29,10 +67,16 @@ MODULES = {
     'reports': 'reports',
     'manage_positions': 'manage_positions',
     'add_requirements': 'add_requirements',
+    'promotions': 'promotions',
+    'inspection_analytics': 'inspection_analytics',
+    'pt_scores': 'pt_scores',
+    'attendance': 'attendance',
 }
 
 class MainApp(tk.Tk):
     def __init__(self):
+        # module imports ran before this point
+        imports_ms = (time.perf_counter() - _PROCESS_START) * 1000.0
         super().__init__()
         self.title('CAP Cadet Tracker - Unified')
         self.geometry('1100x750')
@@ -40,6 +84,9 @@ class MainApp(tk.Tk):
             self.iconbitmap('my_icon.ico')
         except Exception:
             pass
+        # per-phase startup timings for _report_startup
+        self._startup_phases = {'imports': imports_ms}
+        t0 = time.perf_counter()
         # Apply Windows 11-like theming (sv-ttk) if available
         if ui_setup:
             try:
@@ -52,28 +99,152 @@ class MainApp(tk.Tk):
                 style.theme_use('clam')
             except Exception:
                 pass
+        self._startup_phases['theme'] = (time.perf_counter() - t0) * 1000.0
+        self._start_warmup()
+
+    # ---------------- startup ----------------
+    def _start_warmup(self):
+        """Open the pool and fill the caches in the background behind a splash screen."""
+        self.withdraw()
+        self._splash = SplashScreen(self, len(WARMUP_PHASES))
+        self._warmup_progress = queue.Queue()
+        self._ui_built = False
+        labels = {'connect': 'Connecting to the database...', 'lookups': 'Loading ranks and positions...',
+                  'roster': 'Loading cadets...', 'prime': 'Warming up...', 'done': 'Ready'}
+        get_runner(self).submit(warm_up, lambda phase, i, n: self._warmup_progress.put((labels.get(phase, phase), i)),
+                                on_done=self._on_warmup_done,
+                                on_error=lambda e: self._finish_startup())
+        self._warmup_timeout = self.after(WARMUP_TIMEOUT_MS, self._on_warmup_timeout)
+        self._poll_warmup()
+
+    def _poll_warmup(self):
+        if self._ui_built:
+            return
+        try:
+            while True:
+                text, step = self._warmup_progress.get_nowait()
+                self._splash.show(text, step)
+        except queue.Empty:
+            pass
+        self.after(50, self._poll_warmup)
+
+    def _on_warmup_done(self, timings):
+        self._startup_phases.update(timings)
+        self._finish_startup()
+
+    def _on_warmup_timeout(self):
+        logging.warning('Warm-up still running after %d ms; opening the window anyway', WARMUP_TIMEOUT_MS)
+        self._startup_phases['warm-up (timed out)'] = float(WARMUP_TIMEOUT_MS)
+        self._finish_startup()
+
+    def _finish_startup(self):
+        if self._ui_built:
+            return
+        self._ui_built = True
+        try:
+            self.after_cancel(self._warmup_timeout)
+        except tk.TclError:
+            pass
+        self._splash.destroy()
+        self.deiconify()
+        self._shown_at = time.perf_counter()
         self._build_ui()
+        # runs once the window has been drawn and the first tab built
+        self.after_idle(self._report_startup)
 
     def _build_ui(self):
+        # DB activity strip along the bottom (collapsed until toggled)
+        activity = ttk.Frame(self, padding=(8,2))
+        activity.pack(side='bottom', fill='x')
+        self._activity_btn = ttk.Button(activity, text='DB activity ▸', command=self._toggle_activity)
+        self._activity_btn.pack(anchor='w')
+        self._activity_holder = activity
+        self._activity_panel = None
+
         nb = ttk.Notebook(self)
         nb.pack(fill='both', expand=True)
+        self._nb = nb
+        # tabs are built on first view; only the visible tab touches the database at launch
+        self._tab_builders = {}   # frame path -> (tab name, builder)
+        self._tab_build_ms = {}   # tab name -> build time
+        nb.bind('<<NotebookTabChanged>>', lambda e: self._ensure_tab_built(nb.select()))
+        # attribute DB work to the click or keypress that caused it
+        self.bind_all('<ButtonPress-1>', self._note_ui_action, add='+')
+        self.bind_all('<KeyPress-Return>', self._note_ui_action, add='+')
+        self.bind_all('<KeyRelease>', self._note_ui_action, add='+')
 
         # Dashboard tab
-        self._add_tab(nb, 'Dashboard', 'dashboard', 'Dashboard')
+        self._add_lazy_tab(nb, 'Dashboard', lambda f: self._build_module_tab(f, 'Dashboard', 'dashboard', 'Dashboard'))
         # Add/Edit Cadet tab
-        self._add_tab(nb, 'Add/Edit Cadet', 'add_cadet', 'CadetForm')
+        self._add_lazy_tab(nb, 'Add/Edit Cadet', lambda f: self._build_module_tab(f, 'Add/Edit Cadet', 'add_cadet', 'CadetForm'))
         # Inspection tab
-        self._add_tab(nb, 'Inspections', 'inspection_form', 'InspectionForm')
+        self._add_lazy_tab(nb, 'Inspections', lambda f: self._build_module_tab(f, 'Inspections', 'inspection_form', 'InspectionForm'))
         # Requirements tab (embedded)
-        self._add_requirements_tab(nb)
+        self._add_lazy_tab(nb, 'Requirements', self._build_requirements_tab)
         # Reports manager tab (embedded)
-        self._add_reports_tab(nb)
+        self._add_lazy_tab(nb, 'Reports', self._build_reports_tab)
         # Manage Positions tab (embedded)
-        self._add_positions_tab(nb)
+        self._add_lazy_tab(nb, 'Manage Positions', self._build_positions_tab)
+        # Promotion board tab (embedded)
+        self._add_lazy_tab(nb, 'Promotions', self._build_promotions_tab)
+        # Inspection analytics tab (embedded)
+        self._add_lazy_tab(nb, 'Inspection Analytics', self._build_analytics_tab)
+        # PT test night entry and trends tab (embedded)
+        self._add_lazy_tab(nb, 'PT', self._build_pt_tab)
+        # Event attendance roll call tab (embedded)
+        self._add_lazy_tab(nb, 'Attendance', self._build_attendance_tab)
+        self._ensure_tab_built(nb.select())
 
-    def _add_tab(self, nb, tab_name, module_key, class_name, launch_button=False):
+    def _add_lazy_tab(self, nb, tab_name, builder):
+        """Add an empty tab whose contents builder(frame) creates the first time it is shown."""
         frame = ttk.Frame(nb)
         nb.add(frame, text=tab_name)
+        self._tab_builders[str(frame)] = (tab_name, builder)
+
+    def _ensure_tab_built(self, frame_path):
+        entry = self._tab_builders.pop(str(frame_path), None)
+        if entry is None:
+            return
+        tab_name, builder = entry
+        frame = self.nametowidget(frame_path)
+        t0 = time.perf_counter()
+        builder(frame)
+        self._tab_build_ms[tab_name] = ms = (time.perf_counter() - t0) * 1000.0
+        logging.info('Built %s tab in %.0f ms', tab_name, ms)
+
+    def _report_startup(self):
+        total_ms = (time.perf_counter() - _PROCESS_START) * 1000.0
+        self._startup_phases['first paint'] = (time.perf_counter() - self._shown_at) * 1000.0
+        by_tab, _actions, _recent = DB_STATS.snapshot()
+        statements = sum(t['statements'] for t in by_tab.values())
+        phases = ', '.join(f'{name} {ms:.0f} ms' for name, ms in self._startup_phases.items())
+        built = ', '.join(f'{name} {ms:.0f} ms' for name, ms in self._tab_build_ms.items()) or 'none'
+        level = logging.WARNING if total_ms > STARTUP_BUDGET_MS else logging.INFO
+        logging.log(level, 'Startup: window ready in %.0f ms (budget %.0f ms); phases: %s; tabs built: %s; %d DB statements issued',
+                    total_ms, STARTUP_BUDGET_MS, phases, built, statements)
+
+    def _note_ui_action(self, event):
+        widget = event.widget
+        if isinstance(widget, str):
+            return
+        try:
+            tab = self._nb.tab(self._nb.select(), 'text')
+        except tk.TclError:
+            tab = ''
+        verb = 'type in' if event.type == tk.EventType.KeyRelease else 'click'
+        set_ui_action(tab, f'{verb} {describe_widget(widget)}')
+
+    def _toggle_activity(self):
+        if self._activity_panel is None:
+            self._activity_panel = DBActivityPanel(self._activity_holder)
+            self._activity_panel.pack(fill='x', pady=(4,0))
+            self._activity_btn.configure(text='DB activity ▾')
+        else:
+            self._activity_panel.destroy()
+            self._activity_panel = None
+            self._activity_btn.configure(text='DB activity ▸')
+
+    def _build_module_tab(self, frame, tab_name, module_key, class_name, launch_button=False):
         try:
             mod = import_module(MODULES[module_key])
             if launch_button and module_key == 'add_requirements':
@@ -92,9 +263,7 @@ class MainApp(tk.Tk):
             logging.exception(f'Could not load {module_key}')
             ttk.Label(frame, text=f'{tab_name} module not available').pack()
 
-    def _add_reports_tab(self, nb):
-        reports_frame = ttk.Frame(nb)
-        nb.add(reports_frame, text='Reports')
+    def _build_reports_tab(self, reports_frame):
         try:
             rep_mod = import_module(MODULES['reports'])
             self._build_reports_manager(reports_frame, rep_mod)
@@ -102,9 +271,7 @@ class MainApp(tk.Tk):
             logging.exception('Could not load reports module')
             ttk.Label(reports_frame, text='Reports module not available').pack()
 
-    def _add_positions_tab(self, nb):
-        pos_frame = ttk.Frame(nb)
-        nb.add(pos_frame, text='Manage Positions')
+    def _build_positions_tab(self, pos_frame):
         try:
             pos_mod = import_module(MODULES['manage_positions'])
             FrameCls = getattr(pos_mod, 'PositionManagerFrame', None)
@@ -121,9 +288,39 @@ class MainApp(tk.Tk):
             logging.exception('Could not load positions module')
             ttk.Label(pos_frame, text='Positions module not available').pack()
 
-    def _add_requirements_tab(self, nb):
-        req_frame = ttk.Frame(nb)
-        nb.add(req_frame, text='Requirements')
+    def _build_promotions_tab(self, promo_frame):
+        try:
+            promo_mod = import_module(MODULES['promotions'])
+            promo_mod.PromotionBoardFrame(promo_frame).pack(fill='both', expand=True)
+        except Exception:
+            logging.exception('Could not load promotions module')
+            ttk.Label(promo_frame, text='Promotions module not available').pack()
+
+    def _build_analytics_tab(self, frame):
+        try:
+            mod = import_module(MODULES['inspection_analytics'])
+            mod.InspectionAnalyticsFrame(frame).pack(fill='both', expand=True)
+        except Exception:
+            logging.exception('Could not load inspection analytics module')
+            ttk.Label(frame, text='Inspection analytics module not available').pack()
+
+    def _build_pt_tab(self, frame):
+        try:
+            mod = import_module(MODULES['pt_scores'])
+            mod.PTFrame(frame).pack(fill='both', expand=True)
+        except Exception:
+            logging.exception('Could not load PT module')
+            ttk.Label(frame, text='PT module not available').pack()
+
+    def _build_attendance_tab(self, frame):
+        try:
+            mod = import_module(MODULES['attendance'])
+            mod.AttendanceFrame(frame).pack(fill='both', expand=True)
+        except Exception:
+            logging.exception('Could not load attendance module')
+            ttk.Label(frame, text='Attendance module not available').pack()
+
+    def _build_requirements_tab(self, req_frame):
         try:
             req_mod = import_module(MODULES['add_requirements'])
             FrameCls = getattr(req_mod, 'AddReqFrame', None)
@@ -160,52 +357,190 @@ class MainApp(tk.Tk):
         btn_del = ttk.Button(topf, text='Delete Selected', command=lambda: self._delete_selected_report(rep_mod))
         apply_accent(btn_del)
         btn_del.pack(side='left', padx=6)
+        self._reports_busy = LoadingIndicator(topf)
+        self._reports_busy.pack(side='left', padx=6)
+
+        # filters; they combine, and an empty field means "any"
+        filt = ttk.Frame(frame)
+        filt.pack(fill='x', pady=(8,0))
+        self._rep_cap_var = tk.StringVar()
+        self._rep_type_var = tk.StringVar(value='All')
+        self._rep_status_var = tk.StringVar(value='All')
+        self._rep_from_var = tk.StringVar()
+        self._rep_to_var = tk.StringVar()
+        ttk.Label(filt, text='CAP ID').pack(side='left')
+        ttk.Entry(filt, textvariable=self._rep_cap_var, width=10).pack(side='left', padx=(4,8))
+        ttk.Label(filt, text='Type').pack(side='left')
+        ttk.Combobox(filt, textvariable=self._rep_type_var, values=('All', 'Positive', 'Negative'),
+                     state='readonly', width=9).pack(side='left', padx=(4,8))
+        ttk.Label(filt, text='Status').pack(side='left')
+        ttk.Combobox(filt, textvariable=self._rep_status_var, values=('All', 'Open', 'Resolved'),
+                     state='readonly', width=9).pack(side='left', padx=(4,8))
+        ttk.Label(filt, text='From').pack(side='left')
+        ttk.Entry(filt, textvariable=self._rep_from_var, width=11).pack(side='left', padx=(4,8))
+        ttk.Label(filt, text='To').pack(side='left')
+        ttk.Entry(filt, textvariable=self._rep_to_var, width=11).pack(side='left', padx=(4,8))
+        ttk.Button(filt, text='Apply', command=lambda: self._apply_report_filters(rep_mod)).pack(side='left', padx=4)
+        ttk.Button(filt, text='Clear', command=lambda: self._clear_report_filters(rep_mod)).pack(side='left', padx=4)
+        self._reports_count_var = tk.StringVar()
+        ttk.Label(filt, textvariable=self._reports_count_var).pack(side='right')
+
         cols = ('id', 'cadet_id', 'type', 'title', 'date', 'resolved')
-        self.reports_tv = ttk.Treeview(frame, columns=cols, show='headings', selectmode='browse')
+        tvf = ttk.Frame(frame)
+        tvf.pack(fill='both', expand=True, pady=(8,0))
+        self.reports_tv = ttk.Treeview(tvf, columns=cols, show='headings', selectmode='browse')
+        self._reports_vsb = ttk.Scrollbar(tvf, orient='vertical', command=self.reports_tv.yview)
+        # every scroll passes through _on_reports_scroll, which pages more rows in
+        self.reports_tv.configure(yscrollcommand=lambda f, l: self._on_reports_scroll(f, l, rep_mod))
+        self._reports_vsb.pack(side='right', fill='y')
         self._reports_sort = {'by': 'date', 'order': 'DESC'}
+        self._reports_filter = rep_mod.ReportFilter()
+        # rows loaded so far for the current filter/sort, the cursor of the next page (None at
+        # the end), and a generation number so pages of a superseded query are dropped
+        self._reports_rows = []
+        self._reports_cursor = None
+        self._reports_gen = 0
+        self._reports_paging = False
+        self._reports_total = None
         for c in cols:
             self.reports_tv.heading(c, text=c.title(), command=lambda col=c: self._on_reports_heading_click(col, rep_mod))
-        self.reports_tv.pack(fill='both', expand=True, pady=(8,0))
+        self.reports_tv.pack(side='left', fill='both', expand=True)
         self._load_reports(rep_mod)
-        try:
-            enable_alt_row_colors(self.reports_tv)
-        except Exception:
-            pass
         # editor area
         self.reports_editor_container = ttk.Labelframe(frame, text='Report Editor', padding=8)
         self.reports_editor_container.pack(fill='x', pady=8)
 
     def _load_reports(self, rep_mod):
-        for i in self.reports_tv.get_children():
-            self.reports_tv.delete(i)
-        try:
-            rows = rep_mod.fetch_reports(sort_by=self._reports_sort['by'], order=self._reports_sort['order'])
-            for r in rows:
-                self.reports_tv.insert('', 'end', values=(r[0], r[1], r[2], (r[3] or '')[:60], str(r[4]), 'Yes' if r[5] else 'No'))
-            try:
-                enable_alt_row_colors(self.reports_tv)
-            except Exception:
-                pass
-        except Exception:
-            logging.exception('Error loading reports')
+        """(Re)load the Reports list from its first page."""
+        self._reports_gen += 1
+        self._reports_rows = []
+        self._reports_cursor = None
+        self._reports_paging = False
+        self._fetch_report_page(rep_mod)
+        self._refresh_report_count(rep_mod)
+
+    def _fetch_report_page(self, rep_mod):
+        gen = self._reports_gen
+        sort = dict(self._reports_sort)
+        self._reports_paging = True
+
+        def failed(exc):
+            if gen == self._reports_gen:
+                self._reports_paging = False
+            logging.error('Could not load reports: %s', exc)
             messagebox.showerror('Error', 'Could not load reports (see terminal)')
 
+        get_runner(self).submit(rep_mod.fetch_report_page, self._reports_filter, sort['by'], sort['order'],
+                                after=self._reports_cursor,
+                                on_done=lambda page: self._render_reports(page, gen), on_error=failed,
+                                indicator=self._reports_busy)
+
+    def _render_reports(self, page, gen):
+        # the filter or sort changed while this page loaded; the newer load will render
+        if gen != self._reports_gen:
+            return
+        self._reports_paging = False
+        self._reports_rows.extend(page.rows)
+        self._reports_cursor = page.next_cursor
+        self._show_reports()
+        self._update_reports_count()
+
+    def _show_reports(self):
+        fill_tree(self.reports_tv, self._reports_rows, key=lambda r: r.report_id,
+                  values=lambda r: (r.report_id, r.cadet_id, r.report_type, r.title[:60],
+                                    r.incident_date or '', 'Yes' if r.resolved else 'No'))
+
+    def _on_reports_scroll(self, first, last, rep_mod):
+        self._reports_vsb.set(first, last)
+        if self._reports_cursor is None or self._reports_paging:
+            return
+        if float(last) >= 1.0 - REPORTS_SCROLL_EDGE:
+            self._fetch_report_page(rep_mod)
+
+    def _refresh_report_count(self, rep_mod):
+        """Show the cached total straight away; recount in the background once it is stale."""
+        filters = self._reports_filter
+        count, fresh = rep_mod.REPORT_COUNTS.get(filters)
+        self._update_reports_count(count)
+        if fresh:
+            return
+
+        def counted(n):
+            if filters == self._reports_filter:
+                self._update_reports_count(n)
+
+        get_runner(self).submit(rep_mod.count_reports, filters, on_done=counted,
+                                on_error=lambda exc: logging.error('Could not count reports: %s', exc))
+
+    def _update_reports_count(self, total=None):
+        if total is not None:
+            self._reports_total = total
+        total = self._reports_total
+        shown = len(self._reports_rows)
+        if self._reports_cursor is None and not self._reports_paging:
+            # every matching row is loaded, so the count is exact whatever the cache says
+            self._reports_count_var.set(f'{shown} reports')
+        elif total is not None:
+            self._reports_count_var.set(f'Showing {shown} of {max(total, shown)}')
+        else:
+            self._reports_count_var.set(f'Showing {shown}')
+
+    def _report_filter_from_form(self, rep_mod):
+        """Build a ReportFilter from the filter bar, or return None after telling the user why not."""
+        cap = self._rep_cap_var.get().strip()
+        if cap and not cap.isdigit():
+            messagebox.showwarning('Filter', 'CAP ID must be a number')
+            return None
+        dates = []
+        for label, var in (('From', self._rep_from_var), ('To', self._rep_to_var)):
+            text = var.get().strip()
+            if not text:
+                dates.append(None)
+                continue
+            try:
+                dates.append(datetime.datetime.strptime(text, '%Y-%m-%d').date())
+            except ValueError:
+                messagebox.showwarning('Filter', f'{label} date must be YYYY-MM-DD')
+                return None
+        rtype = self._rep_type_var.get()
+        status = self._rep_status_var.get()
+        return rep_mod.ReportFilter(
+            cap_id=int(cap) if cap else None,
+            report_type=rtype if rtype in ('Positive', 'Negative') else None,
+            resolved={'Open': False, 'Resolved': True}.get(status),
+            date_from=dates[0],
+            date_to=dates[1],
+        )
+
+    def _apply_report_filters(self, rep_mod):
+        filters = self._report_filter_from_form(rep_mod)
+        if filters is None:
+            return
+        self._reports_filter = filters
+        self._reports_total = None
+        self._load_reports(rep_mod)
+
+    def _clear_report_filters(self, rep_mod):
+        for var in (self._rep_cap_var, self._rep_from_var, self._rep_to_var):
+            var.set('')
+        self._rep_type_var.set('All')
+        self._rep_status_var.set('All')
+        self._apply_report_filters(rep_mod)
+
     def _on_reports_heading_click(self, col, rep_mod):
-        col_map = {
-            'id': 'id',
-            'cadet_id': 'cadet_id',
-            'type': 'type',
-            'title': 'title',
-            'date': 'date',
-            'resolved': 'resolved'
-        }
-        key = col_map.get(col, 'date')
+        key = col if col in rep_mod.REPORT_SORTS else 'date'
         if self._reports_sort['by'] == key:
             self._reports_sort['order'] = 'ASC' if self._reports_sort['order'] == 'DESC' else 'DESC'
         else:
             self._reports_sort['by'] = key
             self._reports_sort['order'] = 'DESC'
-        self._load_reports(rep_mod)
+        if self._reports_cursor is None and not self._reports_paging:
+            # every matching report is already loaded: sort in memory, no query
+            self._reports_rows = rep_mod.sort_report_rows(self._reports_rows, key, self._reports_sort['order'])
+            self._show_reports()
+        else:
+            # only part of the result set is loaded; the server has to pick the first page
+            self._load_reports(rep_mod)
 
     def _edit_selected_report(self, rep_mod):
         sel = self.reports_tv.selection()
@@ -227,15 +562,13 @@ class MainApp(tk.Tk):
         report_id = vals[0]
         if not messagebox.askyesno('Confirm', f'Delete report {report_id}?'):
             return
-        try:
-            if rep_mod.delete_report(report_id):
-                messagebox.showinfo('Deleted', 'Report deleted')
-                self._load_reports(rep_mod)
-            else:
-                messagebox.showerror('Error', 'Could not delete report')
-        except Exception:
-            logging.exception('Error deleting report')
-            messagebox.showerror('Error', 'Could not delete report (see terminal)')
+
+        def deleted(_):
+            messagebox.showinfo('Deleted', 'Report deleted')
+            self._load_reports(rep_mod)
+
+        get_runner(self).submit(rep_mod.remove_report, report_id, on_done=deleted, indicator=self._reports_busy,
+                                error_title='Error', error_message='Could not delete report (see terminal)')
 
     def _open_report_editor(self, rep_mod, report_id):
         # Clear previous editor
@@ -11,32 +11,15 @@ except Exception:
     def enable_alt_row_colors(_tv):
         return
 
-# DB helper (use same credentials as other modules)
-try:
-    import mysql.connector
-    from mysql.connector import Error
-except Exception:
-    mysql = None
-
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
+# DB helper (shared connection pool, same credentials as other modules)
+from db import get_connection, checkout_connection
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+from lookups import invalidate as invalidate_lookups
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
 
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Exception as e:
-        logging.exception('DB connect failed')
-        messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-        return None
-
-
 class PositionManager(tk.Tk):
     """GUI to add, edit, and delete positions from the position table.
     
@@ -206,6 +189,7 @@ class PositionManager(tk.Tk):
             cur = conn.cursor()
             cur.execute('INSERT INTO `position` (position_name, line, level) VALUES (%s, %s, %s)', (name, line_flag, level))
             conn.commit()
+            invalidate_lookups('position')
             messagebox.showinfo('Success', f'Position "{name}" added successfully.')
             self.clear_form()
             self.load_positions()
@@ -241,6 +225,7 @@ class PositionManager(tk.Tk):
             cur.execute('UPDATE `position` SET position_name=%s, line=%s, level=%s WHERE position_id=%s', 
                        (name, line_flag, level, self.selected_position_id))
             conn.commit()
+            invalidate_lookups('position')
             messagebox.showinfo('Success', f'Position updated successfully.')
             self.clear_form()
             self.load_positions()
@@ -278,6 +263,7 @@ class PositionManager(tk.Tk):
             # Delete the position
             cur.execute('DELETE FROM `position` WHERE position_id=%s', (self.selected_position_id,))
             conn.commit()
+            invalidate_lookups('position')
             messagebox.showinfo('Success', f'Position deleted successfully.')
             self.clear_form()
             self.load_positions()
@@ -301,11 +287,56 @@ if __name__ == '__main__':
     main()
 
 
+# --- background helpers for PositionManagerFrame (run through tasks.TaskRunner; they raise) ---
+
+def fetch_positions():
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT position_id, position_name, line, level FROM `position` ORDER BY position_id')
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _write_position(statements):
+    """Run (sql, params) statements in one transaction."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        for sql, params in statements:
+            cur.execute(sql, params)
+        conn.commit()
+        # other views read positions through the lookup cache
+        invalidate_lookups('position')
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def insert_position(name, line_flag, level):
+    _write_position([('INSERT INTO `position` (position_name, line, level) VALUES (%s, %s, %s)', (name, line_flag, level))])
+
+
+def update_position_row(position_id, name, line_flag, level):
+    _write_position([('UPDATE `position` SET position_name=%s, line=%s, level=%s WHERE position_id=%s', (name, line_flag, level, position_id))])
+
+
+def delete_position_row(position_id):
+    _write_position([
+        ('DELETE FROM position_has_cadet WHERE position_position_id=%s', (position_id,)),
+        ('DELETE FROM `position` WHERE position_id=%s', (position_id,)),
+    ])
+
+
 class PositionManagerFrame(ttk.Frame):
     """Embeddable Positions manager for use inside a Notebook tab (no separate window)."""
     def __init__(self, master=None):
         super().__init__(master)
         self.selected_position_id = None
+        self._runner = get_runner(self)
         try:
             # Parent may already have theme applied; do nothing here
             pass
@@ -352,6 +383,8 @@ class PositionManagerFrame(ttk.Frame):
             pass
         ttk.Button(btn_frame, text='Delete Selected', command=self.delete_position).grid(row=0, column=2, padx=6)
         ttk.Button(btn_frame, text='Clear Form', command=self.clear_form).grid(row=0, column=3, padx=6)
+        self._busy = LoadingIndicator(btn_frame)
+        self._busy.grid(row=0, column=4, padx=6)
 
         list_frame = ttk.Labelframe(self, text='Positions', padding=12)
         list_frame.grid(row=1, column=0, sticky='nsew')
@@ -381,29 +414,17 @@ class PositionManagerFrame(ttk.Frame):
 
     # The methods below mirror the tk.Tk-based manager, adapted for Frame
     def load_positions(self):
-        self.tree.delete(*self.tree.get_children())
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT position_id, position_name, line, level FROM `position` ORDER BY position_id')
-            rows = cur.fetchall()
-            for row in rows:
-                pos_id = row[0]
-                name = row[1] or ''
-                line_flag = row[2]
-                level = row[3]
-                pos_type = 'Line/Staff' if line_flag == 1 else 'Support'
-                self.tree.insert('', 'end', values=(pos_id, name, pos_type, level))
-        except Exception:
-            logging.exception('Error loading positions')
-            messagebox.showerror('DB Error', 'Could not load positions (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        self._runner.submit(fetch_positions, on_done=self._render_positions, indicator=self._busy,
+                            error_message='Could not load positions (see terminal).')
+
+    def _render_positions(self, rows):
+        fill_tree(self.tree, rows, key=lambda row: row[0],
+                  values=lambda row: (row[0], row[1] or '', 'Line/Staff' if row[2] == 1 else 'Support', row[3]))
+
+    def _after_write(self, message):
+        messagebox.showinfo('Success', message)
+        self.clear_form()
+        self.load_positions()
 
     def on_select(self, event):
         selection = self.tree.selection()
@@ -437,25 +458,9 @@ class PositionManagerFrame(ttk.Frame):
             messagebox.showerror('Validation', 'Level is required.')
             return
         line_flag = 1 if self.type_var.get() == 'Line' else 0
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            cur.execute('INSERT INTO `position` (position_name, line, level) VALUES (%s, %s, %s)', (name, line_flag, level))
-            conn.commit()
-            messagebox.showinfo('Success', f'Position "{name}" added successfully.')
-            self.clear_form()
-            self.load_positions()
-        except Exception:
-            conn.rollback()
-            logging.exception('Error adding position')
-            messagebox.showerror('DB Error', 'Could not add position (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        self._runner.submit(insert_position, name, line_flag, level,
+                            on_done=lambda _: self._after_write(f'Position "{name}" added successfully.'),
+                            indicator=self._busy, error_message='Could not add position (see terminal).')
 
     def update_position(self):
         if not self.selected_position_id:
@@ -470,25 +475,9 @@ class PositionManagerFrame(ttk.Frame):
             messagebox.showerror('Validation', 'Level is required.')
             return
         line_flag = 1 if self.type_var.get() == 'Line' else 0
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            cur.execute('UPDATE `position` SET position_name=%s, line=%s, level=%s WHERE position_id=%s', (name, line_flag, level, self.selected_position_id))
-            conn.commit()
-            messagebox.showinfo('Success', f'Position updated successfully.')
-            self.clear_form()
-            self.load_positions()
-        except Exception:
-            conn.rollback()
-            logging.exception('Error updating position')
-            messagebox.showerror('DB Error', 'Could not update position (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        self._runner.submit(update_position_row, self.selected_position_id, name, line_flag, level,
+                            on_done=lambda _: self._after_write('Position updated successfully.'),
+                            indicator=self._busy, error_message='Could not update position (see terminal).')
 
     def delete_position(self):
         if not self.selected_position_id:
@@ -498,23 +487,6 @@ class PositionManagerFrame(ttk.Frame):
         confirm = messagebox.askyesno('Confirm Delete', f'Are you sure you want to delete position "{name}"?\n\nThis will also remove all cadet assignments to this position.')
         if not confirm:
             return
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            cur.execute('DELETE FROM position_has_cadet WHERE position_position_id=%s', (self.selected_position_id,))
-            cur.execute('DELETE FROM `position` WHERE position_id=%s', (self.selected_position_id,))
-            conn.commit()
-            messagebox.showinfo('Success', f'Position deleted successfully.')
-            self.clear_form()
-            self.load_positions()
-        except Exception:
-            conn.rollback()
-            logging.exception('Error deleting position')
-            messagebox.showerror('DB Error', 'Could not delete position (see terminal).')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        self._runner.submit(delete_position_row, self.selected_position_id,
+                            on_done=lambda _: self._after_write('Position deleted successfully.'),
+                            indicator=self._busy, error_message='Could not delete position (see terminal).')
@@ -0,0 +1,227 @@
+"""
+Schema migration runner.
+
+schema.sql creates the baseline tables. Changes on top of it live in migrations/ as numbered
+Python files (0001_add_lookup_indexes.py, 0002_..., applied in number order). Each defines:
+
+  STATEMENTS      list of SQL statements to run, in order
+  EXPLAIN_CHECKS  optional list of (description, query, params, table, expected_index); after
+                  the migration runs, EXPLAIN on each query must show `table` read through
+                  `expected_index` instead of a full scan
+
+Applied versions are recorded in the `schema_migrations` table, so running this again only
+applies what is new. MySQL commits DDL implicitly, so a migration that fails part-way cannot be
+rolled back; instead each statement that succeeds is recorded in `schema_migration_steps` and a
+re-run resumes after it. A statement whose object already exists (duplicate column or index,
+existing table) counts as done, which covers a crash between a statement and its record.
+
+The "before" EXPLAIN of a check is best effort: a check that reads a table or column the
+migration itself creates cannot be planned yet and is reported as (None, None).
+
+Usage:
+  python migrate.py            apply pending migrations and run their EXPLAIN checks
+  python migrate.py --status   list migrations and whether they are applied
+  python migrate.py --explain  run the EXPLAIN checks of every applied migration
+
+Requires: mysql-connector-python
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import sys
+
+from mysql.connector import Error
+
+from db import checkout_connection
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+_FILE_RE = re.compile(r'^(\d{4})_(\w+)\.py$')
+# MySQL errors meaning a statement's work is already there: table exists, duplicate column,
+# duplicate key name
+_ALREADY_APPLIED = {1050, 1060, 1061}
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f'migration_{self.version:04d}', self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    @property
+    def statements(self):
+        return list(getattr(self.module, 'STATEMENTS', []))
+
+    @property
+    def explain_checks(self):
+        return list(getattr(self.module, 'EXPLAIN_CHECKS', []))
+
+    def __repr__(self):
+        return f'{self.version:04d}_{self.name}'
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Return the migrations in `directory`, ordered by version."""
+    found = []
+    for fname in sorted(os.listdir(directory)):
+        m = _FILE_RE.match(fname)
+        if m:
+            found.append(Migration(int(m.group(1)), m.group(2), os.path.join(directory, fname)))
+    versions = [m.version for m in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f'Duplicate migration numbers in {directory}')
+    return found
+
+
+def ensure_version_table(cur):
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT NOT NULL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE = InnoDB
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migration_steps (
+            version INT NOT NULL,
+            step INT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (version, step)
+        ) ENGINE = InnoDB
+    ''')
+
+
+def applied_versions(cur):
+    ensure_version_table(cur)
+    cur.execute('SELECT version FROM schema_migrations')
+    return {r[0] for r in cur.fetchall()}
+
+
+def explain(cur, query, params, table):
+    """Return (access_type, key) of `table` in the EXPLAIN plan for query."""
+    cur.execute('EXPLAIN ' + query, params)
+    cols = [d[0].lower() for d in cur.description]
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    for row in rows:
+        if row.get('table') == table:
+            return row.get('type'), row.get('key')
+    return None, None
+
+
+def run_checks(cur, migration, before=None):
+    """EXPLAIN each check of `migration` and log the plan. Returns the number of failed checks.
+
+    before optionally maps description -> (type, key) captured before the migration ran.
+    """
+    failed = 0
+    for desc, query, params, table, expected in migration.explain_checks:
+        access, key = explain(cur, query, params, table)
+        was = ''
+        if before and desc in before:
+            was = ' (was type=%s key=%s)' % before[desc]
+        ok = key == expected and access != 'ALL'
+        level = logging.INFO if ok else logging.WARNING
+        logging.log(level, '%s %r: type=%s key=%s%s -> %s', migration, desc, access, key, was,
+                    'OK' if ok else f'expected index {expected}')
+        if not ok:
+            failed += 1
+    if failed:
+        # very small tables may be scanned even with a usable index; re-check on real data
+        logging.warning('%s: %d EXPLAIN check(s) did not use the expected index', migration, failed)
+    return failed
+
+
+def apply(migration, conn):
+    cur = conn.cursor()
+    before = {}
+    for desc, query, params, table, _expected in migration.explain_checks:
+        try:
+            before[desc] = explain(cur, query, params, table)
+        except Error as e:
+            # the query needs a table or column this migration creates
+            logging.debug('%s %r: no plan before migrating (%s)', migration, desc, e)
+            before[desc] = (None, None)
+    cur.execute('SELECT step FROM schema_migration_steps WHERE version = %s', (migration.version,))
+    done = {r[0] for r in cur.fetchall()}
+    logging.info('Applying %s%s', migration, f' (resuming after {len(done)} step(s))' if done else '')
+    for step, stmt in enumerate(migration.statements):
+        if step in done:
+            continue
+        try:
+            cur.execute(stmt)
+        except Error as e:
+            if e.errno not in _ALREADY_APPLIED:
+                raise
+            logging.warning('%s step %d already applied (%s)', migration, step, e.msg)
+        cur.execute('INSERT INTO schema_migration_steps (version, step) VALUES (%s, %s)', (migration.version, step))
+        conn.commit()
+    cur.execute('INSERT INTO schema_migrations (version, name) VALUES (%s, %s)', (migration.version, migration.name))
+    cur.execute('DELETE FROM schema_migration_steps WHERE version = %s', (migration.version,))
+    conn.commit()
+    return run_checks(cur, migration, before)
+
+
+def migrate(directory=MIGRATIONS_DIR):
+    """Apply every pending migration in order. Returns the number of failed EXPLAIN checks."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        done = applied_versions(cur)
+        pending = [m for m in discover(directory) if m.version not in done]
+        if not pending:
+            logging.info('Schema is up to date')
+        failed = 0
+        for migration in pending:
+            try:
+                failed += apply(migration, conn)
+            except Exception:
+                conn.rollback()
+                logging.exception('Migration %s failed; later migrations were not applied', migration)
+                raise
+        return failed
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply CAP Cadet Tracker schema migrations.')
+    parser.add_argument('--status', action='store_true', help='list migrations and whether they are applied')
+    parser.add_argument('--explain', action='store_true', help='run the EXPLAIN checks of applied migrations')
+    args = parser.parse_args(argv)
+
+    if not args.status and not args.explain:
+        try:
+            return 1 if migrate() else 0
+        except Exception:
+            return 2
+
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        done = applied_versions(cur)
+        failed = 0
+        for migration in discover():
+            if args.status:
+                print(f"{migration}: {'applied' if migration.version in done else 'pending'}")
+            elif migration.version in done:
+                failed += run_checks(cur, migration)
+        return 1 if failed else 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Indexes for the lookups the app runs on every screen.
+
+- cadet.cap_id: CAP ID autofill, inspection save and report lookups all filter on it.
+- report.Incident_date: the Reports list sorts by it.
+- uniform_inspection(cadet_cadet_id, inspection_date): the Inspections tab looks up a cadet's
+  inspection for a given date.
+- inspection_item.item_name (unique): item ids are resolved by name on every inspection save.
+  Duplicate item names are merged into the lowest item_id first, with their scores repointed.
+"""
+
+STATEMENTS = [
+    'CREATE INDEX `idx_cadet_cap_id` ON `cadet` (`cap_id`)',
+    'CREATE INDEX `idx_report_incident_date` ON `report` (`Incident_date`)',
+    'CREATE INDEX `idx_uniform_inspection_cadet_date` ON `uniform_inspection` (`cadet_cadet_id`, `inspection_date`)',
+    # merge duplicate inspection items before the unique index can be created
+    '''
+    UPDATE uniform_inspection_score s
+    JOIN inspection_item i ON i.item_id = s.inspection_item_item_id
+    JOIN (SELECT item_name, MIN(item_id) AS keep_id FROM inspection_item GROUP BY item_name) k
+      ON k.item_name = i.item_name
+    SET s.inspection_item_item_id = k.keep_id
+    WHERE s.inspection_item_item_id <> k.keep_id
+    ''',
+    '''
+    DELETE i FROM inspection_item i
+    JOIN (SELECT item_name, MIN(item_id) AS keep_id FROM inspection_item GROUP BY item_name) k
+      ON k.item_name = i.item_name
+    WHERE i.item_id <> k.keep_id
+    ''',
+    'CREATE UNIQUE INDEX `uq_inspection_item_name` ON `inspection_item` (`item_name`)',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+EXPLAIN_CHECKS = [
+    ('cadet by CAP ID', 'SELECT cadet_id, first_name, last_name FROM cadet WHERE cap_id = %s',
+     (0,), 'cadet', 'idx_cadet_cap_id'),
+    ('reports by incident date', 'SELECT report_id FROM report ORDER BY Incident_date DESC LIMIT 50',
+     (), 'report', 'idx_report_incident_date'),
+    ('inspection for cadet and date', 'SELECT inspection_id, notes FROM uniform_inspection WHERE cadet_cadet_id = %s AND inspection_date = %s',
+     (0, '2000-01-01'), 'uniform_inspection', 'idx_uniform_inspection_cadet_date'),
+    ('inspection item by name', 'SELECT item_id FROM inspection_item WHERE item_name = %s',
+     ('Aggregate',), 'inspection_item', 'uq_inspection_item_name'),
+]
@@ -0,0 +1,27 @@
+"""
+Indexes for the Reports manager filters.
+
+The list is filtered by cadet, type and status and kept in incident date order (its default
+sort), so each filter column is paired with Incident_date: the filtered page is read in index
+order and keyset pagination continues from the last row instead of sorting the whole match.
+The date range alone uses idx_report_incident_date from migration 0001.
+"""
+
+STATEMENTS = [
+    'CREATE INDEX `idx_report_cadet_date` ON `report` (`cadet_cadet_id`, `Incident_date`)',
+    'CREATE INDEX `idx_report_type_date` ON `report` (`report_type`, `Incident_date`)',
+    'CREATE INDEX `idx_report_resolved_date` ON `report` (`resolved`, `Incident_date`)',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+EXPLAIN_CHECKS = [
+    ('reports for a cadet by date',
+     'SELECT report_id FROM report WHERE cadet_cadet_id = %s ORDER BY Incident_date DESC, report_id DESC LIMIT 101',
+     (0,), 'report', 'idx_report_cadet_date'),
+    ('reports of a type by date',
+     'SELECT report_id FROM report WHERE report_type = %s ORDER BY Incident_date DESC, report_id DESC LIMIT 101',
+     ('Negative',), 'report', 'idx_report_type_date'),
+    ('resolved reports by date',
+     'SELECT report_id FROM report WHERE resolved = 1 ORDER BY Incident_date DESC, report_id DESC LIMIT 101',
+     (), 'report', 'idx_report_resolved_date'),
+]
@@ -0,0 +1,34 @@
+"""
+Materialized promotion progress (see progress.py).
+
+One row per cadet: the next rank, how many requirements it has and how many the cadet has
+completed. The app keeps the rows current as requirements are toggled, linked and unlinked and
+as ranks change; fill the table after migrating with `python progress.py --rebuild`.
+
+next_rank_id is indexed because linking a requirement updates every cadet working toward that
+rank.
+"""
+
+STATEMENTS = [
+    '''
+    CREATE TABLE IF NOT EXISTS `cadet_promotion_progress` (
+      `cadet_id` INT NOT NULL,
+      `next_rank_id` INT NULL,
+      `required_count` INT NOT NULL DEFAULT 0,
+      `completed_count` INT NOT NULL DEFAULT 0,
+      `updated_at` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+      PRIMARY KEY (`cadet_id`),
+      INDEX `idx_progress_next_rank` (`next_rank_id`),
+      CONSTRAINT `fk_progress_cadet`
+        FOREIGN KEY (`cadet_id`) REFERENCES `cadet` (`cadet_id`)
+        ON DELETE CASCADE
+    ) ENGINE = InnoDB
+    ''',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+# (the table is new, so migrate.py can only plan this after the migration)
+EXPLAIN_CHECKS = [
+    ('progress rows for a next rank', 'SELECT cadet_id FROM cadet_promotion_progress WHERE next_rank_id = %s',
+     (0,), 'cadet_promotion_progress', 'idx_progress_next_rank'),
+]
@@ -0,0 +1,26 @@
+"""
+Stored inspection totals and ratings (see inspection_totals.py).
+
+uniform_inspection gains total_score, max_score and rating, written by every save path, so
+inspection history no longer sums uniform_inspection_score per row. Existing rows stay NULL
+until `python inspection_totals.py --backfill` fills them; readers fall back to the summed
+score for NULL rows in the meantime.
+"""
+
+STATEMENTS = [
+    '''
+    ALTER TABLE `uniform_inspection`
+      ADD COLUMN `total_score` INT NULL,
+      ADD COLUMN `max_score` INT NULL,
+      ADD COLUMN `rating` VARCHAR(30) NULL
+    ''',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+# (total_score and rating are new, so migrate.py can only plan this after the migration)
+EXPLAIN_CHECKS = [
+    ('inspection history for a cadet',
+     'SELECT inspection_id, inspection_date, total_score, rating, notes FROM uniform_inspection '
+     'WHERE cadet_cadet_id = %s ORDER BY inspection_date DESC',
+     (0,), 'uniform_inspection', 'idx_uniform_inspection_cadet_date'),
+]
@@ -0,0 +1,26 @@
+"""
+PT score support (see pt_scores.py).
+
+- cadet.sex: the fitness standards differ by sex; entered on the PT test-night sheet. NULL
+  means unknown, and those results are scored for percentile only.
+- pt_score (cadet_cadet_id, test_date) unique: one result per cadet per test night, so entry
+  and CSV import can upsert. Duplicates are merged first, keeping the newest row.
+"""
+
+STATEMENTS = [
+    "ALTER TABLE `cadet` ADD COLUMN `sex` ENUM('M', 'F') NULL",
+    '''
+    DELETE p FROM pt_score p
+    JOIN pt_score newer
+      ON newer.cadet_cadet_id = p.cadet_cadet_id AND newer.test_date = p.test_date
+     AND newer.pt_score_id > p.pt_score_id
+    ''',
+    'CREATE UNIQUE INDEX `uq_pt_score_cadet_date` ON `pt_score` (`cadet_cadet_id`, `test_date`)',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+EXPLAIN_CHECKS = [
+    ('PT history for a cadet',
+     'SELECT test_date, pushups, situps, mile_run FROM pt_score WHERE cadet_cadet_id = %s ORDER BY test_date',
+     (0,), 'pt_score', 'uq_pt_score_cadet_date'),
+]
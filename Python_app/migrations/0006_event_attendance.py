@@ -0,0 +1,28 @@
+"""
+Event attendance roll call (see attendance.py).
+
+- event_attendance (event_event_id, cadet_cadet_id) unique: one row per cadet per event, so
+  buffered check-ins can be flushed as idempotent multi-row upserts. Duplicates are merged
+  first, keeping the newest row. The index also leads with the event, which is how the roll
+  and the per-event statistics read the table.
+- event (event_start_date): the event list and the attendance statistics are date ranges.
+"""
+
+STATEMENTS = [
+    '''
+    DELETE a FROM event_attendance a
+    JOIN event_attendance newer
+      ON newer.event_event_id = a.event_event_id AND newer.cadet_cadet_id = a.cadet_cadet_id
+     AND newer.attendance_id > a.attendance_id
+    ''',
+    'CREATE UNIQUE INDEX `uq_attendance_event_cadet` ON `event_attendance` (`event_event_id`, `cadet_cadet_id`)',
+    'CREATE INDEX `idx_event_start` ON `event` (`event_start_date`)',
+]
+
+# (description, query, params, table, index expected in the plan after the migration)
+EXPLAIN_CHECKS = [
+    ('check-ins for an event', 'SELECT cadet_cadet_id FROM event_attendance WHERE event_event_id = %s AND attended = 1',
+     (0,), 'event_attendance', 'uq_attendance_event_cadet'),
+    ('recent events', 'SELECT event_id FROM event WHERE event_start_date >= %s ORDER BY event_start_date DESC',
+     ('2999-01-01',), 'event', 'idx_event_start'),
+]
@@ -0,0 +1,257 @@
+"""
+Materialized promotion progress: one cadet_promotion_progress row per cadet holding the next
+rank, how many of its requirements there are and how many the cadet has completed.
+
+Working this out used to mean joining rank_has_cadet, rank, rank_has_requirement and
+cadet_has_rank_requirement from scratch. The table (migration 0003) is kept current by the
+writers, inside their own transactions:
+
+  requirement_toggled()  Dashboard requirement checkbox: completed_count +/- 1 when the
+                         requirement belongs to the cadet's next rank
+  requirement_linked()   a requirement linked to / unlinked from a rank: required_count +/- 1
+                         for cadets working toward that rank, completed_count too for those
+                         who had already done it
+  refresh_cadets()       a cadet's rank changed (profile save, Add/Edit Cadet): the cadet's
+                         row is recomputed
+
+Anything changed outside the app (or edits to the rank ladder itself) is fixed with a rebuild:
+
+  python progress.py --rebuild   recompute every row set-based
+  python progress.py --check     report rows that differ from a fresh computation
+
+The hooks do nothing until migration 0003 has been applied, so the app keeps working on an
+older schema. Run --rebuild once after migrating to fill the table.
+
+Requires: mysql-connector-python
+"""
+
+import argparse
+import bisect
+import logging
+import sys
+
+from db import checkout_connection
+from lookups import RANKS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+# cadets per IN (...) list when recomputing a subset
+_CHUNK = 500
+
+_available = None
+
+
+def progress_available(cur):
+    """True once the cadet_promotion_progress table exists (checked once per process)."""
+    global _available
+    if _available is None:
+        cur.execute("SELECT COUNT(*) FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = 'cadet_promotion_progress'")
+        _available = bool(cur.fetchone()[0])
+    return _available
+
+
+def _in_list(ids):
+    return ', '.join(['%s'] * len(ids))
+
+
+def compute_progress(cur, cadet_ids=None):
+    """Return {cadet_id: (next_rank_id, required_count, completed_count)} computed from the
+    source tables, for `cadet_ids` or every cadet. Uses the same next-rank rule as
+    promotions.py: the lowest rank_order above the highest rank held, or the lowest rank."""
+    ladder = sorted(RANKS.rows(cur), key=lambda r: r[2])
+    orders = [r[2] for r in ladder]
+    rank_order = {r[0]: r[2] for r in ladder}
+
+    if cadet_ids is None:
+        cur.execute('SELECT cadet_id FROM cadet')
+        cadets = [r[0] for r in cur.fetchall()]
+        cur.execute('SELECT cadet_cadet_id, rank_rank_id FROM rank_has_cadet')
+        held = cur.fetchall()
+    else:
+        cadets = list(dict.fromkeys(cadet_ids))
+        held = []
+        for start in range(0, len(cadets), _CHUNK):
+            chunk = cadets[start:start + _CHUNK]
+            cur.execute('SELECT cadet_cadet_id, rank_rank_id FROM rank_has_cadet WHERE cadet_cadet_id IN (%s)'
+                        % _in_list(chunk), tuple(chunk))
+            held.extend(cur.fetchall())
+
+    best = {}
+    for cadet_id, rank_id in held:
+        order = rank_order.get(rank_id)
+        if order is not None and order > best.get(cadet_id, float('-inf')):
+            best[cadet_id] = order
+    next_rank = {}
+    for cadet_id in cadets:
+        i = bisect.bisect_right(orders, best[cadet_id]) if cadet_id in best else 0
+        next_rank[cadet_id] = ladder[i][0] if i < len(ladder) else None
+
+    cur.execute('SELECT rank_rank_id, COUNT(*) FROM rank_has_requirement GROUP BY rank_rank_id')
+    required = dict(cur.fetchall())
+
+    # completions that count toward some rank; kept only where the rank is the cadet's next one
+    done = {}
+    sql = ('SELECT d.cadet_cadet_id, rr.rank_rank_id, COUNT(*) FROM cadet_has_rank_requirement d '
+           'JOIN rank_has_requirement rr ON rr.rank_requirement_requirement_id = d.requirement_requirement_id')
+    groups = ' GROUP BY d.cadet_cadet_id, rr.rank_rank_id'
+    if cadet_ids is None:
+        cur.execute(sql + groups)
+        rows = cur.fetchall()
+    else:
+        rows = []
+        for start in range(0, len(cadets), _CHUNK):
+            chunk = cadets[start:start + _CHUNK]
+            cur.execute(sql + ' WHERE d.cadet_cadet_id IN (%s)' % _in_list(chunk) + groups, tuple(chunk))
+            rows.extend(cur.fetchall())
+    for cadet_id, rank_id, count in rows:
+        if next_rank.get(cadet_id) == rank_id:
+            done[cadet_id] = count
+
+    return {cid: (nr, required.get(nr, 0) if nr is not None else 0, done.get(cid, 0))
+            for cid, nr in next_rank.items()}
+
+
+def _write(cur, rows):
+    cur.executemany('''
+        INSERT INTO cadet_promotion_progress (cadet_id, next_rank_id, required_count, completed_count)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE next_rank_id = VALUES(next_rank_id), required_count = VALUES(required_count),
+                                completed_count = VALUES(completed_count)
+    ''', [(cid,) + vals for cid, vals in rows.items()])
+
+
+# ---- incremental hooks (run on the writer's cursor, inside its transaction) ----
+
+def refresh_cadets(cur, cadet_ids):
+    """Recompute the rows of `cadet_ids`, e.g. after their rank changed."""
+    if not cadet_ids or not progress_available(cur):
+        return
+    _write(cur, compute_progress(cur, cadet_ids))
+
+
+def requirement_toggled(cur, cadet_id, req_id, delta):
+    """A cadet completed (delta=1) or un-completed (delta=-1) a requirement."""
+    if not progress_available(cur):
+        return
+    cur.execute('''
+        UPDATE cadet_promotion_progress p
+        JOIN rank_has_requirement rr
+          ON rr.rank_rank_id = p.next_rank_id AND rr.rank_requirement_requirement_id = %s
+        SET p.completed_count = p.completed_count + %s
+        WHERE p.cadet_id = %s
+    ''', (req_id, delta, cadet_id))
+
+
+def requirement_linked(cur, links, delta):
+    """(rank_id, requirement_id) pairs were linked (delta=1) or unlinked (delta=-1)."""
+    if not links or not progress_available(cur):
+        return
+    cur.executemany('''
+        UPDATE cadet_promotion_progress p
+        LEFT JOIN cadet_has_rank_requirement d
+               ON d.cadet_cadet_id = p.cadet_id AND d.requirement_requirement_id = %s
+        SET p.required_count = p.required_count + %s,
+            p.completed_count = p.completed_count + IF(d.cadet_cadet_id IS NULL, 0, %s)
+        WHERE p.next_rank_id = %s
+    ''', [(req_id, delta, delta, rank_id) for rank_id, req_id in links])
+
+
+# ---- reads and maintenance ----
+
+def load_progress():
+    """Every cadet's progress in one read of the table, joined to the cadet and the highest
+    rank_order held: (cadet_id, cap_id, first_name, last_name, current_rank_order,
+    next_rank_id, required, completed). Returns None until migration 0003 has run.
+    Raises on DB errors."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if not progress_available(cur):
+            return None
+        cur.execute('''
+            SELECT c.cadet_id, c.cap_id, c.first_name, c.last_name, held.rank_order,
+                   p.next_rank_id, p.required_count, p.completed_count
+            FROM cadet_promotion_progress p
+            JOIN cadet c ON c.cadet_id = p.cadet_id
+            LEFT JOIN (
+                SELECT h.cadet_cadet_id, MAX(r.rank_order) AS rank_order
+                FROM rank_has_cadet h
+                JOIN `rank` r ON r.rank_id = h.rank_rank_id
+                GROUP BY h.cadet_cadet_id
+            ) held ON held.cadet_cadet_id = p.cadet_id
+        ''')
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def missing_requirements(cadet_id, rank_id):
+    """Requirement ids of `rank_id` the cadet has not completed."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('''
+            SELECT rr.rank_requirement_requirement_id
+            FROM rank_has_requirement rr
+            LEFT JOIN cadet_has_rank_requirement d
+                   ON d.requirement_requirement_id = rr.rank_requirement_requirement_id AND d.cadet_cadet_id = %s
+            WHERE rr.rank_rank_id = %s AND d.cadet_cadet_id IS NULL
+        ''', (cadet_id, rank_id))
+        return {r[0] for r in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def rebuild():
+    """Recompute every row and drop rows of cadets that no longer exist. Returns the row count."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        if not progress_available(cur):
+            raise RuntimeError('cadet_promotion_progress does not exist; run python migrate.py first')
+        rows = compute_progress(cur)
+        cur.execute('DELETE p FROM cadet_promotion_progress p LEFT JOIN cadet c ON c.cadet_id = p.cadet_id '
+                    'WHERE c.cadet_id IS NULL')
+        _write(cur, rows)
+        conn.commit()
+        return len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def check():
+    """Return [(cadet_id, stored, expected)] for rows that differ from a fresh computation."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        expected = compute_progress(cur)
+        cur.execute('SELECT cadet_id, next_rank_id, required_count, completed_count FROM cadet_promotion_progress')
+        stored = {r[0]: tuple(r[1:]) for r in cur.fetchall()}
+    finally:
+        conn.close()
+    return [(cid, stored.get(cid), exp) for cid, exp in sorted(expected.items()) if stored.get(cid) != exp]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Maintain the cadet_promotion_progress table.')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--rebuild', action='store_true', help='recompute every row')
+    group.add_argument('--check', action='store_true', help='list rows that differ from a fresh computation')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        logging.info('Rebuilt promotion progress for %d cadets', rebuild())
+        return 0
+    drift = check()
+    for cadet_id, stored, expected in drift:
+        print(f'cadet {cadet_id}: stored {stored}, expected {expected}')
+    logging.info('%d row(s) out of date', len(drift))
+    return 1 if drift else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
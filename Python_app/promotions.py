@@ -0,0 +1,289 @@
+"""
+Squadron-wide promotion eligibility ("who's ready to promote").
+
+The Dashboard works out the next rank and its checklist for one cadet at a time
+(cadet_detail.py). Doing that per cadet for the whole unit would be thousands of round trips,
+so promotion_board() computes every cadet's standing from a fixed handful of set-based queries
+and joins them in memory:
+
+  rank                        from the lookups cache (no query once warm)
+  cadet                       one scan
+  rank_has_cadet              one scan -> highest rank held per cadet
+  rank_has_requirement        one scan -> requirement ids per rank
+  cadet_has_rank_requirement  one scan -> completed requirement ids per cadet
+
+The next rank follows cadet_detail: the lowest rank_order above the cadet's highest rank, or the
+lowest rank for a cadet with none. The joins are dict and set lookups, so thousands of cadets
+take a few milliseconds on top of the queries.
+
+Once migration 0003 has created cadet_promotion_progress (progress.py), the tab reads the
+counts from that table instead, in a single query, and fetches a cadet's missing requirements
+only when the cadet is selected. stored_board() returns None while the table is missing or
+empty, and the tab then falls back to promotion_board().
+
+promotion_board() raises on DB errors; run it through tasks.TaskRunner. PromotionBoardFrame is
+the sortable tab shown in the main window.
+"""
+
+import bisect
+import logging
+import time
+import tkinter as tk
+from tkinter import ttk
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from db import checkout_connection
+from lookups import RANKS, REQUIREMENTS
+import progress
+from cadet_detail import RankInfo
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+
+
+@dataclass
+class PromotionStatus:
+    cadet_id: int
+    cap_id: int
+    first_name: str
+    last_name: str
+    current_rank: Optional[RankInfo] = None
+    next_rank: Optional[RankInfo] = None
+    # requirement ids of next_rank, and those the cadet has completed
+    required: Set[int] = field(default_factory=set)
+    completed: Set[int] = field(default_factory=set)
+    # counts read from cadet_promotion_progress; the sets are then left empty
+    stored_counts: Optional[Tuple[int, int]] = None
+
+    @property
+    def required_count(self) -> int:
+        return self.stored_counts[0] if self.stored_counts else len(self.required)
+
+    @property
+    def completed_count(self) -> int:
+        return self.stored_counts[1] if self.stored_counts else len(self.completed)
+
+    @property
+    def percent(self) -> float:
+        """Share of the next rank's requirements completed (100 when it has none)."""
+        if self.next_rank is None:
+            return 0.0
+        if not self.required_count:
+            return 100.0
+        return 100.0 * self.completed_count / self.required_count
+
+    @property
+    def ready(self) -> bool:
+        """True when there is a next rank and every one of its requirements is done."""
+        return self.next_rank is not None and self.completed_count >= self.required_count
+
+    @property
+    def missing(self) -> Set[int]:
+        return self.required - self.completed
+
+
+def _rank_ladder(cur):
+    """Ranks as RankInfo sorted by rank_order, plus their orders for bisecting."""
+    ladder = sorted((RankInfo(r[0], r[1], r[2]) for r in RANKS.rows(cur)), key=lambda r: r.rank_order)
+    return ladder, [r.rank_order for r in ladder]
+
+
+def _compute_board(cur) -> List[PromotionStatus]:
+    ladder, orders = _rank_ladder(cur)
+    by_id = {r.rank_id: r for r in ladder}
+
+    cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet')
+    cadets = cur.fetchall()
+
+    # highest rank held by each cadet
+    current: Dict[int, RankInfo] = {}
+    cur.execute('SELECT cadet_cadet_id, rank_rank_id FROM rank_has_cadet')
+    for cadet_id, rank_id in cur.fetchall():
+        rank = by_id.get(rank_id)
+        if rank is not None and (cadet_id not in current or rank.rank_order > current[cadet_id].rank_order):
+            current[cadet_id] = rank
+
+    required_by_rank: Dict[int, Set[int]] = {}
+    cur.execute('SELECT rank_rank_id, rank_requirement_requirement_id FROM rank_has_requirement')
+    for rank_id, req_id in cur.fetchall():
+        required_by_rank.setdefault(rank_id, set()).add(req_id)
+
+    done_by_cadet: Dict[int, Set[int]] = {}
+    cur.execute('SELECT cadet_cadet_id, requirement_requirement_id FROM cadet_has_rank_requirement')
+    for cadet_id, req_id in cur.fetchall():
+        done_by_cadet.setdefault(cadet_id, set()).add(req_id)
+
+    board = []
+    empty = frozenset()
+    for cadet_id, cap_id, first, last in cadets:
+        rank = current.get(cadet_id)
+        # first rank strictly above the current one; the lowest rank when none is held
+        i = bisect.bisect_right(orders, rank.rank_order) if rank is not None else 0
+        nxt = ladder[i] if i < len(ladder) else None
+        required = required_by_rank.get(nxt.rank_id, empty) if nxt is not None else empty
+        done = done_by_cadet.get(cadet_id, empty) & required
+        board.append(PromotionStatus(cadet_id, cap_id, first or '', last or '', rank, nxt, set(required), set(done)))
+    return board
+
+
+def promotion_board() -> List[PromotionStatus]:
+    """Promotion standing of every cadet, in no particular order. Raises on DB errors."""
+    t0 = time.perf_counter()
+    conn = checkout_connection()
+    try:
+        board = _compute_board(conn.cursor())
+    finally:
+        conn.close()
+    logging.info('Promotion board: %d cadets in %.0f ms', len(board), (time.perf_counter() - t0) * 1000.0)
+    return board
+
+
+def stored_board() -> Optional[List[PromotionStatus]]:
+    """The board from cadet_promotion_progress in one read, or None when the table has not
+    been created or filled yet. Raises on DB errors."""
+    t0 = time.perf_counter()
+    rows = progress.load_progress()
+    if not rows:
+        return None
+    ladder, _orders = _rank_ladder(None)
+    by_order = {r.rank_order: r for r in ladder}
+    by_id = {r.rank_id: r for r in ladder}
+    board = [PromotionStatus(cadet_id, cap_id, first or '', last or '', by_order.get(held), by_id.get(next_id),
+                             stored_counts=(int(required), int(done)))
+             for cadet_id, cap_id, first, last, held, next_id, required, done in rows]
+    logging.info('Promotion board: %d cadets read from cadet_promotion_progress in %.0f ms',
+                 len(board), (time.perf_counter() - t0) * 1000.0)
+    return board
+
+
+def ready_to_promote(board) -> List[PromotionStatus]:
+    """Cadets in `board` who have completed every requirement of their next rank."""
+    return [s for s in board if s.ready]
+
+
+def _load_board_for_tab():
+    # requirement names are resolved here so the Tk thread never waits on a cache reload
+    board = stored_board()
+    if board is None:
+        board = promotion_board()
+    names = {r[0]: r[1] for r in REQUIREMENTS.rows()}
+    return board, names
+
+
+# sort keys for the board columns; cap_id breaks ties so the order is stable
+_SORT_KEYS = {
+    'name': lambda s: (s.last_name.casefold(), s.first_name.casefold()),
+    'cap_id': lambda s: s.cap_id,
+    'rank': lambda s: s.current_rank.rank_order if s.current_rank else -1,
+    'next': lambda s: s.next_rank.rank_order if s.next_rank else -1,
+    'done': lambda s: s.completed_count,
+    'required': lambda s: s.required_count,
+    'percent': lambda s: s.percent,
+}
+
+
+def sort_board(board, sort_by='percent', descending=True):
+    key = _SORT_KEYS.get(sort_by, _SORT_KEYS['percent'])
+    return sorted(board, key=lambda s: (key(s), s.cap_id), reverse=descending)
+
+
+class PromotionBoardFrame(ttk.Frame):
+    """Sortable promotion board for a Notebook tab. The board is loaded once per Refresh and
+    sorted and filtered in memory."""
+
+    COLUMNS = (('name', 'Cadet', 200), ('cap_id', 'CAP ID', 80), ('rank', 'Current Rank', 140),
+               ('next', 'Next Rank', 140), ('done', 'Done', 60), ('required', 'Required', 70),
+               ('percent', '% Complete', 90))
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self._runner = get_runner(self)
+        self._board = []
+        self._by_id = {}
+        self._req_names = {}
+        self._sort = {'by': 'percent', 'desc': True}
+        self._build_ui()
+        self.load_board()
+
+    def _build_ui(self):
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+        top = ttk.Frame(self, padding=(8, 8, 8, 0))
+        top.grid(row=0, column=0, sticky='ew')
+        ttk.Button(top, text='Refresh', command=self.load_board).pack(side='left', padx=(0, 6))
+        self.ready_only = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text='Ready to promote only', variable=self.ready_only, command=self._show).pack(side='left', padx=6)
+        self._busy = LoadingIndicator(top)
+        self._busy.pack(side='left', padx=6)
+        self.summary_var = tk.StringVar()
+        ttk.Label(top, textvariable=self.summary_var).pack(side='right')
+
+        list_frame = ttk.Frame(self, padding=8)
+        list_frame.grid(row=1, column=0, sticky='nsew')
+        list_frame.columnconfigure(0, weight=1)
+        list_frame.rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(list_frame, columns=[c[0] for c in self.COLUMNS], show='headings', selectmode='browse')
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self._on_heading(k))
+            self.tree.column(key, width=width, anchor='w' if key in ('name', 'rank', 'next') else 'center')
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        scrollbar.grid(row=0, column=1, sticky='ns')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.missing_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.missing_var, padding=(8, 0, 8, 8), wraplength=900,
+                  justify='left').grid(row=2, column=0, sticky='ew')
+
+    def load_board(self):
+        self._runner.submit(_load_board_for_tab, on_done=self._render_board, indicator=self._busy,
+                            error_message='Could not load the promotion board (see terminal).')
+
+    def _render_board(self, result):
+        self._board, self._req_names = result
+        self._by_id = {s.cadet_id: s for s in self._board}
+        self._show()
+
+    def _on_heading(self, key):
+        if self._sort['by'] == key:
+            self._sort['desc'] = not self._sort['desc']
+        else:
+            self._sort = {'by': key, 'desc': key not in ('name', 'cap_id')}
+        self._show()
+
+    def _show(self):
+        rows = ready_to_promote(self._board) if self.ready_only.get() else self._board
+        rows = sort_board(rows, self._sort['by'], self._sort['desc'])
+        fill_tree(self.tree, rows, key=lambda s: s.cadet_id,
+                  values=lambda s: (f'{s.last_name}, {s.first_name}', s.cap_id,
+                                    s.current_rank.rank_name if s.current_rank else '',
+                                    s.next_rank.rank_name if s.next_rank else '(top rank)',
+                                    s.completed_count, s.required_count, f'{s.percent:.0f}%'))
+        ready = sum(1 for s in self._board if s.ready)
+        self.summary_var.set(f'{ready} of {len(self._board)} cadets ready to promote')
+        self.missing_var.set('')
+
+    def _on_select(self, _event=None):
+        sel = self.tree.selection()
+        status = self._by_id.get(int(sel[0])) if sel else None
+        if status is None or status.next_rank is None:
+            self.missing_var.set('')
+            return
+        if status.stored_counts and status.completed_count < status.required_count:
+            # counts came from the progress table; look the missing ones up for this cadet only
+            self.missing_var.set('Loading missing requirements...')
+            self._runner.submit(progress.missing_requirements, status.cadet_id, status.next_rank.rank_id,
+                                on_done=lambda ids, s=status: self._show_missing(s, ids), indicator=self._busy,
+                                error_message='Could not load missing requirements (see terminal).')
+            return
+        self._show_missing(status, status.missing)
+
+    def _show_missing(self, status, missing_ids):
+        sel = self.tree.selection()
+        if not sel or int(sel[0]) != status.cadet_id:
+            return
+        missing = sorted(self._req_names.get(r, f'#{r}') for r in missing_ids)
+        if missing:
+            self.missing_var.set(f'Still needed for {status.next_rank.rank_name}: ' + ', '.join(missing))
+        else:
+            self.missing_var.set(f'All requirements for {status.next_rank.rank_name} are complete.')
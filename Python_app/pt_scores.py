@@ -0,0 +1,626 @@
+"""
+PT (physical fitness) scores: test-night entry, CSV import, standards scoring and trends.
+
+pt_score (pushups, situps, mile_run per cadet and test date) had no code path. This module adds:
+
+  save_test_night()   the whole sheet of a test night saved in one transaction (one multi-row
+                      upsert; migration 0005 makes (cadet, test_date) unique)
+  import_pt_csv()     streams a CSV file row by row, resolving CAP IDs and upserting
+                      PT_IMPORT_BATCH rows at a time inside a single transaction, so large
+                      files never sit in memory; dry_run=True only reports what would happen
+  score_results()     maps raw results to pass/fail against age/sex standards and to
+                      percentiles within the same standards group, vectorized with NumPy over
+                      the full history
+  TREND_CACHE         every cadet's scored results keyed by test date, computed in one pass
+                      and reused by the trend view until the next save or import
+
+The schema has no flights, so the test-night sheet lists the roster (filtered by name or CAP
+ID). Sex is stored in cadet.sex (migration 0005) and can be set on the sheet. mile_run is in
+decimal minutes; the sheet and the CSV importer also accept m:ss.
+
+Standards: DEFAULT_STANDARDS is a starting point only. Point CADET_PT_STANDARDS at a CSV with
+columns sex,min_age,max_age,pushups,situps,mile_run (sex M, F or blank for either) to use the
+unit's current table.
+
+Loading, saving and importing refuse to run until migration 0005 has added the unique key the
+upserts rely on. Data functions raise on DB errors; run them through tasks.TaskRunner. PTFrame is the tab shown
+in the main window.
+
+Requires: mysql-connector-python, numpy (scoring and trends)
+"""
+
+import csv
+import datetime
+import logging
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from db import checkout_connection
+from roster import ROSTER, ensure_loaded as ensure_roster_loaded
+from tasks import get_runner, LoadingIndicator
+from treefill import fill_tree
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+# CSV rows per CAP ID lookup and upsert batch
+PT_IMPORT_BATCH = 500
+# most cadets shown on the test-night sheet at once (entries survive re-filtering)
+SHEET_MAX_ROWS = 150
+# wait for a pause in typing before rebuilding the sheet for a new filter
+FILTER_DEBOUNCE_MS = 250
+STANDARDS_FILE = os.environ.get('CADET_PT_STANDARDS', '')
+
+# (sex or None for either, min age, max age, min pushups, min situps, max mile minutes)
+DEFAULT_STANDARDS = [
+    ('M', 0, 13, 10, 20, 11.5),
+    ('M', 14, 15, 14, 25, 10.5),
+    ('M', 16, 17, 16, 28, 10.0),
+    ('M', 18, 120, 18, 30, 10.0),
+    ('F', 0, 13, 6, 18, 13.0),
+    ('F', 14, 15, 7, 20, 12.5),
+    ('F', 16, 17, 8, 22, 12.5),
+    ('F', 18, 120, 8, 22, 12.5),
+]
+
+_SEX_CODES = {'M': 1, 'F': 2}
+
+
+def parse_mile(text):
+    """Mile time as decimal minutes from '9.5' or '9:30'. Raises ValueError."""
+    text = str(text).strip()
+    if ':' in text:
+        minutes, seconds = text.split(':', 1)
+        secs = float(seconds)
+        if not 0 <= secs < 60:
+            raise ValueError(f'bad seconds in {text!r}')
+        return round(int(minutes) + secs / 60.0, 2)
+    return round(float(text), 2)
+
+
+def format_mile(minutes):
+    if minutes is None:
+        return ''
+    minutes = float(minutes)
+    whole = int(minutes)
+    return f'{whole}:{int(round((minutes - whole) * 60)):02d}'
+
+
+def load_standards(path=None):
+    """Standards rows from `path` (or CADET_PT_STANDARDS), else DEFAULT_STANDARDS."""
+    path = path if path is not None else STANDARDS_FILE
+    if not path:
+        return list(DEFAULT_STANDARDS)
+    rows = []
+    with open(path, newline='', encoding='utf-8') as fh:
+        for row in csv.DictReader(fh):
+            sex = (row.get('sex') or '').strip().upper() or None
+            rows.append((sex, int(row['min_age']), int(row['max_age']), int(row['pushups']),
+                         int(row['situps']), parse_mile(row['mile_run'])))
+    return rows
+
+
+_has_sex = None
+
+
+def _sex_column(cur):
+    """True once migration 0005 has added cadet.sex (checked once per process)."""
+    global _has_sex
+    if _has_sex is None:
+        cur.execute("SELECT COUNT(*) FROM information_schema.columns "
+                    "WHERE table_schema = DATABASE() AND table_name = 'cadet' AND column_name = 'sex'")
+        _has_sex = bool(cur.fetchone()[0])
+    return _has_sex
+
+
+_available = None
+
+
+def pt_key_available(cur):
+    """True once migration 0005 has made (cadet, test_date) unique (checked once per process)."""
+    global _available
+    if _available is None:
+        cur.execute("SELECT COUNT(*) FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = 'pt_score' "
+                    "AND index_name = 'uq_pt_score_cadet_date'")
+        _available = bool(cur.fetchone()[0])
+    return _available
+
+
+def _require_key(cur):
+    # without the key every upsert below would insert a duplicate row
+    if not pt_key_available(cur):
+        raise RuntimeError('pt_score has no (cadet, test_date) key; run python migrate.py first')
+
+
+# --- entry ----------------------------------------------------------------
+
+_UPSERT = '''
+    INSERT INTO pt_score (cadet_cadet_id, test_date, pushups, situps, mile_run, notes)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE pushups = VALUES(pushups), situps = VALUES(situps),
+                            mile_run = VALUES(mile_run), notes = VALUES(notes)
+'''
+
+
+def fetch_sheet(test_date):
+    """Roster rows, {cadet_id: sex} and {cadet_id: (pushups, situps, mile_run, notes)} already
+    entered for test_date."""
+    roster = ensure_roster_loaded()
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        _require_key(cur)
+        sexes = {}
+        if _sex_column(cur):
+            cur.execute('SELECT cadet_id, sex FROM cadet WHERE sex IS NOT NULL')
+            sexes = dict(cur.fetchall())
+        cur.execute('SELECT cadet_cadet_id, pushups, situps, mile_run, notes FROM pt_score WHERE test_date = %s', (test_date,))
+        existing = {r[0]: r[1:] for r in cur.fetchall()}
+    finally:
+        conn.close()
+    return roster.search(''), sexes, existing
+
+
+def save_test_night(test_date, entries, sexes=()):
+    """Upsert one test night in a single transaction.
+
+    entries: [(cadet_id, pushups, situps, mile_run, notes)]; sexes: [(cadet_id, sex or None)]
+    for cadets whose sex changed on the sheet, with or without results. Returns
+    (results saved, sexes saved).
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        _require_key(cur)
+        if entries:
+            cur.executemany(_UPSERT, [(cid, test_date, p, s, m, notes or None) for cid, p, s, m, notes in entries])
+        if sexes and _sex_column(cur):
+            cur.executemany('UPDATE cadet SET sex = %s WHERE cadet_id = %s', [(sex, cid) for cid, sex in sexes])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    TREND_CACHE.invalidate()
+    return len(entries), len(sexes)
+
+
+@dataclass
+class PTImportReport:
+    """What a CSV import did (or, for a dry run, would do)."""
+    dry_run: bool
+    imported: int = 0
+    unknown: List[Tuple[int, str]] = field(default_factory=list)    # (csv line, CAP ID)
+    invalid: List[Tuple[int, str]] = field(default_factory=list)    # (csv line, reason)
+
+    def summary(self):
+        verb = 'Would import' if self.dry_run else 'Imported'
+        lines = [f'{verb} {self.imported} result(s).']
+        if self.unknown:
+            shown = ', '.join(f'line {n}: {c}' for n, c in self.unknown[:10])
+            lines.append(f'{len(self.unknown)} unknown CAP ID(s): {shown}')
+        if self.invalid:
+            shown = ', '.join(f'line {n}: {why}' for n, why in self.invalid[:10])
+            lines.append(f'{len(self.invalid)} invalid row(s): {shown}')
+        return '\n'.join(lines)
+
+
+def _parse_csv_row(row):
+    cap_id = (row.get('cap_id') or row.get('capid') or '').strip()
+    if not cap_id.isdigit():
+        raise ValueError(f'CAP ID {cap_id!r}')
+    test_date = datetime.datetime.strptime((row.get('test_date') or row.get('date') or '').strip(), '%Y-%m-%d').date()
+    pushups = int(row['pushups'])
+    situps = int(row['situps'])
+    mile = parse_mile(row['mile_run'])
+    notes = (row.get('notes') or '').strip() or None
+    return int(cap_id), test_date, pushups, situps, mile, notes
+
+
+def import_pt_csv(path, dry_run=False, batch=PT_IMPORT_BATCH):
+    """Stream cap_id,test_date,pushups,situps,mile_run[,notes] rows from `path` into pt_score.
+
+    All batches share one transaction: a failure leaves the table untouched. Returns a
+    PTImportReport.
+    """
+    report = PTImportReport(dry_run=dry_run)
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        _require_key(cur)
+
+        def flush(pending):
+            cap_ids = sorted({p[1][0] for p in pending})
+            cur.execute('SELECT cap_id, cadet_id FROM cadet WHERE cap_id IN (%s)' % ', '.join(['%s'] * len(cap_ids)), tuple(cap_ids))
+            by_cap = dict(cur.fetchall())
+            rows = []
+            for line_no, (cap_id, test_date, p, s, m, notes) in pending:
+                cadet_id = by_cap.get(cap_id)
+                if cadet_id is None:
+                    report.unknown.append((line_no, str(cap_id)))
+                else:
+                    rows.append((cadet_id, test_date, p, s, m, notes))
+            if rows and not dry_run:
+                cur.executemany(_UPSERT, rows)
+            report.imported += len(rows)
+
+        with open(path, newline='', encoding='utf-8') as fh:
+            pending = []
+            for line_no, row in enumerate(csv.DictReader(fh), start=2):
+                try:
+                    pending.append((line_no, _parse_csv_row(row)))
+                except (KeyError, ValueError, TypeError) as e:
+                    report.invalid.append((line_no, str(e)))
+                    continue
+                if len(pending) >= batch:
+                    flush(pending)
+                    pending = []
+            if pending:
+                flush(pending)
+        if not dry_run:
+            conn.commit()
+            TREND_CACHE.invalidate()
+        return report
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+# --- scoring --------------------------------------------------------------
+
+def score_results(age, sex, pushups, situps, mile, standards):
+    """Score arrays of results against `standards` (rows as in DEFAULT_STANDARDS).
+
+    age: int array (-1 unknown); sex: 'M'/'F'/None per row. Returns a dict of arrays:
+      group     index of the matching standards row, -1 when none applies
+      passed    1 pass, 0 fail, -1 no standard
+      pct_pushups, pct_situps, pct_mile
+                percentile (0-100, higher is better) within the same standards group over
+                every result given; results without a group are ranked against all results
+    """
+    age = np.asarray(age, dtype=np.int64)
+    sex_code = np.array([_SEX_CODES.get(s, 0) for s in sex], dtype=np.int64)
+    pushups = np.asarray(pushups, dtype=np.float64)
+    situps = np.asarray(situps, dtype=np.float64)
+    mile = np.asarray(mile, dtype=np.float64)
+    n = len(age)
+
+    if standards:
+        std = list(zip(*standards))
+        std_sex = np.array([_SEX_CODES.get(s, 0) for s in std[0]], dtype=np.int64)
+        std_min, std_max = np.array(std[1]), np.array(std[2])
+        std_push, std_sit, std_mile = np.array(std[3], float), np.array(std[4], float), np.array(std[5], float)
+        # (results x standards) match matrix; the first matching row wins
+        match = (((std_sex == 0)[None, :] | (std_sex[None, :] == sex_code[:, None]))
+                 & (age[:, None] >= std_min[None, :]) & (age[:, None] <= std_max[None, :]))
+        group = np.where(match.any(axis=1), match.argmax(axis=1), -1)
+        g = np.maximum(group, 0)
+        ok = (pushups >= std_push[g]) & (situps >= std_sit[g]) & (mile <= std_mile[g])
+        passed = np.where(group >= 0, ok.astype(np.int8), -1)
+    else:
+        group = np.full(n, -1)
+        passed = np.full(n, -1, dtype=np.int8)
+
+    pct = {k: np.zeros(n) for k in ('pct_pushups', 'pct_situps', 'pct_mile')}
+    for grp in np.unique(group):
+        rows = group == grp
+        ref = np.ones(n, dtype=bool) if grp < 0 else rows
+        for key, values, lower_is_better in (('pct_pushups', pushups, False), ('pct_situps', situps, False),
+                                             ('pct_mile', mile, True)):
+            ref_sorted = np.sort(values[ref])
+            if lower_is_better:
+                beaten = len(ref_sorted) - np.searchsorted(ref_sorted, values[rows], side='left')
+            else:
+                beaten = np.searchsorted(ref_sorted, values[rows], side='right')
+            pct[key][rows] = 100.0 * beaten / len(ref_sorted)
+    return dict(group=group, passed=passed, **pct)
+
+
+class PTResult(NamedTuple):
+    test_date: datetime.date
+    pushups: int
+    situps: int
+    mile_run: float
+    passed: Optional[bool]          # None when no standard applies (unknown age or sex)
+    pct_pushups: float
+    pct_situps: float
+    pct_mile: float
+
+
+class PTTrendCache:
+    """Scored results for every cadet, keyed by test date. The whole history is scored in one
+    vectorized pass on first use; saves and imports invalidate it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_cadet = None     # cadet_id -> {test_date: PTResult}
+        self._gen = 0             # bumped on invalidate so a load racing a save is not kept
+
+    def invalidate(self):
+        with self._lock:
+            self._by_cadet = None
+            self._gen += 1
+
+    def _load(self):
+        t0 = time.perf_counter()
+        conn = checkout_connection()
+        try:
+            cur = conn.cursor()
+            sex = 'c.sex' if _sex_column(cur) else 'NULL'
+            cur.execute(f'''
+                SELECT p.cadet_cadet_id, p.test_date, p.pushups, p.situps, p.mile_run,
+                       COALESCE(TIMESTAMPDIFF(YEAR, c.date_of_birth, p.test_date), -1), {sex}
+                FROM pt_score p
+                JOIN cadet c ON c.cadet_id = p.cadet_cadet_id
+            ''')
+            rows = cur.fetchall()
+        finally:
+            conn.close()
+        by_cadet = {}
+        if rows:
+            cols = list(zip(*rows))
+            scored = score_results(cols[5], cols[6], cols[2], cols[3], [float(m) for m in cols[4]], load_standards())
+            for i, r in enumerate(rows):
+                passed = int(scored['passed'][i])
+                by_cadet.setdefault(r[0], {})[r[1]] = PTResult(
+                    r[1], r[2], r[3], float(r[4]), None if passed < 0 else bool(passed),
+                    float(scored['pct_pushups'][i]), float(scored['pct_situps'][i]), float(scored['pct_mile'][i]))
+        logging.info('PT history: %d results scored in %.0f ms', len(rows), (time.perf_counter() - t0) * 1000.0)
+        return by_cadet
+
+    def trend(self, cadet_id):
+        """[PTResult] for a cadet, oldest first. Loads and scores the history if needed (worker
+        thread); raises on DB errors."""
+        if np is None:
+            raise RuntimeError('numpy is not installed (pip install numpy)')
+        with self._lock:
+            by_cadet, gen = self._by_cadet, self._gen
+        if by_cadet is None:
+            by_cadet = self._load()
+            with self._lock:
+                if self._gen == gen:
+                    self._by_cadet = by_cadet
+        dates = by_cadet.get(cadet_id, {})
+        return [dates[d] for d in sorted(dates)]
+
+
+TREND_CACHE = PTTrendCache()
+
+
+def cadet_trend(cap_id):
+    """(roster row, [PTResult]) for a CAP ID, or (None, []) if no cadet has it."""
+    roster = ensure_roster_loaded()
+    row = roster.by_capid(cap_id)
+    if row is None:
+        return None, []
+    return row, TREND_CACHE.trend(row[0])
+
+
+# --- UI -------------------------------------------------------------------
+
+class PTFrame(ttk.Frame):
+    """PT tab: test-night entry sheet, CSV import and per-cadet trend."""
+
+    FIELDS = ('sex', 'pushups', 'situps', 'mile', 'notes')
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self._runner = get_runner(self)
+        self._roster = []
+        self._vars = {}         # cadet_id -> {field: StringVar}; kept across filters
+        self._sexes = {}        # cadet_id -> sex as loaded, to save only changes
+        self._filter_after = None
+        self._build_ui()
+        self.load_sheet()
+
+    def _build_ui(self):
+        nb = ttk.Notebook(self)
+        nb.pack(fill='both', expand=True, padx=8, pady=8)
+
+        # --- test night sheet ---
+        sheet = ttk.Frame(nb, padding=6)
+        nb.add(sheet, text='Test Night')
+        top = ttk.Frame(sheet)
+        top.pack(fill='x')
+        ttk.Label(top, text='Test date').pack(side='left')
+        self.date_var = tk.StringVar(value=datetime.date.today().isoformat())
+        ttk.Entry(top, textvariable=self.date_var, width=12).pack(side='left', padx=(4, 8))
+        ttk.Button(top, text='Load', command=self.load_sheet).pack(side='left')
+        ttk.Label(top, text='Filter').pack(side='left', padx=(12, 0))
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *_: self._on_filter_changed())
+        ttk.Entry(top, textvariable=self.filter_var, width=20).pack(side='left', padx=4)
+        ttk.Button(top, text='Save Sheet', command=self.save_sheet).pack(side='left', padx=(12, 4))
+        ttk.Button(top, text='Import CSV', command=self.import_csv).pack(side='left', padx=4)
+        self._busy = LoadingIndicator(top)
+        self._busy.pack(side='left', padx=6)
+        self.sheet_status = tk.StringVar()
+        ttk.Label(sheet, textvariable=self.sheet_status).pack(anchor='w', pady=(4, 0))
+
+        holder = ttk.Frame(sheet)
+        holder.pack(fill='both', expand=True, pady=(6, 0))
+        self._canvas = tk.Canvas(holder, highlightthickness=0)
+        vsb = ttk.Scrollbar(holder, orient='vertical', command=self._canvas.yview)
+        self._canvas.configure(yscrollcommand=vsb.set)
+        vsb.pack(side='right', fill='y')
+        self._canvas.pack(side='left', fill='both', expand=True)
+        self._grid = ttk.Frame(self._canvas)
+        self._canvas.create_window((0, 0), window=self._grid, anchor='nw')
+        self._grid.bind('<Configure>', lambda e: self._canvas.configure(scrollregion=self._canvas.bbox('all')))
+
+        # --- trends ---
+        trend = ttk.Frame(nb, padding=6)
+        nb.add(trend, text='Trends')
+        ttop = ttk.Frame(trend)
+        ttop.pack(fill='x')
+        ttk.Label(ttop, text='CAP ID').pack(side='left')
+        self.trend_cap_var = tk.StringVar()
+        entry = ttk.Entry(ttop, textvariable=self.trend_cap_var, width=12)
+        entry.pack(side='left', padx=4)
+        entry.bind('<Return>', lambda e: self.show_trend())
+        ttk.Button(ttop, text='Show', command=self.show_trend).pack(side='left', padx=4)
+        self._trend_busy = LoadingIndicator(ttop)
+        self._trend_busy.pack(side='left', padx=6)
+        self.trend_status = tk.StringVar()
+        ttk.Label(trend, textvariable=self.trend_status).pack(anchor='w', pady=(4, 0))
+        cols = (('date', 'Date', 100), ('pushups', 'Push-ups', 80), ('situps', 'Sit-ups', 80), ('mile', 'Mile', 70),
+                ('result', 'Result', 90), ('pct_p', 'Push-up %ile', 90), ('pct_s', 'Sit-up %ile', 90), ('pct_m', 'Mile %ile', 90))
+        self.trend_tv = ttk.Treeview(trend, columns=[c[0] for c in cols], show='headings')
+        for key, title, width in cols:
+            self.trend_tv.heading(key, text=title)
+            self.trend_tv.column(key, width=width, anchor='center')
+        self.trend_tv.pack(fill='both', expand=True, pady=(6, 0))
+
+    # --- sheet ---
+    def _test_date(self):
+        try:
+            return datetime.datetime.strptime(self.date_var.get().strip(), '%Y-%m-%d').date()
+        except ValueError:
+            messagebox.showwarning('PT', 'Test date must be YYYY-MM-DD')
+            return None
+
+    def load_sheet(self):
+        test_date = self._test_date()
+        if test_date is None:
+            return
+        self._runner.submit(fetch_sheet, test_date, on_done=lambda res: self._render_sheet(test_date, res),
+                            indicator=self._busy, error_message='Could not load the PT sheet (see terminal).')
+
+    def _render_sheet(self, test_date, result):
+        roster, sexes, existing = result
+        self._roster = roster
+        self._sexes = sexes
+        self._vars = {}
+        for cadet_id, _cap, _first, _last in roster:
+            vals = existing.get(cadet_id)
+            self._vars[cadet_id] = {
+                'sex': tk.StringVar(value=sexes.get(cadet_id) or ''),
+                'pushups': tk.StringVar(value='' if vals is None else str(vals[0])),
+                'situps': tk.StringVar(value='' if vals is None else str(vals[1])),
+                'mile': tk.StringVar(value='' if vals is None else format_mile(vals[2])),
+                'notes': tk.StringVar(value='' if vals is None else (vals[3] or '')),
+            }
+        self.sheet_status.set(f'{len(existing)} result(s) already entered for {test_date}')
+        self._show_rows()
+
+    def _on_filter_changed(self):
+        if self._filter_after is not None:
+            self.after_cancel(self._filter_after)
+        self._filter_after = self.after(FILTER_DEBOUNCE_MS, self._show_rows)
+
+    def _show_rows(self):
+        self._filter_after = None
+        for child in self._grid.winfo_children():
+            child.destroy()
+        for col, title in enumerate(('CAP ID', 'Name', 'Sex', 'Push-ups', 'Sit-ups', 'Mile (m:ss)', 'Notes')):
+            ttk.Label(self._grid, text=title, font=('TkDefaultFont', 9, 'bold')).grid(row=0, column=col, padx=4, sticky='w')
+        term = self.filter_var.get()
+        rows = ROSTER.search(term, limit=SHEET_MAX_ROWS) if term.strip() else self._roster[:SHEET_MAX_ROWS]
+        for r, (cadet_id, cap_id, first, last) in enumerate(rows, start=1):
+            v = self._vars.get(cadet_id)
+            if v is None:
+                continue
+            ttk.Label(self._grid, text=cap_id).grid(row=r, column=0, padx=4, sticky='w')
+            ttk.Label(self._grid, text=f'{last}, {first}').grid(row=r, column=1, padx=4, sticky='w')
+            ttk.Combobox(self._grid, textvariable=v['sex'], values=('', 'M', 'F'), width=3, state='readonly').grid(row=r, column=2, padx=4)
+            ttk.Entry(self._grid, textvariable=v['pushups'], width=7).grid(row=r, column=3, padx=4)
+            ttk.Entry(self._grid, textvariable=v['situps'], width=7).grid(row=r, column=4, padx=4)
+            ttk.Entry(self._grid, textvariable=v['mile'], width=8).grid(row=r, column=5, padx=4)
+            ttk.Entry(self._grid, textvariable=v['notes'], width=30).grid(row=r, column=6, padx=4)
+        if len(self._roster) > SHEET_MAX_ROWS and not term.strip():
+            ttk.Label(self._grid, text=f'Showing the first {SHEET_MAX_ROWS} cadets; filter to find others.').grid(
+                row=len(rows) + 1, column=0, columnspan=7, sticky='w', pady=6)
+
+    def save_sheet(self):
+        test_date = self._test_date()
+        if test_date is None:
+            return
+        entries, sexes, problems = [], [], []
+        for cadet_id, cap_id, first, last in self._roster:
+            v = self._vars[cadet_id]
+            sex = v['sex'].get() or None
+            if sex != self._sexes.get(cadet_id):
+                sexes.append((cadet_id, sex))
+            raw = [v['pushups'].get().strip(), v['situps'].get().strip(), v['mile'].get().strip()]
+            if not any(raw):
+                continue
+            try:
+                entries.append((cadet_id, int(raw[0]), int(raw[1]), parse_mile(raw[2]), v['notes'].get().strip()))
+            except ValueError:
+                problems.append(f'{last}, {first} ({cap_id})')
+        if problems:
+            messagebox.showwarning('PT', 'Push-ups, sit-ups and mile are all required and must be numbers for:\n' + '\n'.join(problems[:15]))
+            return
+        if not entries and not sexes:
+            messagebox.showinfo('PT', 'Nothing to save')
+            return
+
+        def saved(counts):
+            for cadet_id, sex in sexes:
+                if sex:
+                    self._sexes[cadet_id] = sex
+                else:
+                    self._sexes.pop(cadet_id, None)
+            results, sex_count = counts
+            self.sheet_status.set(f'Saved {results} result(s) for {test_date}'
+                                  + (f' and sex for {sex_count} cadet(s)' if sex_count else ''))
+
+        self._runner.submit(save_test_night, test_date, entries, sexes, on_done=saved, indicator=self._busy,
+                            error_message='Could not save the PT sheet (see terminal).')
+
+    def import_csv(self):
+        path = filedialog.askopenfilename(filetypes=[('CSV files', '*.csv'), ('All files', '*.*')])
+        if not path:
+            return
+
+        def imported(report):
+            messagebox.showinfo('Done', report.summary())
+            self.load_sheet()
+
+        def previewed(report):
+            # dry run first; only write once the user has seen what will change
+            if not messagebox.askyesno('Import preview', report.summary() + '\n\nApply this import?'):
+                return
+            self._runner.submit(import_pt_csv, path, on_done=imported, indicator=self._busy,
+                                error_message='PT CSV import failed (see terminal).')
+
+        self._runner.submit(import_pt_csv, path, True, on_done=previewed, indicator=self._busy,
+                            error_message='Could not preview PT CSV import (see terminal).')
+
+    # --- trends ---
+    def show_trend(self):
+        cap = self.trend_cap_var.get().strip()
+        if not cap.isdigit():
+            messagebox.showwarning('PT', 'CAP ID must be a number')
+            return
+        self._runner.submit(cadet_trend, int(cap), on_done=self._render_trend, indicator=self._trend_busy,
+                            error_message='Could not load PT history (see terminal).')
+
+    def _render_trend(self, result):
+        row, results = result
+        if row is None:
+            self.trend_status.set('No cadet with that CAP ID')
+            fill_tree(self.trend_tv, [])
+            return
+        label = f'{row[3]}, {row[2]}: {len(results)} test(s)'
+        if len(results) > 1:
+            first, last = results[0], results[-1]
+            label += (f'; since {first.test_date}: push-ups {last.pushups - first.pushups:+d}, '
+                      f'sit-ups {last.situps - first.situps:+d}, mile {last.mile_run - first.mile_run:+.2f} min')
+        self.trend_status.set(label)
+        fill_tree(self.trend_tv, results, key=lambda r: r.test_date.isoformat(),
+                  values=lambda r: (r.test_date, r.pushups, r.situps, format_mile(r.mile_run),
+                                    {True: 'Pass', False: 'Fail', None: 'No standard'}[r.passed],
+                                    f'{r.pct_pushups:.0f}', f'{r.pct_situps:.0f}', f'{r.pct_mile:.0f}'))
@@ -2,6 +2,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
 import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
 try:
     from ui_theme import apply_accent, setup as theme_setup
 except Exception:
@@ -10,31 +14,17 @@ except Exception:
     def theme_setup(_root, dark=False):
         return
 
-# DB helper (use same credentials as other modules)
-try:
-    import mysql.connector
-    from mysql.connector import Error
-except Exception:
-    mysql = None
-
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'Michael',
-    'password': 'hogbog89',
-    'database': 'cadet_tracker',
-}
+# DB helper (shared connection pool, same credentials as other modules)
+from db import get_connection, checkout_connection
+from tasks import get_runner, LoadingIndicator
 
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
-
-def get_connection():
-    try:
-        return mysql.connector.connect(**DB_CONFIG)
-    except Exception as e:
-        logging.exception('DB connect failed')
-        messagebox.showerror('DB Error', f'Could not connect to DB:\n{e}')
-        return None
+# rows per page in the Reports manager
+REPORT_PAGE_SIZE = 100
+# seconds a cached report count is shown before it is recounted in the background
+REPORT_COUNT_TTL = 60.0
 
 
 class ReportForm(tk.Toplevel):
@@ -290,6 +280,7 @@ class ReportFormFrame(ttk.Frame):
         self.selected_cadet = selected_cadet
         self.report_id = report_id
         self._on_close_cb = on_close
+        self._runner = get_runner(self)
         self._build_ui()
         if self.report_id:
             self._load_report(self.report_id)
@@ -350,54 +341,43 @@ class ReportFormFrame(ttk.Frame):
 
         btn_frame = ttk.Frame(frm)
         btn_frame.grid(row=8, column=0, columnspan=2, pady=(12,0))
-        btn_save = ttk.Button(btn_frame, text='Save Report', command=self._save_and_close)
-        btn_save.grid(row=0, column=0, padx=6)
+        self.btn_save = ttk.Button(btn_frame, text='Save Report', command=self._save_and_close)
+        self.btn_save.grid(row=0, column=0, padx=6)
         try:
-            apply_accent(btn_save)
+            apply_accent(self.btn_save)
         except Exception:
             pass
         ttk.Button(btn_frame, text='Clear', command=self._clear_form).grid(row=0, column=1, padx=6)
+        self._busy = LoadingIndicator(btn_frame)
+        self._busy.grid(row=0, column=2, padx=6)
 
-    # Shared logic: reuse ReportForm's methods by copying, adapted for frame
+    # Shared logic: reuse ReportForm's methods by copying, adapted for frame.
+    # DB work runs on the shared TaskRunner; the *_row helpers below do the queries.
     def _autofill_cadet(self):
         text = self.cadet_var.get().strip()
         if not text:
             return
         if '(' in text and ')' in text:
             return
-        conn = get_connection()
-        if not conn:
-            return
-        try:
-            cur = conn.cursor()
-            if text.isdigit():
-                capid = int(text)
-                cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE cap_id = %s LIMIT 1', (capid,))
-                row = cur.fetchone()
-                if row:
-                    self.cadet_var.set(f"{row[2]} {row[3]} ({row[1]})")
-                    return
-            cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE last_name LIKE %s ORDER BY last_name, first_name LIMIT 1', (f'%{text}%',))
-            row = cur.fetchone()
-            if row:
+
+        def found(row):
+            # ignore the result if the user kept typing meanwhile
+            if row and self.cadet_var.get().strip() == text:
                 self.cadet_var.set(f"{row[2]} {row[3]} ({row[1]})")
-        except Exception:
-            logging.exception('Error auto-filling cadet')
-        finally:
+
+        self._runner.submit(find_cadet_row, text, on_done=found, indicator=self._busy,
+                            error_message='Could not look up cadet (see terminal).')
+
+    def _save_and_close(self):
+        self._save_report_internal(on_saved=self._saved)
+
+    def _saved(self):
+        if callable(self._on_close_cb):
             try:
-                conn.close()
+                self._on_close_cb()
             except Exception:
                 pass
 
-    def _save_and_close(self):
-        ok = self._save_report_internal()
-        if ok:
-            if callable(self._on_close_cb):
-                try:
-                    self._on_close_cb()
-                except Exception:
-                    pass
-
     def _clear_form(self):
         try:
             self.cadet_var.set('')
@@ -413,39 +393,27 @@ class ReportFormFrame(ttk.Frame):
         except Exception:
             pass
 
-    def _save_report_internal(self) -> bool:
+    def _save_report_internal(self, on_saved=None) -> bool:
+        """Validate the form and save it in the background.
+
+        Returns False when validation fails; otherwise the save is queued and on_saved() runs on
+        the UI thread once it has been committed.
+        """
         cadet_text = self.cadet_var.get().strip()
         if not cadet_text:
             messagebox.showerror('Validation', 'Cadet field is required. Please enter a CAP ID or name.')
             return False
-        cadet_id = None
+        capid_val = None
         if '(' in cadet_text and ')' in cadet_text:
-            try:
-                inside = cadet_text.split('(')[-1].split(')')[0]
-                if inside.isdigit():
-                    capid_val = int(inside)
-                    conn = get_connection()
-                    if conn:
-                        try:
-                            cur = conn.cursor()
-                            cur.execute('SELECT cadet_id FROM cadet WHERE cap_id = %s LIMIT 1', (capid_val,))
-                            rr = cur.fetchone()
-                            if rr:
-                                cadet_id = rr[0]
-                        finally:
-                            try:
-                                conn.close()
-                            except Exception:
-                                pass
-            except Exception:
-                pass
-        if not cadet_id:
+            inside = cadet_text.split('(')[-1].split(')')[0]
+            if inside.isdigit():
+                capid_val = int(inside)
+        if capid_val is None:
             messagebox.showerror('Validation', 'Could not find cadet in database. Please enter a valid CAP ID or use the auto-fill.')
             return False
 
         ui_type = self.type_var.get()
         rtype = 'Positive' if ui_type.lower() in ('good', 'positive') else 'Negative'
-        title = self.title_var.get().strip() or None
         desc = self.desc_text.get('1.0', 'end').strip() or ''
         witnesses_raw = self.witness_text.get('1.0', 'end').strip()
         witnesses = [w.strip() for w in witnesses_raw.splitlines() if w.strip()]
@@ -467,127 +435,371 @@ class ReportFormFrame(ttk.Frame):
             return False
         resolved = 1 if self.resolved_var.get() else 0
         res_by = self.res_by_var.get().strip() or None
-        conn = get_connection()
-        if not conn:
-            return False
-        try:
-            cur = conn.cursor()
+
+        def done(rid):
+            self.btn_save.state(['!disabled'])
+            if rid is None:
+                messagebox.showerror('Validation', 'Could not find cadet in database. Please enter a valid CAP ID or use the auto-fill.')
+                return
             if self.report_id:
-                cur.execute('''UPDATE report SET report_type=%s, description=%s, created_by=%s, cadet_cadet_id=%s, Incident_date=%s, resolved=%s, resolved_by=%s WHERE report_id = %s''',
-                            (rtype, desc, reporter, cadet_id, report_date, resolved, res_by, self.report_id))
-                conn.commit()
-                messagebox.showinfo('Saved', f'Report updated (id {self.report_id})')
-                return True
-            cur.execute('''INSERT INTO report (report_type, description, created_by, cadet_cadet_id, Incident_date, resolved, resolved_by) VALUES (%s,%s,%s,%s,%s,%s,%s)''',
-                        (rtype, desc, reporter, cadet_id, report_date, resolved, res_by))
-            rid = cur.lastrowid
-            conn.commit()
-            messagebox.showinfo('Saved', f'Report saved (id {rid})')
-            return True
-        except Exception:
-            conn.rollback()
-            logging.exception('Error saving report')
+                messagebox.showinfo('Saved', f'Report updated (id {rid})')
+            else:
+                messagebox.showinfo('Saved', f'Report saved (id {rid})')
+            if on_saved:
+                on_saved()
+
+        def failed(_exc):
+            self.btn_save.state(['!disabled'])
             messagebox.showerror('DB Error', 'Could not save report (see terminal).')
-            return False
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+
+        self.btn_save.state(['disabled'])
+        self._runner.submit(save_report_row, self.report_id, capid_val, rtype, desc, reporter, report_date, resolved, res_by,
+                            on_done=done, on_error=failed, indicator=self._busy)
+        return True
 
     def _load_report(self, report_id: int):
-        conn = get_connection()
-        if not conn:
+        self._runner.submit(load_report_row, report_id, on_done=self._render_report, indicator=self._busy,
+                            error_message='Could not load report (see terminal).')
+
+    def _render_report(self, result):
+        if not result:
             return
-        try:
-            cur = conn.cursor()
-            cur.execute('SELECT cadet_cadet_id, report_type, description, created_by, Incident_date, resolved, resolved_by FROM report WHERE report_id = %s', (report_id,))
-            row = cur.fetchone()
-            if not row:
-                return
-            cadet_id, rtype, desc, reporter, report_date, resolved, res_by = row
-            # set fields
-            if cadet_id:
-                # try to lookup capid/name
-                try:
-                    cur.execute('SELECT cap_id, first_name, last_name FROM cadet WHERE cadet_id = %s', (cadet_id,))
-                    c = cur.fetchone()
-                    if c:
-                        self.cadet_var.set(f"{c[1]} {c[2]} ({c[0]})")
-                except Exception:
-                    pass
-            # map DB enum to UI choices
-            if rtype and rtype.lower() == 'positive':
-                self.type_var.set('Good')
+        row, cadet = result
+        cadet_id, rtype, desc, reporter, report_date, resolved, res_by = row
+        if cadet:
+            self.cadet_var.set(f"{cadet[1]} {cadet[2]} ({cadet[0]})")
+        # map DB enum to UI choices
+        if rtype and rtype.lower() == 'positive':
+            self.type_var.set('Good')
+        else:
+            self.type_var.set('Bad')
+        main_desc, witness_block, res_block = split_description(desc)
+        # set description and witness/resolution fields
+        self.desc_text.delete('1.0', 'end')
+        self.desc_text.insert('1.0', main_desc)
+        self.witness_text.delete('1.0', 'end')
+        if witness_block:
+            self.witness_text.insert('1.0', witness_block)
+        self.res_notes.delete('1.0', 'end')
+        if res_block:
+            self.res_notes.insert('1.0', res_block)
+        self.reporter_var.set(reporter or '')
+        self.date_var.set(report_date.isoformat() if isinstance(report_date, datetime.date) else (report_date or ''))
+        self.resolved_var.set(1 if resolved else 0)
+        self.res_by_var.set(res_by or '')
+
+
+def split_description(desc):
+    """Split a stored description into (main text, witnesses block, resolution notes block).
+
+    Witnesses and resolution notes are appended to the description on save since the schema
+    has no separate columns for them.
+    """
+    main_desc = desc or ''
+    witness_block = ''
+    res_block = ''
+    if main_desc:
+        # extract witnesses block if present
+        if '\n\nWitnesses:\n' in main_desc:
+            main_desc, rest = main_desc.split('\n\nWitnesses:\n', 1)
+            # rest may also contain resolution notes
+            if '\n\nResolution Notes:\n' in rest:
+                witness_block, res_block = rest.split('\n\nResolution Notes:\n', 1)
             else:
-                self.type_var.set('Bad')
-            # description may contain appended witnesses and/or resolution notes; try to split them out
-            main_desc = desc or ''
-            witness_block = ''
-            res_block = ''
-            if main_desc:
-                # extract witnesses block if present
-                if '\n\nWitnesses:\n' in main_desc:
-                    main_desc, rest = main_desc.split('\n\nWitnesses:\n', 1)
-                    # rest may also contain resolution notes
-                    if '\n\nResolution Notes:\n' in rest:
-                        witness_block, res_block = rest.split('\n\nResolution Notes:\n', 1)
-                    else:
-                        witness_block = rest
-                else:
-                    # maybe resolution notes appended directly
-                    if '\n\nResolution Notes:\n' in main_desc:
-                        main_desc, res_block = main_desc.split('\n\nResolution Notes:\n', 1)
-            # set description and witness/resolution fields
-            self.desc_text.delete('1.0', 'end')
-            self.desc_text.insert('1.0', main_desc)
-            self.witness_text.delete('1.0', 'end')
-            if witness_block:
-                self.witness_text.insert('1.0', witness_block)
-            self.res_notes.delete('1.0', 'end')
-            if res_block:
-                self.res_notes.insert('1.0', res_block)
-            self.reporter_var.set(reporter or '')
-            self.date_var.set(report_date.isoformat() if isinstance(report_date, datetime.date) else (report_date or ''))
-            self.resolved_var.set(1 if resolved else 0)
-            self.res_by_var.set(res_by or '')
-            # resolution notes already set above from parsed description (res_block)
-            # no separate witness table in new schema; witnesses may be embedded in description
-        except Exception:
-            logging.exception('Error loading report')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+                witness_block = rest
+        elif '\n\nResolution Notes:\n' in main_desc:
+            # maybe resolution notes appended directly
+            main_desc, res_block = main_desc.split('\n\nResolution Notes:\n', 1)
+    return main_desc, witness_block, res_block
+
+
+# --- background helpers (run through tasks.TaskRunner; they raise instead of showing dialogs) ---
+
+def find_cadet_row(text):
+    """Resolve a CAP ID or (partial) last name to (cadet_id, cap_id, first_name, last_name) or None."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        # Try as CAP ID first (numeric)
+        if text.isdigit():
+            cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE cap_id = %s LIMIT 1', (int(text),))
+            row = cur.fetchone()
+            if row:
+                return row
+        cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet WHERE last_name LIKE %s ORDER BY last_name, first_name LIMIT 1', (f'%{text}%',))
+        return cur.fetchone()
+    finally:
+        conn.close()
+
+
+def save_report_row(report_id, capid, rtype, desc, reporter, report_date, resolved, res_by):
+    """Insert or update a report for the cadet with `capid`.
+
+    Returns the report id, or None when no cadet has that CAP ID.
+    """
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT cadet_id FROM cadet WHERE cap_id = %s LIMIT 1', (capid,))
+        rr = cur.fetchone()
+        if not rr:
+            return None
+        cadet_id = rr[0]
+        if report_id:
+            cur.execute('''UPDATE report SET report_type=%s, description=%s, created_by=%s, cadet_cadet_id=%s, Incident_date=%s, resolved=%s, resolved_by=%s WHERE report_id = %s''',
+                        (rtype, desc, reporter, cadet_id, report_date, resolved, res_by, report_id))
+            conn.commit()
+            return report_id
+        cur.execute('''INSERT INTO report (report_type, description, created_by, cadet_cadet_id, Incident_date, resolved, resolved_by) VALUES (%s,%s,%s,%s,%s,%s,%s)''',
+                    (rtype, desc, reporter, cadet_id, report_date, resolved, res_by))
+        rid = cur.lastrowid
+        conn.commit()
+        return rid
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+        REPORT_COUNTS.invalidate()
+
+
+def load_report_row(report_id: int):
+    """Return (report_row, (cap_id, first_name, last_name) or None), or None if the report is gone."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('''SELECT r.cadet_cadet_id, r.report_type, r.description, r.created_by, r.Incident_date, r.resolved, r.resolved_by,
+                              c.cap_id, c.first_name, c.last_name
+                       FROM report r LEFT JOIN cadet c ON c.cadet_id = r.cadet_cadet_id
+                       WHERE r.report_id = %s''', (report_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        cadet = row[7:10] if row[7] is not None else None
+        return row[:7], cadet
+    finally:
+        conn.close()
+
+
+# --- report list paging ------------------------------------------------------
+# The Reports manager pages through the report table with keyset pagination on
+# (sort column, report_id): each page continues after the last row of the previous one, so
+# deep pages cost the same as the first. Filters combine with AND; migration 0002 adds the
+# indexes they use.
+
+# friendly sort keys -> (DB column, index of the value in a report list row); whitelisted
+# because the column is interpolated into the SQL
+REPORT_SORTS = {
+    'id': ('report_id', 0),
+    'cadet_id': ('cadet_cadet_id', 1),
+    # ENUM: sort and seek on the definition index so ORDER BY and the cursor compare alike
+    'type': ('report_type+0', 2),
+    'title': ('LEFT(description,255)', 3),
+    'date': ('Incident_date', 4),
+    'resolved': ('resolved', 5),
+}
+
+_REPORT_COLUMNS = 'report_id, cadet_cadet_id, report_type, LEFT(description,255), Incident_date, resolved'
+
+
+class ReportRow(NamedTuple):
+    """One row of the report list, with Python types (indexes match _REPORT_COLUMNS)."""
+    report_id: int
+    cadet_id: int
+    report_type: str
+    title: str
+    incident_date: Optional[datetime.date]
+    resolved: bool
+
+    @classmethod
+    def from_db(cls, r):
+        return cls(int(r[0]), int(r[1]), r[2] or '', r[3] or '', r[4], bool(r[5]))
+
+
+# ENUM columns sort by their position in the definition, not alphabetically
+_TYPE_ORDER = {'Positive': 1, 'Negative': 2}
+
+
+def _none_first(value):
+    # MySQL puts NULL before every value ascending (and after them descending)
+    return (value is not None, value if value is not None else datetime.date.min)
+
+
+_ROW_KEYS = {
+    'id': lambda r: r.report_id,
+    'cadet_id': lambda r: r.cadet_id,
+    'type': lambda r: _TYPE_ORDER.get(r.report_type, 0),
+    'title': lambda r: r.title.casefold(),
+    'date': lambda r: _none_first(r.incident_date),
+    'resolved': lambda r: r.resolved,
+}
+
+
+def sort_report_rows(rows, sort_by='date', order='DESC'):
+    """Sort ReportRows in memory in the same order fetch_report_page() would return them.
+
+    Ties are broken on report_id, so the result does not depend on the order rows came in.
+    """
+    key = _ROW_KEYS.get(sort_by, _ROW_KEYS['date'])
+    return sorted(rows, key=lambda r: (key(r), r.report_id), reverse=str(order).upper() != 'ASC')
+
+
+@dataclass(frozen=True)
+class ReportFilter:
+    """Combinable report list filters; None means "any"."""
+    cap_id: Optional[int] = None
+    report_type: Optional[str] = None          # 'Positive' / 'Negative'
+    resolved: Optional[bool] = None
+    date_from: Optional[datetime.date] = None
+    date_to: Optional[datetime.date] = None
+
+    def where(self) -> Tuple[List[str], list]:
+        clauses, params = [], []
+        if self.cap_id is not None:
+            clauses.append('cadet_cadet_id = (SELECT cadet_id FROM cadet WHERE cap_id = %s LIMIT 1)')
+            params.append(self.cap_id)
+        if self.report_type:
+            clauses.append('report_type = %s')
+            params.append(self.report_type)
+        # the app only writes 0/1; equality lets idx_report_resolved_date also give date order
+        # (rows saved before resolved was set are NULL and count as open)
+        if self.resolved is True:
+            clauses.append('resolved = 1')
+        elif self.resolved is False:
+            clauses.append('(resolved = 0 OR resolved IS NULL)')
+        if self.date_from is not None:
+            clauses.append('Incident_date >= %s')
+            params.append(self.date_from)
+        if self.date_to is not None:
+            clauses.append('Incident_date <= %s')
+            params.append(self.date_to)
+        return clauses, params
+
+
+@dataclass
+class ReportPage:
+    rows: list
+    # pass as `after` to fetch the next page; None when this was the last page
+    next_cursor: Optional[tuple] = None
+
+
+def _sort_spec(sort_by, order):
+    col, idx = REPORT_SORTS.get(sort_by, REPORT_SORTS['date'])
+    return col, idx, ('ASC' if str(order).upper() == 'ASC' else 'DESC')
+
+
+def _keyset_clause(col, order, value, report_id):
+    """Rows after (value, report_id) in ORDER BY col <order>, report_id <order>.
+
+    MySQL sorts NULL first ascending and last descending, so NULL needs its own branches.
+    """
+    if order == 'DESC':
+        if value is None:
+            return f'({col} IS NULL AND report_id < %s)', [report_id]
+        return f'({col} < %s OR ({col} = %s AND report_id < %s) OR {col} IS NULL)', [value, value, report_id]
+    if value is None:
+        return f'(({col} IS NULL AND report_id > %s) OR {col} IS NOT NULL)', [report_id]
+    return f'({col} > %s OR ({col} = %s AND report_id > %s))', [value, value, report_id]
+
+
+def _query_report_page(cur, filters, sort_by, order, after, limit):
+    col, idx, order = _sort_spec(sort_by, order)
+    clauses, params = filters.where()
+    if after is not None:
+        clause, extra = _keyset_clause(col, order, after[0], after[1])
+        clauses.append(clause)
+        params.extend(extra)
+    sql = f'SELECT {_REPORT_COLUMNS} FROM report'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    # safe because col and order come from whitelists
+    sql += f' ORDER BY {col} {order}, report_id {order} LIMIT %s'
+    # one extra row tells us whether another page follows
+    cur.execute(sql, tuple(params) + (limit + 1,))
+    rows = cur.fetchall()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    # the cursor keeps the raw DB value (ReportRow turns a NULL resolved into False), or the
+    # ENUM index when sorting by type
+    cursor = None
+    if more and rows:
+        value = rows[-1][idx]
+        if col == REPORT_SORTS['type'][0] and value is not None:
+            value = _TYPE_ORDER.get(value, 0)
+        cursor = (value, rows[-1][0])
+    return ReportPage([ReportRow.from_db(r) for r in rows], cursor)
+
+
+def fetch_report_page(filters=None, sort_by='date', order='DESC', after=None, limit=REPORT_PAGE_SIZE):
+    """Fetch one page of the report list. Raises on DB errors; meant for tasks.TaskRunner.
+
+    after is the previous page's next_cursor. Rows are ReportRow tuples.
+    """
+    conn = checkout_connection()
+    try:
+        return _query_report_page(conn.cursor(), filters or ReportFilter(), sort_by, order, after, limit)
+    finally:
+        conn.close()
+
+
+class ReportCountCache:
+    """Report totals per filter. A cached count is shown straight away and recounted once it
+    is older than REPORT_COUNT_TTL; saves and deletes drop every entry."""
+
+    def __init__(self, ttl=REPORT_COUNT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counts = {}   # ReportFilter -> (count, time counted)
+
+    def get(self, filters):
+        """Return (count or None, fresh)."""
+        with self._lock:
+            entry = self._counts.get(filters)
+        if entry is None:
+            return None, False
+        return entry[0], (time.monotonic() - entry[1]) < self.ttl
+
+    def put(self, filters, count):
+        with self._lock:
+            self._counts[filters] = (count, time.monotonic())
+
+    def invalidate(self):
+        with self._lock:
+            self._counts.clear()
+
+
+REPORT_COUNTS = ReportCountCache()
+
+
+def count_reports(filters=None):
+    """COUNT(*) of reports matching filters, stored in REPORT_COUNTS. Raises on DB errors."""
+    filters = filters or ReportFilter()
+    clauses, params = filters.where()
+    sql = 'SELECT COUNT(*) FROM report'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, tuple(params))
+        count = cur.fetchone()[0]
+    finally:
+        conn.close()
+    REPORT_COUNTS.put(filters, count)
+    return count
 
 
 def fetch_reports(limit=200, sort_by='date', order='DESC'):
-    """Fetch recent reports with optional sorting.
+    """Fetch the first `limit` reports with optional sorting.
 
-    sort_by is one of: 'id', 'cadet_id', 'type', 'title', 'date', 'resolved'.
+    sort_by is one of: 'id', 'cadet_id', 'type', 'date', 'resolved'.
     order is 'ASC' or 'DESC'. Defaults to date DESC.
     """
-    # map friendly keys to actual DB columns (whitelist to prevent SQL injection)
-    col_map = {
-        'id': 'report_id',
-        'cadet_id': 'cadet_cadet_id',
-        'type': 'report_type',
-        'date': 'Incident_date',
-        'resolved': 'resolved'
-    }
-    dbcol = col_map.get(sort_by, 'Incident_date')
-    order = 'ASC' if str(order).upper() == 'ASC' else 'DESC'
-
     conn = get_connection()
     if not conn:
         return []
     try:
-        cur = conn.cursor()
-        # safe because dbcol is chosen from a whitelist
-        sql = f"SELECT report_id, cadet_cadet_id, report_type, LEFT(description,255), Incident_date, resolved FROM report ORDER BY {dbcol} {order} LIMIT %s"
-        cur.execute(sql, (limit,))
-        return cur.fetchall()
+        return _query_report_page(conn.cursor(), ReportFilter(), sort_by, order, None, limit).rows
     except Exception:
         logging.exception('Error fetching reports')
         return []
@@ -598,6 +810,11 @@ def fetch_reports(limit=200, sort_by='date', order='DESC'):
             pass
 
 
+def load_reports(limit=200, sort_by='date', order='DESC'):
+    """Like fetch_reports() but raises on DB errors; meant for tasks.TaskRunner."""
+    return fetch_report_page(ReportFilter(), sort_by, order, limit=limit).rows
+
+
 def delete_report(report_id: int):
     conn = get_connection()
     if not conn:
@@ -606,6 +823,7 @@ def delete_report(report_id: int):
         cur = conn.cursor()
         cur.execute('DELETE FROM report WHERE report_id = %s', (report_id,))
         conn.commit()
+        REPORT_COUNTS.invalidate()
         return True
     except Exception:
         conn.rollback()
@@ -618,6 +836,21 @@ def delete_report(report_id: int):
             pass
 
 
+def remove_report(report_id: int):
+    """Like delete_report() but raises on DB errors; meant for tasks.TaskRunner."""
+    conn = checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('DELETE FROM report WHERE report_id = %s', (report_id,))
+        conn.commit()
+        REPORT_COUNTS.invalidate()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 if __name__ == '__main__':
     root = tk.Tk()
     try:
@@ -0,0 +1,273 @@
+"""
+In-memory roster search index for the cadet list.
+
+The Dashboard used to search with `CONCAT(first_name, " ", last_name) LIKE '%term%' OR cap_id
+LIKE ...`, a full table scan per search that could not use an index. The roster is small enough
+to keep in memory (thousands of rows), so it is loaded once and searched locally:
+
+  - prefix matching on every name token and on the CAP ID ("smi" finds Smith, "1234" finds
+    CAP ID 123456), with all query words required ("jo sm" finds John Smith);
+  - trigram fuzzy matching as a fallback when nothing matches by prefix ("smtih").
+
+Lookups are a couple of bisects plus set intersections, well under a millisecond, so the
+Dashboard can filter on every keystroke. Forms that save a cadet call ROSTER.upsert() with the
+values they just wrote so the index stays current without reloading.
+
+load() hits the database (via db.checkout_connection) and raises; call it from a
+tasks.TaskRunner worker. Everything else is pure in-memory work safe to call on the Tk thread.
+"""
+
+import bisect
+import logging
+import threading
+
+from db import checkout_connection
+
+# minimum trigram similarity (Jaccard) for a fuzzy match
+FUZZY_THRESHOLD = 0.2
+# fuzzy matching only kicks in for terms at least this long
+FUZZY_MIN_LENGTH = 3
+
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _name_key(first, last):
+    return ((first or '').strip().lower(), (last or '').strip().lower())
+
+
+def _sort_key(row):
+    return ((row[3] or '').lower(), (row[2] or '').lower(), row[1] or 0)
+
+
+class RosterIndex:
+    """Search index over (cadet_id, cap_id, first_name, last_name) rows."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows = {}          # cadet_id -> row
+        self._keys = []          # sorted (token, cadet_id) for prefix search
+        self._tokens = {}        # cadet_id -> tokens indexed for it
+        self._trigrams = {}      # trigram -> set(cadet_id)
+        self._cadet_grams = {}   # cadet_id -> trigram sets of first, last and "first last"
+        self._order = {}         # cadet_id -> precomputed sort key
+        self._by_capid = {}      # cap_id -> cadet_id
+        self._by_name = {}       # (first, last) lowercased -> cadet_id
+        self._all = None         # cached full roster in display order
+        self._listeners = []
+        self.loaded = False
+
+    # ---------------- building ----------------
+    def load(self):
+        """(Re)load the whole roster from the database. Returns the number of cadets."""
+        conn = checkout_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT cadet_id, cap_id, first_name, last_name FROM cadet')
+            rows = cur.fetchall()
+        finally:
+            conn.close()
+        self.replace(rows)
+        logging.info('Roster index loaded (%d cadets)', len(rows))
+        return len(rows)
+
+    def replace(self, rows):
+        with self._lock:
+            self._rows = {}
+            self._keys = []
+            self._tokens = {}
+            self._trigrams = {}
+            self._cadet_grams = {}
+            self._order = {}
+            self._by_capid = {}
+            self._by_name = {}
+            self._all = None
+            keys = []
+            for row in rows:
+                row = tuple(row[:4])
+                self._rows[row[0]] = row
+                self._order[row[0]] = _sort_key(row)
+                self._add_keys(row)
+                tokens = self._tokens_for(row)
+                self._tokens[row[0]] = tokens
+                keys.extend((t, row[0]) for t in tokens)
+                self._add_grams(row)
+            keys.sort()
+            self._keys = keys
+            self.loaded = True
+
+    def upsert(self, row):
+        """Add or update one cadet (cadet_id, cap_id, first_name, last_name) and notify listeners."""
+        row = tuple(row[:4])
+        with self._lock:
+            self._remove(row[0])
+            self._rows[row[0]] = row
+            self._order[row[0]] = _sort_key(row)
+            self._add_keys(row)
+            tokens = self._tokens_for(row)
+            self._tokens[row[0]] = tokens
+            for t in tokens:
+                bisect.insort(self._keys, (t, row[0]))
+            self._add_grams(row)
+        self._notify()
+
+    def remove(self, cadet_id):
+        with self._lock:
+            self._remove(cadet_id)
+        self._notify()
+
+    def _remove(self, cadet_id):
+        if cadet_id not in self._rows:
+            return
+        for t in self._tokens.pop(cadet_id, ()):
+            i = bisect.bisect_left(self._keys, (t, cadet_id))
+            if i < len(self._keys) and self._keys[i] == (t, cadet_id):
+                del self._keys[i]
+        for g in set().union(*self._cadet_grams.pop(cadet_id, [set()])):
+            ids = self._trigrams.get(g)
+            if ids:
+                ids.discard(cadet_id)
+                if not ids:
+                    del self._trigrams[g]
+        row = self._rows.pop(cadet_id)
+        del self._order[cadet_id]
+        if self._by_capid.get(row[1]) == cadet_id:
+            del self._by_capid[row[1]]
+        name_key = _name_key(row[2], row[3])
+        if self._by_name.get(name_key) == cadet_id:
+            del self._by_name[name_key]
+        self._all = None
+
+    def _add_keys(self, row):
+        if row[1] is not None:
+            self._by_capid[row[1]] = row[0]
+        self._by_name.setdefault(_name_key(row[2], row[3]), row[0])
+
+    @staticmethod
+    def _tokens_for(row):
+        _cid, cap_id, first, last = row
+        tokens = set()
+        for part in (first, last):
+            for word in str(part or '').lower().split():
+                tokens.add(word)
+        full = f'{first or ""} {last or ""}'.strip().lower()
+        if full:
+            tokens.add(full)
+        if cap_id is not None:
+            tokens.add(str(cap_id))
+        return tokens
+
+    def _add_grams(self, row):
+        first = (row[2] or '').strip().lower()
+        last = (row[3] or '').strip().lower()
+        grams = [_trigrams(p) for p in (first, last, f'{first} {last}'.strip()) if p]
+        self._cadet_grams[row[0]] = grams
+        for g in set().union(*grams):
+            self._trigrams.setdefault(g, set()).add(row[0])
+        self._all = None
+
+    # ---------------- querying ----------------
+    def _prefix_ids(self, prefix):
+        ids = set()
+        i = bisect.bisect_left(self._keys, (prefix,))
+        keys = self._keys
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            ids.add(keys[i][1])
+            i += 1
+        return ids
+
+    def search(self, term='', fuzzy=True, limit=None):
+        """Return matching rows ordered by last name, first name.
+
+        An empty term returns the whole roster. Every word of the term must prefix-match a
+        name token or the CAP ID; if nothing does, trigram similarity is tried (when fuzzy).
+        """
+        term = (term or '').strip().lower()
+        with self._lock:
+            if not term:
+                if self._all is None:
+                    self._all = sorted(self._rows.values(), key=lambda r: self._order[r[0]])
+                return self._all[:limit] if limit else list(self._all)
+            else:
+                ids = None
+                for word in term.split():
+                    found = self._prefix_ids(word)
+                    ids = found if ids is None else ids & found
+                    if not ids:
+                        break
+                # the whole phrase may also prefix the "first last" token ("john sm")
+                ids = (ids or set()) | self._prefix_ids(term)
+                if not ids and fuzzy and len(term) >= FUZZY_MIN_LENGTH:
+                    return self._fuzzy(term, limit)
+                order = self._order
+                ids = sorted(ids, key=order.__getitem__)
+                if limit:
+                    ids = ids[:limit]
+                return [self._rows[i] for i in ids]
+
+    def _fuzzy(self, term, limit):
+        grams = _trigrams(term)
+        counts = {}
+        for g in grams:
+            for cid in self._trigrams.get(g, ()):
+                counts[cid] = counts.get(cid, 0) + 1
+        scored = []
+        for cid in counts:
+            # best Jaccard similarity against the first name, last name or full name
+            score = max(len(grams & g) / len(grams | g) for g in self._cadet_grams[cid])
+            if score >= FUZZY_THRESHOLD:
+                scored.append((-score, self._order[cid], cid))
+        scored.sort()
+        rows = [self._rows[s[2]] for s in scored]
+        return rows[:limit] if limit else rows
+
+    def get(self, cadet_id):
+        return self._rows.get(cadet_id)
+
+    def by_capid(self, cap_id):
+        """Exact CAP ID lookup; returns the row or None."""
+        try:
+            cap_id = int(cap_id)
+        except (TypeError, ValueError):
+            return None
+        cid = self._by_capid.get(cap_id)
+        return self._rows.get(cid) if cid is not None else None
+
+    def by_name(self, first, last):
+        """Exact, case-insensitive first + last name lookup; returns the row or None."""
+        cid = self._by_name.get(_name_key(first, last))
+        return self._rows.get(cid) if cid is not None else None
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ---------------- change notification ----------------
+    def subscribe(self, callback):
+        """Call callback() after every upsert/remove (on the thread that made the change)."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self):
+        for cb in list(self._listeners):
+            try:
+                cb()
+            except Exception:
+                logging.exception('Roster listener failed')
+
+
+# process-wide index shared by the Dashboard and the cadet forms
+ROSTER = RosterIndex()
+
+
+def ensure_loaded():
+    """Load ROSTER if it has not been loaded yet (worker-thread helper)."""
+    if not ROSTER.loaded:
+        ROSTER.load()
+    return ROSTER
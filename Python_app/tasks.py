@@ -0,0 +1,252 @@
+"""
+Background task runner so database work never blocks Tk's mainloop.
+
+Tk is single-threaded: widgets, Tk variables and message boxes may only be touched from the
+thread running mainloop(). DB calls therefore run on a small thread pool, and their results
+(or exceptions) are put on a queue that the Tk thread drains with after(). Callbacks, loading
+indicators and error dialogs always run on the UI thread.
+
+Typical use inside a view:
+
+    self._runner = get_runner(self)
+    self._busy = LoadingIndicator(frame)
+    self._busy.grid(...)
+    self._runner.submit(fetch_things, term, on_done=self._render_things,
+                        indicator=self._busy, error_message='Could not load things (see terminal).')
+
+The function passed to submit() runs on a worker thread and must not touch any widget or
+Tk variable; read whatever it needs on the UI thread first and pass it in as arguments.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import dbtrace
+
+MAX_WORKERS = 4
+POLL_MS = 30
+# upper bound on callbacks handled per poll so a burst of results can't starve the UI
+MAX_CALLBACKS_PER_POLL = 50
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task when its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag shared between the UI thread and one background task.
+
+    The UI calls cancel() when the result is no longer wanted (e.g. the user selected another
+    row). The task calls check() between steps, and TaskRunner drops the result of a cancelled
+    task instead of calling on_done/on_error. Hooks added with add_cancel_hook() run on cancel;
+    db.cancellable() uses one to kill the task's in-flight query on the server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._hooks = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            hooks, self._hooks = self._hooks, []
+        for hook in hooks:
+            try:
+                hook()
+            except Exception:
+                logging.exception('Cancel hook failed')
+
+    def check(self):
+        if self._cancelled:
+            raise TaskCancelled()
+
+    def add_cancel_hook(self, fn):
+        """Register fn to run on cancel(); runs immediately if already cancelled."""
+        with self._lock:
+            if not self._cancelled:
+                self._hooks.append(fn)
+                return
+        fn()
+
+    def remove_cancel_hook(self, fn):
+        with self._lock:
+            try:
+                self._hooks.remove(fn)
+            except ValueError:
+                pass
+
+
+class LoadingIndicator(ttk.Label):
+    """Small per-view "Loading..." label.
+
+    start()/stop() are reference counted, so several concurrent loads for the same view keep
+    the indicator visible until the last one finishes.
+    """
+
+    def __init__(self, master=None, text='Loading...', **kw):
+        super().__init__(master, text='', foreground='#6b7280', **kw)
+        self._busy_text = text
+        self._count = 0
+
+    def start(self):
+        self._count += 1
+        self.configure(text=self._busy_text)
+
+    def stop(self):
+        self._count = max(0, self._count - 1)
+        if not self._count:
+            self.configure(text='')
+
+    @property
+    def busy(self) -> bool:
+        return self._count > 0
+
+
+class TaskRunner:
+    """Runs callables on a thread pool and hands results back to the Tk thread."""
+
+    def __init__(self, root: tk.Misc, max_workers: int = MAX_WORKERS, poll_ms: int = POLL_MS):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-worker')
+        self._results = queue.Queue()
+        self._poll_ms = poll_ms
+        self._closed = False
+        self._after_id = None
+        self._schedule_poll()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, indicator=None,
+               error_title='DB Error', error_message=None, token=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread.
+
+        on_done(result) runs on the UI thread when fn returns. If fn raises, on_error(exc) runs on
+        the UI thread instead; without an on_error the exception is logged and shown with
+        messagebox.showerror(error_title, error_message or str(exc)). The optional indicator (or a
+        tuple of indicators, for a load that fills several panes) is started now and stopped on
+        the UI thread once the task has finished either way.
+
+        If a CancelToken is given (pass it to fn as well so it can stop early), a task whose
+        token was cancelled by the time it finishes is dropped: neither callback runs.
+        """
+        if self._closed:
+            return None
+        if indicator is not None:
+            indicators = indicator if isinstance(indicator, (tuple, list)) else (indicator,)
+            indicator = []
+            for ind in indicators:
+                try:
+                    ind.start()
+                    indicator.append(ind)
+                except Exception:
+                    pass
+        name = getattr(fn, '__name__', repr(fn))
+        # charge the task's queries to the UI action that queued it
+        action = dbtrace.current_action()
+
+        def run():
+            if token is not None and token.cancelled:
+                self._results.put((None, None, None, None, indicator, None, None))
+                return
+            try:
+                with dbtrace.action_scope(action):
+                    result = fn(*args, **kwargs)
+            except TaskCancelled:
+                self._results.put((None, None, None, None, indicator, None, None))
+            except Exception as exc:
+                if token is not None and token.cancelled:
+                    # typically the query was killed on the server after cancel()
+                    logging.debug('Cancelled task %s ended with %r', name, exc)
+                    self._results.put((None, None, None, None, indicator, None, None))
+                else:
+                    logging.exception('Background task %s failed', name)
+                    self._results.put((False, exc, on_done, on_error, indicator, error_title, error_message))
+            else:
+                if token is not None and token.cancelled:
+                    self._results.put((None, None, None, None, indicator, None, None))
+                else:
+                    self._results.put((True, result, on_done, on_error, indicator, error_title, error_message))
+
+        return self._executor.submit(run)
+
+    def shutdown(self):
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._executor.shutdown(wait=False)
+
+    # ---------------- UI-thread side ----------------
+    def _schedule_poll(self):
+        if self._closed:
+            return
+        try:
+            self._after_id = self.root.after(self._poll_ms, self._poll)
+        except tk.TclError:
+            # root window is gone
+            self.shutdown()
+
+    def _poll(self):
+        self._after_id = None
+        for _ in range(MAX_CALLBACKS_PER_POLL):
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(*item)
+        self._schedule_poll()
+
+    def _dispatch(self, ok, value, on_done, on_error, indicator, error_title, error_message):
+        for ind in indicator or ():
+            try:
+                ind.stop()
+            except tk.TclError:
+                # the view was destroyed while the task ran
+                pass
+        if ok is None:
+            # cancelled: only the indicators needed settling
+            return
+        try:
+            if ok:
+                if on_done is not None:
+                    on_done(value)
+            elif on_error is not None:
+                on_error(value)
+            else:
+                messagebox.showerror(error_title, error_message or f'{value}')
+        except tk.TclError:
+            logging.debug('Dropped task callback for a destroyed widget', exc_info=True)
+        except Exception:
+            logging.exception('Error in task callback')
+
+
+def get_runner(widget: tk.Misc) -> TaskRunner:
+    """Return the process-wide TaskRunner, creating it on the widget's root window if needed."""
+    global _runner
+    with _runner_lock:
+        if _runner is None or _runner._closed:
+            root = widget.nametowidget('.')
+            _runner = TaskRunner(root)
+            root.bind('<Destroy>', lambda e, r=root: _on_root_destroy(e, r), add='+')
+        return _runner
+
+
+def _on_root_destroy(event, root):
+    # <Destroy> also fires for every child widget; only react to the root going away
+    if event.widget is root and _runner is not None:
+        _runner.shutdown()
@@ -0,0 +1,103 @@
+"""Dashboard inspection editor save: sync_inspection_scores against a fake cursor."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dashboard  # noqa: E402
+from inspection_totals import ITEM_MAX_SCORE  # noqa: E402
+
+
+class FakeScoreCursor:
+    """Keeps uniform_inspection_score rows for one inspection in memory."""
+
+    def __init__(self, rows=()):
+        # score_id -> [item_id, score, comments]
+        self.rows = {sid: [item, score, comment] for sid, item, score, comment in rows}
+        self._next = max(self.rows, default=0) + 1
+        self._result = []
+
+    def execute(self, sql, params=()):
+        if sql.startswith('SELECT score_id'):
+            self._result = [(sid, *self.rows[sid]) for sid in sorted(self.rows)]
+        elif sql.startswith('DELETE'):
+            for sid in params:
+                del self.rows[sid]
+        else:
+            raise AssertionError(f'unexpected SQL {sql!r}')
+
+    def executemany(self, sql, seq):
+        for params in seq:
+            if sql.startswith('UPDATE'):
+                score, comment, sid = params
+                self.rows[sid][1:] = [score, comment]
+            elif sql.startswith('INSERT'):
+                score, comment, item_id, _insp = params
+                self.rows[self._next] = [item_id, score, comment]
+                self._next += 1
+            else:
+                raise AssertionError(f'unexpected SQL {sql!r}')
+
+    def fetchall(self):
+        return self._result
+
+
+# a slice of the sheet with 'Cleanliness' under two sections; one id per distinct name
+_NAMES = ['Haircut', 'Cleanliness', 'Shave/Cosmetics', 'Cleanliness', 'Press/Ironing', 'Boot blousing']
+_IDS = {name: i for i, name in enumerate(dict.fromkeys(_NAMES), start=1)}
+
+
+def _ensure(cur, names):
+    return {n: _IDS[n] for n in names}
+
+
+class SyncInspectionScoresTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(dashboard, 'ensure_inspection_items', _ensure)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sheet(self, first_cleanliness, second_cleanliness, other=2):
+        scores, seen = [], 0
+        for name in _NAMES:
+            if name == 'Cleanliness':
+                seen += 1
+                scores.append((name, first_cleanliness if seen == 1 else second_cleanliness, f'c{seen}'))
+            else:
+                scores.append((name, other, ''))
+        return scores
+
+    def test_duplicate_item_keeps_both_rows(self):
+        cur = FakeScoreCursor()
+        scores = self._sheet(1, 3)
+        total, max_score = dashboard.sync_inspection_scores(cur, 7, scores)
+        self.assertEqual(len(cur.rows), len(_NAMES))
+        self.assertEqual(total, sum(s[1] for s in scores))
+        self.assertEqual(max_score, len(_NAMES) * ITEM_MAX_SCORE)
+        clean = [r[1:] for sid, r in sorted(cur.rows.items()) if r[0] == _IDS['Cleanliness']]
+        self.assertEqual(clean, [[1, 'c1'], [3, 'c2']])
+
+    def test_resave_updates_in_order_without_churn(self):
+        cur = FakeScoreCursor()
+        dashboard.sync_inspection_scores(cur, 7, self._sheet(1, 3))
+        ids_before = sorted(cur.rows)
+        dashboard.sync_inspection_scores(cur, 7, self._sheet(2, 0))
+        self.assertEqual(sorted(cur.rows), ids_before)
+        clean = [r[1] for sid, r in sorted(cur.rows.items()) if r[0] == _IDS['Cleanliness']]
+        self.assertEqual(clean, [2, 0])
+
+    def test_extra_rows_are_deleted(self):
+        # a stray third Cleanliness row and an item no longer on the sheet
+        cur = FakeScoreCursor([(1, _IDS['Cleanliness'], 1, ''), (2, _IDS['Cleanliness'], 1, ''),
+                               (3, _IDS['Cleanliness'], 1, ''), (4, 999, 3, '')])
+        dashboard.sync_inspection_scores(cur, 7, self._sheet(1, 1))
+        self.assertEqual(len(cur.rows), len(_NAMES))
+        self.assertNotIn(3, cur.rows)
+        self.assertNotIn(4, cur.rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Inspection rating bands."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspection_totals import compute_rating, FORM_MAX_SCORE  # noqa: E402
+
+
+class ComputeRatingTest(unittest.TestCase):
+    def test_form_scale(self):
+        self.assertEqual(compute_rating(45), 'Excellent')
+        self.assertEqual(compute_rating(44), 'Meets Standard')
+        self.assertEqual(compute_rating(30, FORM_MAX_SCORE), 'Meets Standard')
+        self.assertEqual(compute_rating(16), 'Needs Improvement')
+        self.assertEqual(compute_rating(15), 'Unacceptable')
+
+    def test_smaller_sheet_is_scaled(self):
+        # 12 items scored out of 36: the same shares of the maximum as 45/30/16 of 60
+        self.assertEqual(compute_rating(27, 36), 'Excellent')
+        self.assertEqual(compute_rating(26, 36), 'Meets Standard')
+        self.assertEqual(compute_rating(18, 36), 'Meets Standard')
+        self.assertEqual(compute_rating(17, 36), 'Needs Improvement')
+        self.assertEqual(compute_rating(9, 36), 'Unacceptable')
+
+    def test_57_point_sheet(self):
+        self.assertEqual(compute_rating(43, 57), 'Excellent')
+        self.assertEqual(compute_rating(42, 57), 'Meets Standard')
+
+
+if __name__ == '__main__':
+    unittest.main()
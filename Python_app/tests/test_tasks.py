@@ -0,0 +1,83 @@
+"""TaskRunner result hand-off, driven without a Tk main loop."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasks import TaskRunner, CancelToken, TaskCancelled  # noqa: E402
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() is never run, the test drains the queue itself."""
+
+    def after(self, ms, fn):
+        return 'after#1'
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakeIndicator:
+    def __init__(self):
+        self.started = self.stopped = 0
+
+    def start(self):
+        self.started += 1
+
+    def stop(self):
+        self.stopped += 1
+
+
+class TaskRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.runner = TaskRunner(FakeRoot())
+        self.done, self.errors = [], []
+        self.indicator = FakeIndicator()
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def _run(self, fn, token=None):
+        future = self.runner.submit(fn, on_done=self.done.append, on_error=self.errors.append,
+                                    indicator=self.indicator, token=token)
+        self.assertIsNone(future.exception(timeout=5))
+        self.runner._dispatch(*self.runner._results.get(timeout=5))
+        self.assertTrue(self.runner._results.empty())
+
+    def test_success_calls_on_done(self):
+        self._run(lambda: 42)
+        self.assertEqual(self.done, [42])
+        self.assertEqual(self.errors, [])
+        self.assertEqual((self.indicator.started, self.indicator.stopped), (1, 1))
+
+    def test_error_calls_on_error(self):
+        def boom():
+            raise ValueError('bad')
+        self._run(boom)
+        self.assertEqual(self.done, [])
+        self.assertEqual(len(self.errors), 1)
+        self.assertIsInstance(self.errors[0], ValueError)
+        self.assertEqual(self.indicator.stopped, 1)
+
+    def test_cancelled_after_finish_drops_result(self):
+        token = CancelToken()
+
+        def work():
+            token.cancel()
+            return 1
+        self._run(work, token)
+        self.assertEqual((self.done, self.errors), ([], []))
+        self.assertEqual(self.indicator.stopped, 1)
+
+    def test_task_cancelled_exception_drops_result(self):
+        def work():
+            raise TaskCancelled()
+        self._run(work)
+        self.assertEqual((self.done, self.errors), ([], []))
+        self.assertEqual(self.indicator.stopped, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
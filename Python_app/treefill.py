@@ -0,0 +1,134 @@
+"""
+Shared Treeview population helper.
+
+Views used to clear a Treeview, insert every row, and then call
+ui_theme.enable_alt_row_colors(), which walked every row again to set its stripe tag. That
+is two Tcl calls per row on every refresh, all inside one callback that blocks the UI.
+
+fill_tree() replaces that pattern:
+
+  - stripe tags are assigned in the same insert call;
+  - with a `key` function, a refresh is diffed against what is already shown: rows that
+    disappeared are deleted, new rows inserted, changed rows updated in place and unchanged
+    rows left alone (selection and scroll position survive a refresh);
+  - rows are processed CHUNK_ROWS at a time, the first chunk immediately and the rest from
+    after() callbacks, so a long list never freezes the window. Starting a new fill on the
+    same tree cancels the unfinished one.
+
+It must be called on the Tk thread, like any other widget call.
+"""
+
+import tkinter as tk
+
+try:
+    from ui_theme import ALT_ROW_COLORS
+except Exception:
+    ALT_ROW_COLORS = ('#ffffff', '#f6f6f6')
+
+STRIPE_TAGS = ('evenrow', 'oddrow')
+CHUNK_ROWS = 300
+
+
+class _FillState:
+    """What fill_tree last put in a tree: iid -> (values, tags), in display order."""
+
+    def __init__(self):
+        self.shown = {}
+        self.order = []
+        self.after_id = None
+
+
+def _state(tree):
+    state = getattr(tree, '_fill_state', None)
+    if state is None:
+        state = tree._fill_state = _FillState()
+        for tag, color in zip(STRIPE_TAGS, ALT_ROW_COLORS):
+            tree.tag_configure(tag, background=color)
+    return state
+
+
+def _cancel(tree, state):
+    if state.after_id is not None:
+        try:
+            tree.after_cancel(state.after_id)
+        except tk.TclError:
+            pass
+        state.after_id = None
+
+
+def fill_tree(tree, rows, values=None, key=None, extra_tags=None, chunk=CHUNK_ROWS, on_done=None):
+    """Show `rows` in `tree` (top-level items only).
+
+    values(row) gives the tuple to display (default: the row itself). key(row) gives a stable
+    iid; without it every refresh replaces all rows. extra_tags(row) may add tags next to the
+    stripe tag. on_done() runs after the last chunk.
+    """
+    state = _state(tree)
+    _cancel(tree, state)
+    values = values or tuple
+    rows = list(rows)
+
+    if key is None:
+        # no stable identity: clear and insert fresh (still chunked and striped in one pass)
+        tree.delete(*tree.get_children())
+        state.shown = {}
+        state.order = []
+        keys = [None] * len(rows)
+    else:
+        keys = [str(key(r)) for r in rows]
+        wanted = set(keys)
+        # anything not put there by fill_tree, or no longer wanted, goes
+        current = tree.get_children()
+        stale = [iid for iid in current if iid not in wanted or iid not in state.shown]
+        if stale:
+            tree.delete(*stale)
+        stale = set(stale)
+        # forget rows deleted behind our back (e.g. a view clearing the tree while it reloads)
+        present = set(current) - stale
+        state.shown = {iid: v for iid, v in state.shown.items() if iid in present}
+        state.order = [iid for iid in current if iid not in stale]
+
+    # rows already in the tree, in tree order; rows 0..i-1 are final, so the tree's row at
+    # index i is the first of these not yet placed
+    old = state.order
+    placed = set()
+    cursor = [0]
+
+    def row_at_cursor():
+        p = cursor[0]
+        while p < len(old) and old[p] in placed:
+            p += 1
+        cursor[0] = p
+        return old[p] if p < len(old) else None
+
+    def run(start):
+        state.after_id = None
+        end = min(start + chunk, len(rows))
+        for i in range(start, end):
+            row = rows[i]
+            vals = tuple(values(row))
+            tags = (STRIPE_TAGS[i % 2],) + tuple(extra_tags(row) if extra_tags else ())
+            iid = keys[i]
+            if iid is None:
+                tree.insert('', 'end', values=vals, tags=tags)
+                continue
+            prev = state.shown.get(iid)
+            if prev is None:
+                tree.insert('', i, iid=iid, values=vals, tags=tags)
+            else:
+                if prev != (vals, tags):
+                    tree.item(iid, values=vals, tags=tags)
+                if row_at_cursor() != iid:
+                    tree.move(iid, '', i)
+                placed.add(iid)
+            # recorded as we go so a fill cancelled half-way leaves state matching the tree
+            state.shown[iid] = (vals, tags)
+        if end < len(rows):
+            state.after_id = tree.after(1, run, end)
+            return
+        if key is not None:
+            state.order = keys
+        if on_done is not None:
+            on_done()
+
+    run(0)
@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import ttk
 
 ACCENT = '#2563EB'  # Windows 11-like blue
+# even/odd row backgrounds for striped Treeviews
+ALT_ROW_COLORS = ('#ffffff', '#f6f6f6')
 
 
 def setup(root: tk.Tk, dark: bool = False):
@@ -47,7 +49,9 @@ def apply_accent(button: ttk.Button):
 
 
 def enable_alt_row_colors(tree: ttk.Treeview):
-    tree.tag_configure('oddrow', background='#f6f6f6')
-    tree.tag_configure('evenrow', background='#ffffff')
+    """Stripe every row already in the tree. Views that refresh often use treefill.fill_tree,
+    which tags rows as it inserts them."""
+    tree.tag_configure('evenrow', background=ALT_ROW_COLORS[0])
+    tree.tag_configure('oddrow', background=ALT_ROW_COLORS[1])
     for idx, iid in enumerate(tree.get_children()):
         tree.item(iid, tags=('oddrow' if idx % 2 else 'evenrow',))
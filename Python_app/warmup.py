@@ -0,0 +1,81 @@
+"""
+Background warm-up run by MainApp while its splash screen is up.
+
+The first query of a session used to pay for DNS, the TCP/TLS handshake and authentication
+inside the first tab's constructor, freezing the window. warm_up() does that work on a
+TaskRunner worker before the tabs are built:
+
+  connect   import mysql.connector, open the shared pool (every pooled socket authenticates
+            here) and round-trip one ping
+  lookups   load the rank/position/inspection_item/requirement caches (lookups.py)
+  roster    load the cadet roster index (roster.py)
+  prime     run the hot per-cadet queries once so their tables and indexes are in the
+            server's buffer pool
+
+Server-side prepared statements are not primed: the pool resets each session when a
+connection is returned (pool_reset_session), which deallocates them, so they would not
+survive to be reused.
+
+Each phase reports (name, index, total) through `progress` and is timed; warm_up() returns
+{phase: ms}. A failing phase is logged and skipped: the tabs report DB errors themselves.
+"""
+
+import logging
+import time
+
+PHASES = ('connect', 'lookups', 'roster', 'prime')
+
+
+def _connect():
+    import db
+    conn = db.checkout_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute('SELECT 1')
+        cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _lookups():
+    from lookups import RANKS, POSITIONS, INSPECTION_ITEMS, REQUIREMENTS
+    for table in (RANKS, POSITIONS, INSPECTION_ITEMS, REQUIREMENTS):
+        table.rows()
+
+
+def _roster():
+    from roster import ensure_loaded
+    ensure_loaded()
+
+
+def _prime():
+    from roster import ROSTER
+    rows = ROSTER.search('', limit=1)
+    if not rows:
+        return
+    from cadet_detail import fetch_cadet_detail
+    fetch_cadet_detail(rows[0][0])
+
+
+_STEPS = {'connect': _connect, 'lookups': _lookups, 'roster': _roster, 'prime': _prime}
+
+
+def warm_up(progress=None):
+    """Run every phase in order on the calling (worker) thread. Returns {phase: ms}."""
+    timings = {}
+    for i, phase in enumerate(PHASES):
+        if progress is not None:
+            progress(phase, i, len(PHASES))
+        t0 = time.perf_counter()
+        try:
+            _STEPS[phase]()
+        except Exception:
+            logging.exception('Warm-up phase %s failed', phase)
+            if phase == 'connect':
+                # without a connection the remaining phases would only fail the same way
+                timings[phase] = (time.perf_counter() - t0) * 1000.0
+                break
+        timings[phase] = (time.perf_counter() - t0) * 1000.0
+    if progress is not None:
+        progress('done', len(PHASES), len(PHASES))
+    return timings